@@ -0,0 +1,28 @@
+"""add ai_state to pvp_games
+
+Revision ID: 9f1c2a7d4b3e
+Revises: 3c6b67336032
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f1c2a7d4b3e'
+down_revision: Union[str, Sequence[str], None] = '3c6b67336032'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pvp_games', sa.Column('ai_state', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('pvp_games', 'ai_state')
@@ -0,0 +1,46 @@
+"""add user_stats table
+
+Revision ID: a1d5e9c3b724
+Revises: f2c8d4a7b519
+Create Date: 2026-10-18 22:14:48.930157
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d5e9c3b724'
+down_revision: Union[str, Sequence[str], None] = 'f2c8d4a7b519'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('games', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('solved', sa.Integer(), nullable=False),
+    sa.Column('solve_guesses', sa.Integer(), nullable=False),
+    sa.Column('solve_seconds', sa.Float(), nullable=False),
+    sa.Column('solved_within_30s', sa.Integer(), nullable=False),
+    sa.Column('solved_within_60s', sa.Integer(), nullable=False),
+    sa.Column('solved_within_120s', sa.Integer(), nullable=False),
+    sa.Column('solved_within_300s', sa.Integer(), nullable=False),
+    sa.Column('solved_within_600s', sa.Integer(), nullable=False),
+    sa.Column('solved_over_600s', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'kind')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats')
@@ -0,0 +1,40 @@
+"""add code variant to games
+
+Revision ID: b7e4d0c2a915
+Revises: 9f1c2a7d4b3e
+Create Date: 2026-10-18 14:03:52.118430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d0c2a915'
+down_revision: Union[str, Sequence[str], None] = '9f1c2a7d4b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SECRET_COLUMNS = [
+    ('single_games', 'player1_secret'),
+    ('pvp_games', 'player1_secret'),
+    ('pvp_games', 'player2_secret'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('games', sa.Column('code_length', sa.Integer(), server_default='4', nullable=False))
+    op.add_column('games', sa.Column('num_symbols', sa.Integer(), server_default='10', nullable=False))
+    for table, column in SECRET_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.String(length=4), type_=sa.String(length=6), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in SECRET_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.String(length=6), type_=sa.String(length=4), existing_nullable=True)
+    op.drop_column('games', 'num_symbols')
+    op.drop_column('games', 'code_length')
@@ -0,0 +1,104 @@
+"""reserve knuth ai user id
+
+Knuth used to be seeded at id 2, which the users id sequence may already have
+handed to a real player. It now lives at -1, which the sequence never issues.
+Games against Knuth seeded at id 2, or played while id 2 was a real player,
+are moved over to the reserved id.
+
+Revision ID: b8e3f1a6d20c
+Revises: a1d5e9c3b724
+Create Date: 2026-10-18 23:41:07.318264
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f1a6d20c'
+down_revision: Union[str, Sequence[str], None] = 'a1d5e9c3b724'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KNUTH_ID = -1
+PREVIOUS_KNUTH_ID = 2
+KNUTH_EMAIL = 'knuth@ai.mastermind'
+
+# Every column that references users.id
+USER_REFERENCES = [
+    ('single_games', 'player1_id'),
+    ('single_games', 'starter_id'),
+    ('single_games', 'winner_id'),
+    ('pvp_games', 'player1_id'),
+    ('pvp_games', 'player2_id'),
+    ('pvp_games', 'starter_id'),
+    ('pvp_games', 'winner_id'),
+    ('pvp_games', 'current_turn'),
+    ('pvp_games_archive', 'player1_id'),
+    ('pvp_games_archive', 'player2_id'),
+    ('pvp_games_archive', 'starter_id'),
+    ('pvp_games_archive', 'winner_id'),
+    ('guesses', 'player_id'),
+    ('rating_history', 'user_id'),
+    ('user_stats', 'user_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    params = {'new': KNUTH_ID, 'old': PREVIOUS_KNUTH_ID, 'email': KNUTH_EMAIL}
+    seeded = conn.execute(
+        sa.text('SELECT 1 FROM users WHERE id = :old AND email = :email'), params
+    ).scalar() is not None
+    played = conn.execute(
+        sa.text(
+            "SELECT 1 FROM pvp_games WHERE ai_difficulty = 'medium' AND player2_id = :old "
+            "UNION ALL SELECT 1 FROM pvp_games_archive WHERE ai_difficulty = 'medium' AND player2_id = :old "
+            "LIMIT 1"
+        ),
+        params,
+    ).scalar() is not None
+    if not seeded and not played:
+        # scripts/seed_ai_users.py creates Knuth at the reserved id
+        return
+
+    conn.execute(sa.text('UPDATE users SET email = NULL WHERE id = :old AND email = :email'), params)
+    conn.execute(
+        sa.text(
+            'INSERT INTO users (id, email, display_name, is_guest, elo_rating, created_at) '
+            "VALUES (:new, :email, 'Knuth', false, 1600, now())"
+        ),
+        params,
+    )
+
+    if seeded:
+        # Id 2 was Knuth all along
+        for table, column in USER_REFERENCES:
+            conn.execute(sa.text(f'UPDATE {table} SET {column} = :new WHERE {column} = :old'), params)
+        conn.execute(sa.text('DELETE FROM users WHERE id = :old'), params)
+        return
+
+    # Id 2 is a real player; only the AI side of medium games is Knuth. Games the
+    # player played against Knuth themselves cannot be told apart and stay as they are.
+    for table in ('pvp_games', 'pvp_games_archive'):
+        knuth_games = f"{table}.ai_difficulty = 'medium' AND {table}.player2_id = :old AND {table}.player1_id <> :old"
+        conn.execute(
+            sa.text(f'UPDATE guesses SET player_id = :new FROM {table} WHERE guesses.game_id = {table}.id '
+                    f'AND guesses.player_id = :old AND {knuth_games}'),
+            params,
+        )
+        columns = ['starter_id', 'winner_id'] + (['current_turn'] if table == 'pvp_games' else [])
+        for column in columns:
+            conn.execute(
+                sa.text(f'UPDATE {table} SET {column} = :new WHERE {column} = :old AND {knuth_games}'), params
+            )
+        conn.execute(sa.text(f'UPDATE {table} SET player2_id = :new WHERE {knuth_games}'), params)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Id 2 may belong to a real player by now; Knuth keeps its reserved id
+    pass
@@ -0,0 +1,40 @@
+"""add guesses table
+
+Revision ID: c3a9e5f1d208
+Revises: b7e4d0c2a915
+Create Date: 2026-10-18 16:41:07.553912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9e5f1d208'
+down_revision: Union[str, Sequence[str], None] = 'b7e4d0c2a915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('guesses',
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('turn', sa.SmallInteger(), nullable=False),
+    sa.Column('code', sa.Integer(), nullable=False),
+    sa.Column('feedback', sa.SmallInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['player_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('game_id', 'player_id', 'turn')
+    )
+    op.create_index('ix_guesses_player_id', 'guesses', ['player_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_guesses_player_id', table_name='guesses')
+    op.drop_table('guesses')
@@ -0,0 +1,64 @@
+"""add last_move_at and pvp_games_archive
+
+Revision ID: d4f8a2b6c913
+Revises: c3a9e5f1d208
+Create Date: 2026-10-18 18:12:40.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f8a2b6c913'
+down_revision: Union[str, Sequence[str], None] = 'c3a9e5f1d208'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pvp_games', sa.Column('last_move_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE pvp_games SET last_move_at = COALESCE(started_at, created_at)")
+    op.create_index('ix_pvp_games_status_last_move_at', 'pvp_games', ['status', 'last_move_at'], unique=False)
+    op.create_index('ix_pvp_games_status_completed_at', 'pvp_games', ['status', 'completed_at'], unique=False)
+
+    op.create_table('pvp_games_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code_length', sa.Integer(), nullable=False),
+    sa.Column('num_symbols', sa.Integer(), nullable=False),
+    sa.Column('game_mode', sa.String(), nullable=False),
+    sa.Column('ai_difficulty', sa.String(), nullable=True),
+    sa.Column('player1_id', sa.Integer(), nullable=False),
+    sa.Column('player1_name', sa.String(), nullable=True),
+    sa.Column('player1_secret', sa.String(length=6), nullable=True),
+    sa.Column('player1_guesses', sa.JSON(), nullable=False),
+    sa.Column('player1_elo', sa.Integer(), nullable=False),
+    sa.Column('player2_id', sa.Integer(), nullable=True),
+    sa.Column('player2_name', sa.String(), nullable=True),
+    sa.Column('player2_secret', sa.String(length=6), nullable=True),
+    sa.Column('player2_guesses', sa.JSON(), nullable=False),
+    sa.Column('player2_elo', sa.Integer(), nullable=True),
+    sa.Column('starter_id', sa.Integer(), nullable=True),
+    sa.Column('winner_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pvp_games_archive_player1_id'), 'pvp_games_archive', ['player1_id'], unique=False)
+    op.create_index(op.f('ix_pvp_games_archive_player2_id'), 'pvp_games_archive', ['player2_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pvp_games_archive_player2_id'), table_name='pvp_games_archive')
+    op.drop_index(op.f('ix_pvp_games_archive_player1_id'), table_name='pvp_games_archive')
+    op.drop_table('pvp_games_archive')
+    op.drop_index('ix_pvp_games_status_completed_at', table_name='pvp_games')
+    op.drop_index('ix_pvp_games_status_last_move_at', table_name='pvp_games')
+    op.drop_column('pvp_games', 'last_move_at')
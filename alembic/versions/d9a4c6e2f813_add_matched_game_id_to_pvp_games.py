@@ -0,0 +1,28 @@
+"""add matched_game_id to pvp_games
+
+Revision ID: d9a4c6e2f813
+Revises: b8e3f1a6d20c
+Create Date: 2026-10-19 10:26:52.804317
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4c6e2f813'
+down_revision: Union[str, Sequence[str], None] = 'b8e3f1a6d20c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pvp_games', sa.Column('matched_game_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('pvp_games', 'matched_game_id')
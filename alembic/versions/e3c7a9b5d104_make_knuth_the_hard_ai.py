@@ -0,0 +1,53 @@
+"""make knuth the hard ai
+
+Knuth, the minimax player, is now the strongest bot: it plays the hard
+difficulty at ELO 2200 and AradzBot moves to medium. Stored games and stats
+keep pointing at the bot that played them, so the two difficulty labels are
+swapped in the games, the archive and the per-difficulty user_stats rows.
+
+Revision ID: e3c7a9b5d104
+Revises: d9a4c6e2f813
+Create Date: 2026-10-19 14:52:31.604918
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3c7a9b5d104'
+down_revision: Union[str, Sequence[str], None] = 'd9a4c6e2f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KNUTH_ID = -1
+KNUTH_EMAIL = 'knuth@ai.mastermind'
+
+
+def _swap_difficulties(knuth_elo: int) -> None:
+    conn = op.get_bind()
+    for table in ('pvp_games', 'pvp_games_archive'):
+        conn.execute(sa.text(
+            f"UPDATE {table} SET ai_difficulty = CASE ai_difficulty WHEN 'medium' THEN 'hard' ELSE 'medium' END "
+            "WHERE ai_difficulty IN ('medium', 'hard')"
+        ))
+    # (user_id, kind) is the primary key, so the kinds are swapped through a temporary name
+    conn.execute(sa.text("UPDATE user_stats SET kind = 'ai_swap' WHERE kind = 'ai_medium'"))
+    conn.execute(sa.text("UPDATE user_stats SET kind = 'ai_medium' WHERE kind = 'ai_hard'"))
+    conn.execute(sa.text("UPDATE user_stats SET kind = 'ai_hard' WHERE kind = 'ai_swap'"))
+    conn.execute(
+        sa.text('UPDATE users SET elo_rating = :elo WHERE id = :id AND email = :email'),
+        {'elo': knuth_elo, 'id': KNUTH_ID, 'email': KNUTH_EMAIL},
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _swap_difficulties(knuth_elo=2200)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _swap_difficulties(knuth_elo=1600)
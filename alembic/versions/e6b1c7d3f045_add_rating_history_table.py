@@ -0,0 +1,40 @@
+"""add rating_history table
+
+Revision ID: e6b1c7d3f045
+Revises: d4f8a2b6c913
+Create Date: 2026-10-18 19:03:26.471092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b1c7d3f045'
+down_revision: Union[str, Sequence[str], None] = 'd4f8a2b6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rating_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=True),
+    sa.Column('reason', sa.String(), nullable=False),
+    sa.Column('rating_before', sa.Float(), nullable=False),
+    sa.Column('rating_after', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_rating_history_user_id_id', 'rating_history', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rating_history_user_id_id', table_name='rating_history')
+    op.drop_table('rating_history')
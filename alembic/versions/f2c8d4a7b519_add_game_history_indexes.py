@@ -0,0 +1,40 @@
+"""add game history indexes
+
+Revision ID: f2c8d4a7b519
+Revises: e6b1c7d3f045
+Create Date: 2026-10-18 21:05:12.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8d4a7b519'
+down_revision: Union[str, Sequence[str], None] = 'e6b1c7d3f045'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_single_games_player1_id_created_at', 'single_games', ['player1_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_pvp_games_player1_id_created_at', 'pvp_games', ['player1_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_pvp_games_player2_id_created_at', 'pvp_games', ['player2_id', 'created_at', 'id'], unique=False)
+    # The composite indexes lead with the player ids, so they replace the single-column ones
+    op.drop_index(op.f('ix_pvp_games_archive_player1_id'), table_name='pvp_games_archive')
+    op.drop_index(op.f('ix_pvp_games_archive_player2_id'), table_name='pvp_games_archive')
+    op.create_index('ix_pvp_games_archive_player1_id_created_at', 'pvp_games_archive', ['player1_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_pvp_games_archive_player2_id_created_at', 'pvp_games_archive', ['player2_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pvp_games_archive_player2_id_created_at', table_name='pvp_games_archive')
+    op.drop_index('ix_pvp_games_archive_player1_id_created_at', table_name='pvp_games_archive')
+    op.create_index(op.f('ix_pvp_games_archive_player2_id'), 'pvp_games_archive', ['player2_id'], unique=False)
+    op.create_index(op.f('ix_pvp_games_archive_player1_id'), 'pvp_games_archive', ['player1_id'], unique=False)
+    op.drop_index('ix_pvp_games_player2_id_created_at', table_name='pvp_games')
+    op.drop_index('ix_pvp_games_player1_id_created_at', table_name='pvp_games')
+    op.drop_index('ix_single_games_player1_id_created_at', table_name='single_games')
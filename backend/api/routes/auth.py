@@ -61,6 +61,7 @@ async def logout(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
+    """Abandon the user's games in progress, the opponents winning"""
     game_service = GameService(db)
-    await game_service.abandon_all_active_games(current_user)
-    return {"message": "Logged out successfully"}
+    summary = await game_service.abandon_all_active_games(current_user)
+    return {"message": "Logged out successfully", "abandoned_games": summary["abandoned"]}
@@ -1,52 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.api.dependencies import get_current_user
+from backend.core.game_engine import Variant
 from backend.db.database import get_db
-from backend.db.models.game import Game, PlayerState
+from backend.db.models.game import Game
 from backend.db.models.user import User
-from backend.schemas.game import GameCreate, GameGuess, GameResponse
+from backend.schemas.game import (
+    GameCreate,
+    GameGuess,
+    GameHistoryPage,
+    GameResponse,
+    GameSummary,
+    decode_cursor,
+    encode_cursor,
+    game_response_from_game,
+)
+from backend.services.ai_executor import AIExecutorBusyError, AIMoveTimeoutError
 from backend.services.game_service import GameService
 
 router = APIRouter(prefix="/api/games", tags=["games"])
 
 
 def _game_response_from_game(game: Game, user: User) -> GameResponse:
-    if game.game_mode == "single":
-        self_player = game.player
-        opponent_player = PlayerState(id=None, name=None, secret=None, guesses=None, elo=None)
-    elif game.game_mode == "ai":
-        self_player = game.player1
-        opponent_player = game.player2
-    else:
-        self_player = game.player1 if game.player1.id == user.id else game.player2
-        opponent_player = game.player2 if game.player1.id == user.id else game.player1
-
-    self_secret = self_player.secret if game.status in ("completed", "abandoned") else None
-    return GameResponse(
-        id=game.id,
-        game_mode=game.game_mode,
-        self_id=self_player.id,
-        self_name=self_player.name,
-        self_secret=self_secret,  # type: ignore
-        self_guesses=self_player.guesses,
-        self_elo=self_player.elo,
-        winner_id=game.winner_id,
-        created_at=game.created_at,
-        completed_at=game.completed_at,
-        status=game.status,
-        started_at=game.started_at,
-        starter_id=game.starter_id,
-        # PvP Specific
-        opponent_id=opponent_player.id,
-        opponent_name=opponent_player.name,
-        opponent_secret=opponent_player.secret,
-        opponent_guesses=opponent_player.guesses,
-        opponent_elo=opponent_player.elo,
-        current_turn=getattr(game, "current_turn", None),
-        # AI Specific
-        ai_difficulty=getattr(game, "ai_difficulty", None),
-    )
+    return game_response_from_game(game, user.id)  # type: ignore
 
 
 @router.post("/new", response_model=GameResponse, status_code=201)
@@ -62,6 +42,7 @@ async def create_new_game(
             game_mode=game_data.game_mode,  # type: ignore
             player_secret=game_data.player_secret,
             ai_difficulty=game_data.ai_difficulty,
+            variant=Variant(num_digits=game_data.code_length, num_symbols=game_data.num_symbols),
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -69,6 +50,37 @@ async def create_new_game(
     return _game_response_from_game(game, user)
 
 
+@router.get("", response_model=GameHistoryPage)
+async def list_games(
+    before: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    The user's games, newest first, without guesses. Pass `next_cursor` back as
+    `before` for the next page; format=ndjson streams every game from `before` on,
+    one JSON summary per line.
+    """
+    service = GameService(db)
+    try:
+        cursor = decode_cursor(before) if before else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == "ndjson":
+        async def lines():
+            async for row in service.stream_game_history(user, cursor):
+                yield GameSummary.model_validate(row).model_dump_json() + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    rows = await service.game_history(user, cursor, limit + 1)
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    return GameHistoryPage(games=[GameSummary.model_validate(row) for row in rows[:limit]], next_cursor=next_cursor)
+
+
 @router.get("/{game_id}", response_model=GameResponse)
 async def get_game(
     game_id: int,
@@ -113,6 +125,10 @@ async def opponent_guess(
         game = await service.get_opponent_guess(game_id, user)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except AIExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except AIMoveTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
 
     return _game_response_from_game(game, user)
 
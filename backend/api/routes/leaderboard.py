@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Query
+
+from backend.schemas.leaderboard import LeaderboardResponse
+from backend.services.leaderboard import leaderboard
+
+router = APIRouter(prefix="/api/leaderboard", tags=["leaderboard"])
+
+
+@router.get("", response_model=LeaderboardResponse)
+async def get_leaderboard(offset: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=100)):
+    """Players ranked by Elo rating, highest first"""
+    await leaderboard.ensure_loaded()
+    return LeaderboardResponse(total=len(leaderboard), offset=offset, entries=leaderboard.top(offset, limit))  # type: ignore
@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+
+from backend.db.database import pool_metrics
+from backend.db.user_cache import user_cache
+from backend.services.game_reaper import game_reaper
+from backend.services.game_state_cache import game_state_cache
+from backend.services.leaderboard import leaderboard
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("/db-pool")
+async def db_pool():
+    """Connection pool usage: checked out and overflow connections, checkout waits and timeouts"""
+    return pool_metrics()
+
+
+@router.get("/user-cache")
+async def user_cache_metrics():
+    """Authenticated-user cache size, hits, misses and hit rate"""
+    return user_cache.metrics()
+
+
+@router.get("/game-cache")
+async def game_cache_metrics():
+    """In-progress game cache size, queued writes, hit rate, flushes and write-back conflicts"""
+    return game_state_cache.metrics()
+
+
+@router.get("/reaper")
+async def reaper_metrics():
+    """Stale-game sweeps: runs, last run, and games expired, forfeited, rated and archived"""
+    return game_reaper.metrics()
+
+
+@router.get("/leaderboard")
+async def leaderboard_metrics():
+    """Ranked players, lookups, reloads and seconds since the last reload"""
+    return leaderboard.metrics()
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.database import get_db
+from backend.schemas.leaderboard import RankResponse
+from backend.schemas.stats import UserStatsResponse
+from backend.services.leaderboard import leaderboard
+from backend.services.stats_service import StatsService
+
+router = APIRouter(prefix="/api/users", tags=["users"])
+
+
+@router.get("/{user_id}/rank", response_model=RankResponse)
+async def get_user_rank(user_id: int):
+    """A player's leaderboard rank"""
+    await leaderboard.ensure_loaded()
+    entry = leaderboard.rank(user_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="User is not ranked")
+    return RankResponse(total=len(leaderboard), **entry)
+
+
+@router.get("/{user_id}/stats", response_model=UserStatsResponse)
+async def get_user_stats(user_id: int, db: AsyncSession = Depends(get_db)):
+    """A player's win rates, guesses to solve and solve times, by kind of game"""
+    return await StatsService(db).user_stats(user_id)
@@ -0,0 +1,64 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.database import get_db
+from backend.schemas.game import game_response_from_game
+from backend.services.auth_service import AuthService
+from backend.services.game_events import get_broker
+from backend.services.game_service import GameService
+
+router = APIRouter(tags=["games"])
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/ws/games/{game_id}")
+async def game_updates(
+    websocket: WebSocket,
+    game_id: int,
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Push the game to the player as a GameResponse: once on connect, then after
+    every committed move, join or abandon.
+    """
+    # Subscribe before reading the game so that no update can fall in between
+    async with get_broker().subscribe(game_id) as updates:
+        user = await AuthService(db).get_current_user(token)
+        if user is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        try:
+            game = await GameService(db).get_game(game_id, user)
+        except ValueError:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        current_state = game_response_from_game(game, user.id).model_dump(mode="json")  # type: ignore
+        user_id = str(user.id)
+        # Release the connection; from here on updates only come from the broker
+        await db.close()
+
+        await websocket.accept()
+        await websocket.send_json(current_state)
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        try:
+            while not disconnected.done():
+                update = asyncio.create_task(updates.get())
+                await asyncio.wait({update, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not update.done():
+                    update.cancel()
+                    break
+                view = update.result()["views"].get(user_id)
+                if view is not None:
+                    await websocket.send_json(view)
+        finally:
+            disconnected.cancel()
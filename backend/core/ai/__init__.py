@@ -1,19 +1,22 @@
 from backend.core.ai.aradz_bot import AradzBot
 from backend.core.ai.base_ai import BaseAI
+from backend.core.ai.knuth_ai import KnuthAI
 from backend.core.ai.random_ai import RandomAI
 from backend.core.game_engine import MasterMindGame
 
+# Users the AI players play as; they are neither ranked nor given stats
+AI_USER_IDS = frozenset(ai.user().id for ai in (AradzBot, RandomAI, KnuthAI))
 
-def get_ai_player(difficulty: str, master_mind_game: MasterMindGame) -> BaseAI:
+
+def get_ai_player(difficulty: str, master_mind_game: MasterMindGame, state: dict | None = None) -> BaseAI:
     if difficulty == "easy":
         return RandomAI(master_mind_game)
+    elif difficulty == "medium":
+        return AradzBot(master_mind_game, state)
     elif difficulty == "hard":
-        return AradzBot(master_mind_game)
-    # Future implementations:
-    # elif difficulty == "medium":
-    #     return HeuristicAI()
+        return KnuthAI(master_mind_game, state)
     else:
         raise ValueError(f"Unknown AI difficulty level: {difficulty}")
 
 
-__all__ = ["BaseAI", "RandomAI", "AradzBot", "get_ai_player"]
+__all__ = ["BaseAI", "RandomAI", "KnuthAI", "AradzBot", "AI_USER_IDS", "get_ai_player"]
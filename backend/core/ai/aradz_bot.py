@@ -1,6 +1,8 @@
 import random
 
 from backend.core.ai.base_ai import BaseAI
+from backend.core.ai.candidates import sample_consistent
+from backend.core.ai.solver_state import SolverState
 from backend.core.game_engine import MasterMindGame
 from backend.db.models.user import User
 
@@ -8,11 +10,14 @@ from backend.db.models.user import User
 class AradzBot(BaseAI):
     """
     Advanced AI that systematically tests all possibilities (0-9999)
-    and validates each against all known constraints.
+    and validates each against all known constraints. The surviving
+    candidates are kept in a SolverState and narrowed one guess at a time;
+    larger variants scan the code space lazily instead.
     """
 
-    def __init__(self, master_mind_game: MasterMindGame):
+    def __init__(self, master_mind_game: MasterMindGame, state: dict | None = None):
         super().__init__(master_mind_game)
+        self.solver_state = SolverState.restore(state, self.feedback_table, master_mind_game.history)
 
     @staticmethod
     def user() -> User:
@@ -26,29 +31,21 @@ class AradzBot(BaseAI):
 
     def get_next_guess(self) -> str:
         """
-        Try numbers from 0000 to 9999, checking if each passes all constraints
+        Pick a random number from 0000 to 9999 that passes all constraints
         from previous guesses.
         """
-        numbers = list(range(10000))
-        random.shuffle(numbers)
-        for num in numbers:
-            candidate = str(num).zfill(4)
-
-            if self._is_valid_candidate(candidate):
-                return candidate
-
-        return "0000"
-
-    def _is_valid_candidate(self, candidate: str) -> bool:
-        mastermind = MasterMindGame(player_secret=candidate)
-        for guess_record in self.master_mind_game.history:
-            previous_guess = guess_record.guess
-            expected_exact = guess_record.exact
-            expected_wrong_pos = guess_record.wrong_pos
-
-            exact, wrong_pos = mastermind.evaluate_guess(previous_guess)
-
-            if exact != expected_exact or wrong_pos != expected_wrong_pos:
-                return False
-
-        return True
+        history = self.master_mind_game.history
+        if self.solver_state is None:
+            candidates = sample_consistent(self.feedback_table, history, count=1)
+        else:
+            self.solver_state.update(self.feedback_table, history)
+            candidates = self.solver_state.candidates
+        if len(candidates) == 0:
+            return self.master_mind_game.variant.alphabet[0] * self.feedback_table.num_digits
+        return self.feedback_table.decode(random.choice(candidates))
+
+    def export_state(self) -> dict | None:
+        if self.solver_state is None:
+            return None
+        self.solver_state.update(self.feedback_table, self.master_mind_game.history)
+        return self.solver_state.to_dict(self.feedback_table)
@@ -7,6 +7,7 @@ from backend.db.models.user import User
 class BaseAI(ABC):
     def __init__(self, master_mind_game: MasterMindGame):
         self.master_mind_game = master_mind_game
+        self.feedback_table = master_mind_game.feedback_table
 
     @staticmethod
     @abstractmethod
@@ -16,3 +17,7 @@ class BaseAI(ABC):
     @abstractmethod
     def get_next_guess(self) -> str:
         pass
+
+    def export_state(self) -> dict | None:
+        """Serializable solver state to pass back to `get_ai_player` on the next move."""
+        return None
@@ -0,0 +1,93 @@
+"""
+Candidate generation for code spaces too large to keep as a SolverState.
+
+Consistent codes are found by scanning the space lazily in chunks visited in
+random order, scoring each chunk against the history with NumPy, so memory
+stays bounded and a scan can stop as soon as enough candidates are found.
+"""
+import random
+from typing import MutableSequence, Protocol, Sequence, TypeVar
+
+import numpy as np
+
+from backend.core.feedback_table import FeedbackTable
+from backend.core.game_engine import GuessRecord
+
+# Spaces up to this size keep their full candidate set in a SolverState
+LAZY_SPACE_THRESHOLD = 1 << 16
+SCAN_CHUNK_SIZE = 1 << 16
+
+T = TypeVar("T")
+
+
+class RandomSource(Protocol):
+    """The part of random.Random a scan uses. The random module satisfies it, so random.seed() still applies."""
+
+    def shuffle(self, x: MutableSequence) -> None: ...
+
+    def sample(self, population: Sequence[T], k: int) -> list[T]: ...
+
+
+def consistent_mask(feedback_table: FeedbackTable, codes: np.ndarray, history: list[GuessRecord]) -> np.ndarray:
+    mask = np.ones(len(codes), dtype=bool)
+    for guess_record in history:
+        exact, wrong_pos = feedback_table.score_codes(codes[mask], feedback_table.encode(guess_record.guess))
+        mask[mask] = (exact == guess_record.exact) & (wrong_pos == guess_record.wrong_pos)
+    return mask
+
+
+def iter_consistent(feedback_table: FeedbackTable, history: list[GuessRecord], rng: RandomSource = random):
+    """Yield arrays of consistent codes, one scanned chunk at a time, in random chunk order."""
+    starts = list(range(0, feedback_table.size, SCAN_CHUNK_SIZE))
+    rng.shuffle(starts)
+    for start in starts:
+        codes = np.arange(start, min(start + SCAN_CHUNK_SIZE, feedback_table.size))
+        consistent = codes[consistent_mask(feedback_table, codes, history)]
+        if len(consistent):
+            yield consistent
+
+
+def sample_consistent(
+    feedback_table: FeedbackTable, history: list[GuessRecord], count: int, rng: RandomSource = random
+) -> np.ndarray:
+    """Up to `count` consistent codes; every consistent code when there are fewer."""
+    found: list[np.ndarray] = []
+    total = 0
+    for consistent in iter_consistent(feedback_table, history, rng):
+        found.append(consistent)
+        total += len(consistent)
+        if total >= count:
+            break
+    if not found:
+        return np.empty(0, dtype=np.int64)
+
+    candidates = np.concatenate(found)
+    if len(candidates) > count:
+        candidates = np.sort(candidates[rng.sample(range(len(candidates)), count)])
+    return candidates
+
+
+def symmetry_reduced(feedback_table: FeedbackTable, codes: np.ndarray, history: list[GuessRecord]) -> np.ndarray:
+    """
+    Keep one representative per class of codes that only differ by a relabelling of
+    symbols never played in `history`: the unplayed symbols of a kept code appear
+    in ascending order of first use.
+    """
+    played = {symbol for guess_record in history for symbol in feedback_table.digits_of(feedback_table.encode(guess_record.guess)).tolist()}
+    unplayed_rank = np.full(feedback_table.num_symbols, -1)
+    unplayed = [symbol for symbol in range(feedback_table.num_symbols) if symbol not in played]
+    unplayed_rank[unplayed] = np.arange(len(unplayed))
+
+    digits = feedback_table.digits_of(codes)
+    rows = np.arange(len(codes))
+    seen = np.zeros((len(codes), feedback_table.num_symbols), dtype=bool)
+    next_rank = np.zeros(len(codes), dtype=np.int64)
+    keep = np.ones(len(codes), dtype=bool)
+    for position in range(feedback_table.num_digits):
+        symbols = digits[:, position]
+        ranks = unplayed_rank[symbols]
+        first_use = (ranks >= 0) & ~seen[rows, symbols]
+        keep &= ~first_use | (ranks == next_rank)
+        next_rank += first_use
+        seen[rows, symbols] = True
+    return codes[keep]
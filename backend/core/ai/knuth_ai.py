@@ -0,0 +1,142 @@
+import os
+import random
+import time
+
+import numpy as np
+
+from backend.core.ai.base_ai import BaseAI
+from backend.core.ai.candidates import sample_consistent, symmetry_reduced
+from backend.core.ai.opening_book import get_opening_book
+from backend.core.ai.solver_state import SolverState
+from backend.core.feedback_table import FeedbackTable
+from backend.core.game_engine import MasterMindGame
+from backend.db.models.user import User
+
+MOVE_TIME_BUDGET = float(os.getenv("AI_MOVE_TIME_BUDGET", "1.0"))
+# Upper bound on guess x candidate pairs scored per NumPy batch
+BATCH_PAIRS = 1 << 20
+# Candidates and extra guesses scored per move when the code space is scanned lazily
+CANDIDATE_SAMPLE_SIZE = 2048
+GUESS_SAMPLE_SIZE = 2048
+
+
+class KnuthAI(BaseAI):
+    """
+    Consistency-plus-partition AI. Every code is scored by how it would split
+    the surviving candidates, and the guess with the smallest worst-case
+    ("minimax") or expected ("expected") remaining partition is played.
+    Early moves come from the opening book when it has an entry.
+    Falls back to a random consistent candidate when the time budget runs out.
+
+    Guesses that only differ by a relabelling of never-played symbols split the
+    candidates the same way, so just one of each is scored. Larger variants
+    score a random sample of candidates and guesses instead of the whole space.
+    """
+
+    def __init__(
+        self,
+        master_mind_game: MasterMindGame,
+        state: dict | None = None,
+        strategy: str = "minimax",
+        time_budget: float = MOVE_TIME_BUDGET,
+        use_opening_book: bool = True,
+    ):
+        super().__init__(master_mind_game)
+        if strategy not in ("minimax", "expected"):
+            raise ValueError(f"Unknown partition strategy: {strategy}")
+        self.strategy = strategy
+        self.time_budget = time_budget
+        self.opening_book = get_opening_book() if use_opening_book else None
+        self.solver_state = SolverState.restore(state, self.feedback_table, master_mind_game.history)
+
+    @staticmethod
+    def user() -> User:
+        # Negative ids are never handed out by the users id sequence, so no real user can hold it
+        return User(
+            id=-1,
+            email="knuth@ai.mastermind",
+            display_name="Knuth",
+            is_guest=False,
+            elo_rating=2200.0,
+        )
+
+    def get_next_guess(self) -> str:
+        history = self.master_mind_game.history
+        if self.solver_state is None:
+            candidates = sample_consistent(self.feedback_table, history, CANDIDATE_SAMPLE_SIZE)
+        else:
+            self.solver_state.update(self.feedback_table, history)
+            candidates = self.solver_state.candidates
+        if len(candidates) == 0:
+            return self.master_mind_game.variant.alphabet[0] * self.feedback_table.num_digits
+        if len(candidates) <= 2:
+            return self.feedback_table.decode(candidates[0])
+
+        if (
+            self.opening_book is not None
+            and self.opening_book.strategy == self.strategy
+            and self.opening_book.feedback_table is self.feedback_table
+        ):
+            book_move = self.opening_book.lookup(history)
+            if book_move is not None:
+                return book_move
+
+        deadline = time.monotonic() + self.time_budget
+        best_guess = self.best_partition_guess(candidates, deadline)
+        if best_guess is None:
+            return self.feedback_table.decode(random.choice(candidates))
+        return self.feedback_table.decode(best_guess)
+
+    def export_state(self) -> dict | None:
+        if self.solver_state is None:
+            return None
+        self.solver_state.update(self.feedback_table, self.master_mind_game.history)
+        return self.solver_state.to_dict(self.feedback_table)
+
+    def best_partition_guess(self, candidates: np.ndarray, deadline: float | None = None) -> int | None:
+        if self.solver_state is None:
+            pool = np.array(random.sample(range(self.feedback_table.size), GUESS_SAMPLE_SIZE))
+        else:
+            pool = np.arange(self.feedback_table.size)
+        others = np.setdiff1d(pool, candidates)
+        others = symmetry_reduced(self.feedback_table, others, self.master_mind_game.history)
+        return best_partition_guess(self.feedback_table, candidates, self.strategy, deadline, others)
+
+
+def best_partition_guess(
+    feedback_table: FeedbackTable,
+    candidates: np.ndarray,
+    strategy: str = "minimax",
+    deadline: float | None = None,
+    others: np.ndarray | None = None,
+) -> int | None:
+    """
+    Scan the whole guess space (or the candidates plus `others`) in batches and
+    return the best guess, or None if the deadline passes first. Candidates are
+    scanned first so that ties are broken in favour of guesses that can win.
+    """
+    num_bins = (feedback_table.num_digits + 1) ** 2
+    if others is None:
+        others = np.setdiff1d(np.arange(feedback_table.size), candidates, assume_unique=True)
+    guesses = np.concatenate([candidates, others])
+    batch_size = max(1, BATCH_PAIRS // len(candidates))
+
+    best_guess, best_score = None, None
+    for start in range(0, len(guesses), batch_size):
+        if deadline is not None and time.monotonic() > deadline:
+            return None
+        batch = guesses[start : start + batch_size]
+        feedback = feedback_table.feedback(batch, candidates).astype(np.int64)
+        feedback += np.arange(len(batch))[:, None] * num_bins
+        histogram = np.bincount(feedback.ravel(), minlength=len(batch) * num_bins).reshape(len(batch), num_bins)
+        if strategy == "minimax":
+            scores = histogram.max(axis=1)
+        else:
+            # Expected remaining size is sum(n^2) / len(candidates)
+            scores = (histogram * histogram).sum(axis=1)
+
+        index = int(scores.argmin())
+        if best_score is None or scores[index] < best_score:
+            best_guess, best_score = int(batch[index]), scores[index]
+
+    return best_guess
@@ -0,0 +1,187 @@
+"""
+Opening book for the partition-based AI, KnuthAI, which plays the hard difficulty.
+
+The first moves of an optimal solver depend only on the feedback sequence, and the
+game is symmetric under any permutation of positions and of symbols. Histories are
+therefore mapped into a canonical frame derived from their first guess (its positions
+sorted by symbol multiplicity and its symbols relabelled in order of appearance), so a
+random free guess such as "7371" shares its book entries with "0012".
+
+Binary layout (little endian): a header of magic, version, num_digits, num_symbols,
+max_depth, strategy and entry count, followed by fixed-size records of
+(depth: u8, max_depth x (guess: u16, feedback: u8), move: u16).
+"""
+import functools
+import os
+import struct
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from backend.core.feedback_table import FeedbackTable, get_feedback_table
+from backend.core.game_engine import GuessRecord
+
+MAGIC = b"MMOB"
+VERSION = 1
+STRATEGIES = ("minimax", "expected")
+HEADER = struct.Struct("<4sBBBBBI")
+DEFAULT_BOOK_PATH = Path(__file__).parent / "opening_book.bin"
+
+BookKey = tuple[tuple[int, int], ...]
+
+
+class OpeningBook:
+    def __init__(self, feedback_table: FeedbackTable, entries: dict[BookKey, int], max_depth: int, strategy: str = "minimax"):
+        self.feedback_table = feedback_table
+        self.entries = entries
+        self.max_depth = max_depth
+        self.strategy = strategy
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, history: list[GuessRecord]) -> str | None:
+        if len(history) > self.max_depth or not self.entries:
+            return None
+        frame = CanonicalFrame.from_history(self.feedback_table, history)
+        move = self.entries.get(frame.key(history))
+        if move is None:
+            return None
+        return self.feedback_table.decode(frame.restore(move))
+
+    def save(self, path: Path) -> None:
+        record = _record_struct(self.max_depth)
+        with open(path, "wb") as f:
+            f.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    self.feedback_table.num_digits,
+                    self.feedback_table.num_symbols,
+                    self.max_depth,
+                    STRATEGIES.index(self.strategy),
+                    len(self.entries),
+                )
+            )
+            for key, move in sorted(self.entries.items()):
+                padded = [value for pair in key for value in pair] + [0, 0] * (self.max_depth - len(key))
+                f.write(record.pack(len(key), *padded, move))
+
+    @classmethod
+    def load(cls, path: Path) -> "OpeningBook":
+        data = Path(path).read_bytes()
+        magic, version, num_digits, num_symbols, max_depth, strategy, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not an opening book file: {path}")
+
+        record = _record_struct(max_depth)
+        entries: dict[BookKey, int] = {}
+        for values in record.iter_unpack(data[HEADER.size : HEADER.size + count * record.size]):
+            depth, moves, move = values[0], values[1:-1], values[-1]
+            entries[tuple(zip(moves[0 : 2 * depth : 2], moves[1 : 2 * depth : 2]))] = move
+        return cls(get_feedback_table(num_digits, num_symbols), entries, max_depth, STRATEGIES[strategy])
+
+
+class CanonicalFrame:
+    """Position permutation and symbol relabelling that maps a history into book coordinates."""
+
+    def __init__(self, feedback_table: FeedbackTable, positions: np.ndarray, symbol_map: np.ndarray):
+        self.feedback_table = feedback_table
+        self.positions = positions
+        self.symbol_map = symbol_map
+        self.inverse_symbol_map = np.argsort(symbol_map)
+
+    @classmethod
+    def from_history(cls, feedback_table: FeedbackTable, history: list[GuessRecord]) -> "CanonicalFrame":
+        num_digits, num_symbols = feedback_table.num_digits, feedback_table.num_symbols
+        if not history:
+            return cls(feedback_table, np.arange(num_digits), np.arange(num_symbols))
+
+        digits = feedback_table.digits_of(feedback_table.encode(history[0].guess)).tolist()
+        counts = Counter(digits)
+        positions = sorted(range(num_digits), key=lambda p: (-counts[digits[p]], digits.index(digits[p]), p))
+
+        symbol_map = np.full(num_symbols, -1)
+        next_label = 0
+        for symbol in [digits[p] for p in positions] + list(range(num_symbols)):
+            if symbol_map[symbol] < 0:
+                symbol_map[symbol] = next_label
+                next_label += 1
+        return cls(feedback_table, np.array(positions), symbol_map)
+
+    def transform(self, code: int) -> int:
+        digits = self.feedback_table.digits_of(code)
+        return int(self.feedback_table.compose(self.symbol_map[digits[self.positions]]))
+
+    def restore(self, code: int) -> int:
+        digits = np.empty(self.feedback_table.num_digits, dtype=np.int64)
+        digits[self.positions] = self.inverse_symbol_map[self.feedback_table.digits_of(code)]
+        return int(self.feedback_table.compose(digits))
+
+    def key(self, history: list[GuessRecord]) -> BookKey:
+        table = self.feedback_table
+        return tuple(
+            (self.transform(table.encode(record.guess)), table.pack(record.exact, record.wrong_pos)) for record in history
+        )
+
+
+def build_opening_book(
+    max_depth: int = 2,
+    strategy: str = "minimax",
+    feedback_table: FeedbackTable | None = None,
+    progress=None,
+) -> OpeningBook:
+    """
+    Solve every canonical history of up to `max_depth` records offline. Depth 1
+    covers every possible first guess (the free guess may be random), deeper
+    levels follow the book's own replies.
+    """
+    from backend.core.ai.knuth_ai import best_partition_guess
+    from backend.core.ai.solver_state import SolverState
+
+    table = feedback_table or get_feedback_table()
+    win = table.pack(table.num_digits, 0)
+    entries: dict[BookKey, int] = {}
+
+    def solve(key: BookKey) -> None:
+        state = SolverState.initial(table)
+        state.update(table, [GuessRecord(table.decode(guess), *table.unpack(packed)) for guess, packed in key])
+        candidates = state.candidates
+        if len(candidates) <= 2:
+            # The AI plays a surviving candidate directly
+            return
+        entries[key] = best_partition_guess(table, candidates, strategy)
+        if progress is not None:
+            progress(len(entries), key)
+
+        if len(key) < max_depth and len(key) > 0:
+            move = entries[key]
+            for packed in np.unique(table.row(move)[candidates]):
+                if packed != win:
+                    solve(key + ((move, int(packed)),))
+
+    solve(())
+    if max_depth >= 1:
+        first_guesses = {
+            CanonicalFrame.from_history(table, [GuessRecord(table.decode(code), 0, 0)]).transform(code)
+            for code in range(table.size)
+        }
+        for guess in sorted(first_guesses):
+            for packed in np.unique(table.row(guess)):
+                if packed != win:
+                    solve(((guess, int(packed)),))
+
+    return OpeningBook(table, entries, max_depth, strategy)
+
+
+@functools.lru_cache(maxsize=None)
+def get_opening_book() -> OpeningBook:
+    path = Path(os.getenv("OPENING_BOOK_PATH", DEFAULT_BOOK_PATH))
+    if not path.exists():
+        return OpeningBook(get_feedback_table(), {}, max_depth=0)
+    return OpeningBook.load(path)
+
+
+def _record_struct(max_depth: int) -> struct.Struct:
+    return struct.Struct("<B" + "HB" * max_depth + "H")
@@ -23,8 +23,12 @@ class RandomAI(BaseAI):
     def get_next_guess(self) -> str:
         max_attempts = 100
         for _ in range(max_attempts):
-            guess = "".join(str(random.randint(0, 9)) for _ in range(4))
+            guess = self._random_guess()
             if guess not in self.used_guesses:
                 return guess
 
-        return "".join(str(random.randint(0, 9)) for _ in range(4))
+        return self._random_guess()
+
+    def _random_guess(self) -> str:
+        variant = self.master_mind_game.variant
+        return "".join(random.choice(variant.alphabet) for _ in range(variant.num_digits))
@@ -0,0 +1,68 @@
+import base64
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.core.ai.candidates import LAZY_SPACE_THRESHOLD
+from backend.core.feedback_table import FeedbackTable
+from backend.core.game_engine import GuessRecord
+
+
+@dataclass
+class SolverState:
+    """
+    Codes still consistent with the first `applied` records of a game's history.
+
+    Each new guess only narrows the surviving candidates, so restoring the state
+    between moves never rescans the whole history or the whole code space.
+    """
+
+    candidates: np.ndarray
+    applied: int = 0
+
+    @classmethod
+    def initial(cls, feedback_table: FeedbackTable) -> "SolverState":
+        return cls(candidates=np.arange(feedback_table.size, dtype=np.int64))
+
+    @classmethod
+    def restore(cls, state: dict | None, feedback_table: FeedbackTable, history: list[GuessRecord]) -> "SolverState | None":
+        """Resume from an exported state, or None when the space is too large to track (see candidates.py)."""
+        if feedback_table.size > LAZY_SPACE_THRESHOLD:
+            return None
+        if state is not None and state["applied"] <= len(history):
+            return cls.from_dict(state, feedback_table)
+        return cls.initial(feedback_table)
+
+    def update(self, feedback_table: FeedbackTable, history: list[GuessRecord]) -> None:
+        for guess_record in history[self.applied :]:
+            row = feedback_table.row(feedback_table.encode(guess_record.guess))
+            packed = feedback_table.pack(guess_record.exact, guess_record.wrong_pos)
+            self.candidates = self.candidates[row[self.candidates] == packed]
+        self.applied = max(self.applied, len(history))
+
+    def to_dict(self, feedback_table: FeedbackTable) -> dict:
+        # Store whichever is smaller: the index list or a bitmask over the whole space
+        index_dtype = _index_dtype(feedback_table)
+        if len(self.candidates) * index_dtype.itemsize <= feedback_table.size // 8:
+            encoding = "indices"
+            payload = self.candidates.astype(index_dtype).tobytes()
+        else:
+            encoding = "bitmask"
+            mask = np.zeros(feedback_table.size, dtype=bool)
+            mask[self.candidates] = True
+            payload = np.packbits(mask).tobytes()
+        return {"applied": self.applied, "encoding": encoding, "candidates": base64.b64encode(payload).decode()}
+
+    @classmethod
+    def from_dict(cls, data: dict, feedback_table: FeedbackTable) -> "SolverState":
+        payload = base64.b64decode(data["candidates"])
+        if data["encoding"] == "indices":
+            candidates = np.frombuffer(payload, dtype=_index_dtype(feedback_table)).astype(np.int64)
+        else:
+            mask = np.unpackbits(np.frombuffer(payload, dtype=np.uint8), count=feedback_table.size)
+            candidates = np.flatnonzero(mask)
+        return cls(candidates=candidates, applied=data["applied"])
+
+
+def _index_dtype(feedback_table: FeedbackTable) -> np.dtype:
+    return np.dtype("<u2") if feedback_table.size <= 1 << 16 else np.dtype("<u4")
@@ -0,0 +1,152 @@
+"""
+Precomputed Mastermind feedback lookups.
+
+Every code of the space is identified by its integer value in base `num_symbols`
+(0-9999 for the classic 4-digit game) and the feedback of a guess against a secret
+is packed into a single byte as ``exact * (num_digits + 1) + wrong_pos``. Feedback
+is symmetric, so the row of a guess is also the column of that code as a secret.
+
+Digit and symbol-count arrays are precomputed for spaces of up to PRECOMPUTE_LIMIT
+codes; larger spaces decompose codes on the fly, chunk by chunk.
+
+Only batch scoring uses the table: the AI's candidate scans read cached rows, or
+the full matrix once build() has materialized it. A single guess, as scored by
+MasterMindGame.evaluate_guess, is read from the matrix when it is built and is
+otherwise scored from its code strings, which is faster than computing a row.
+"""
+import functools
+
+import numpy as np
+
+NUM_DIGITS = 4
+NUM_SYMBOLS = 10
+SYMBOLS = "0123456789AB"
+PRECOMPUTE_LIMIT = 1 << 20
+# Byte budget for cached rows; each row holds one byte per code
+ROW_CACHE_BYTES = 32 << 20
+BUILD_CHUNK_SIZE = 256
+ROW_CHUNK_SIZE = 1 << 18
+
+
+class FeedbackTable:
+    def __init__(self, num_digits: int = NUM_DIGITS, num_symbols: int = NUM_SYMBOLS, row_cache_size: int | None = None):
+        if not 1 <= num_symbols <= len(SYMBOLS):
+            raise ValueError(f"Unsupported number of symbols: {num_symbols}")
+        self.num_digits = num_digits
+        self.num_symbols = num_symbols
+        self.alphabet = SYMBOLS[:num_symbols]
+        self.size = num_symbols**num_digits
+        self.powers = num_symbols ** np.arange(num_digits - 1, -1, -1, dtype=np.int64)
+
+        # digits[code, position] and counts[code, symbol]
+        self.digits: np.ndarray | None = None
+        self.counts: np.ndarray | None = None
+        if self.size <= PRECOMPUTE_LIMIT:
+            codes = np.arange(self.size)
+            self.digits = self._decompose(codes)
+            self.counts = self._count_symbols(self.digits)
+
+        self._table: np.ndarray | None = None
+        if row_cache_size is None:
+            row_cache_size = max(4, ROW_CACHE_BYTES // self.size)
+        self.row = functools.lru_cache(maxsize=row_cache_size)(self._compute_row)
+
+    def _decompose(self, codes: np.ndarray) -> np.ndarray:
+        return ((np.asarray(codes)[..., None] // self.powers) % self.num_symbols).astype(np.uint8)
+
+    def _count_symbols(self, digits: np.ndarray) -> np.ndarray:
+        return (digits[..., None] == np.arange(self.num_symbols, dtype=np.uint8)).sum(axis=-2, dtype=np.uint8)
+
+    def digits_of(self, codes) -> np.ndarray:
+        if self.digits is not None:
+            return self.digits[codes]
+        return self._decompose(codes)
+
+    def counts_of(self, codes) -> np.ndarray:
+        if self.counts is not None:
+            return self.counts[codes]
+        return self._count_symbols(self._decompose(codes))
+
+    def compose(self, digits: np.ndarray) -> np.ndarray:
+        return (np.asarray(digits, dtype=np.int64) * self.powers).sum(axis=-1)
+
+    def encode(self, code: str) -> int:
+        return int(code, self.num_symbols)
+
+    def decode(self, index: int) -> str:
+        return "".join(self.alphabet[d] for d in self.digits_of(index))
+
+    def pack(self, exact: int, wrong_pos: int) -> int:
+        return exact * (self.num_digits + 1) + wrong_pos
+
+    def unpack(self, packed: int) -> tuple[int, int]:
+        exact, wrong_pos = divmod(int(packed), self.num_digits + 1)
+        return exact, wrong_pos
+
+    @property
+    def is_built(self) -> bool:
+        return self._table is not None
+
+    def build(self) -> np.ndarray:
+        """Materialize the full size x size uint8 matrix (about 100 MB for 4 digits)."""
+        if self._table is None:
+            if self.size > PRECOMPUTE_LIMIT // 64:
+                raise ValueError(f"A full feedback table for {self.size} codes does not fit in memory")
+            table = np.empty((self.size, self.size), dtype=np.uint8)
+            for start in range(0, self.size, BUILD_CHUNK_SIZE):
+                guesses = np.arange(start, min(start + BUILD_CHUNK_SIZE, self.size))
+                table[guesses] = self.feedback(guesses, np.arange(self.size))
+            table.setflags(write=False)
+            self._table = table
+        return self._table
+
+    def score_codes(self, secrets, guesses) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Elementwise (exact, wrong_pos) arrays for broadcastable arrays of integer
+        codes, from per-position digit matches and per-symbol count minima.
+        """
+        secrets, guesses = np.asarray(secrets), np.asarray(guesses)
+        exact = (self.digits_of(secrets) == self.digits_of(guesses)).sum(axis=-1, dtype=np.uint8)
+        total = np.minimum(self.counts_of(secrets), self.counts_of(guesses)).sum(axis=-1, dtype=np.uint8)
+        return exact, total - exact
+
+    def feedback(self, guesses: np.ndarray, secrets: np.ndarray) -> np.ndarray:
+        """Packed feedback matrix of shape (len(guesses), len(secrets))."""
+        exact, wrong_pos = self.score_codes(np.asarray(secrets)[None, :], np.asarray(guesses)[:, None])
+        return exact * np.uint8(self.num_digits + 1) + wrong_pos
+
+    def encode_many(self, codes: list[str]) -> np.ndarray:
+        return np.array([self.encode(code) for code in codes], dtype=np.int64)
+
+    def _compute_row(self, guess: int) -> np.ndarray:
+        if self._table is not None:
+            return self._table[guess]
+        row = np.empty(self.size, dtype=np.uint8)
+        for start in range(0, self.size, ROW_CHUNK_SIZE):
+            secrets = np.arange(start, min(start + ROW_CHUNK_SIZE, self.size))
+            row[start : start + len(secrets)] = self.feedback(np.array([guess]), secrets)[0]
+        row.setflags(write=False)
+        return row
+
+    def lookup(self, secret: int, guess: int) -> int:
+        """Packed feedback of one pair; never builds a row, which only pays off for scans."""
+        if self._table is not None:
+            return int(self._table[guess, secret])
+        return self.pack(*score_pair(self.decode(secret), self.decode(guess)))
+
+    def score(self, secret: str, guess: str) -> tuple[int, int]:
+        if self._table is not None:
+            return self.unpack(self._table[self.encode(guess), self.encode(secret)])
+        return score_pair(secret, guess)
+
+
+def score_pair(secret: str, guess: str) -> tuple[int, int]:
+    """(exact, wrong_pos) of one guess, from the code strings directly."""
+    exact = sum(s == g for s, g in zip(secret, guess))
+    total = sum(min(secret.count(symbol), guess.count(symbol)) for symbol in set(guess))
+    return exact, total - exact
+
+
+@functools.lru_cache(maxsize=None)
+def get_feedback_table(num_digits: int = NUM_DIGITS, num_symbols: int = NUM_SYMBOLS) -> FeedbackTable:
+    return FeedbackTable(num_digits, num_symbols)
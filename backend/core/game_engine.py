@@ -1,7 +1,13 @@
 import random
-from collections import Counter
 from dataclasses import dataclass
 
+import numpy as np
+
+from backend.core.feedback_table import SYMBOLS, FeedbackTable, get_feedback_table
+
+MIN_CODE_LENGTH, MAX_CODE_LENGTH = 4, 6
+MIN_SYMBOLS, MAX_SYMBOLS = 6, len(SYMBOLS)
+
 
 @dataclass
 class GuessRecord:
@@ -10,37 +16,79 @@ class GuessRecord:
     wrong_pos: int
 
 
+@dataclass(frozen=True)
+class Variant:
+    """Code length and number of symbols; codes use the first `num_symbols` of 0-9, A, B."""
+
+    num_digits: int = 4
+    num_symbols: int = 10
+
+    def __post_init__(self):
+        if not MIN_CODE_LENGTH <= self.num_digits <= MAX_CODE_LENGTH:
+            raise ValueError(f"Code length must be between {MIN_CODE_LENGTH} and {MAX_CODE_LENGTH}")
+        if not MIN_SYMBOLS <= self.num_symbols <= MAX_SYMBOLS:
+            raise ValueError(f"Number of symbols must be between {MIN_SYMBOLS} and {MAX_SYMBOLS}")
+
+    @property
+    def alphabet(self) -> str:
+        return SYMBOLS[: self.num_symbols]
+
+    @property
+    def size(self) -> int:
+        return self.num_symbols**self.num_digits
+
+    def encode(self, code: str) -> int:
+        return int(code, self.num_symbols)
+
+    def decode(self, value: int) -> str:
+        symbols = []
+        for _ in range(self.num_digits):
+            value, digit = divmod(value, self.num_symbols)
+            symbols.append(self.alphabet[digit])
+        return "".join(reversed(symbols))
+
+    def pack_feedback(self, exact: int, wrong_pos: int) -> int:
+        """Same packing as FeedbackTable: exact * (num_digits + 1) + wrong_pos."""
+        return exact * (self.num_digits + 1) + wrong_pos
+
+    def unpack_feedback(self, packed: int) -> tuple[int, int]:
+        exact, wrong_pos = divmod(packed, self.num_digits + 1)
+        return exact, wrong_pos
+
+
+CLASSIC = Variant()
+
+
 class MasterMindGame:
-    def __init__(self, player_secret: str | None = None, history: list[GuessRecord] | None = None):
-        self.num_digits = 4
+    def __init__(
+        self, player_secret: str | None = None, history: list[GuessRecord] | None = None, variant: Variant = CLASSIC
+    ):
+        self.variant = variant
+        self.num_digits = variant.num_digits
+        self.feedback_table: FeedbackTable = get_feedback_table(variant.num_digits, variant.num_symbols)
         self.secret = player_secret or self._generate_secret_number()
         self.history: list[GuessRecord] = history or []
         self.attempts = len(self.history)
 
+    def _random_code(self) -> str:
+        return "".join(random.choices(self.variant.alphabet, k=self.num_digits))
+
     def _generate_secret_number(self) -> str:
-        digits = random.choices(range(10), k=self.num_digits)
-        return "".join(map(str, digits))
+        return self._random_code()
 
     def validate_guess(self, guess: str) -> bool:
-        return len(guess) == self.num_digits and guess.isdigit()
+        return len(guess) == self.num_digits and all(symbol in self.variant.alphabet for symbol in guess)
 
     def evaluate_guess(self, guess: str) -> tuple[int, int]:
-        exact_matches = 0
-
-        for secret_digit, guess_digit in zip(self.secret, guess):
-            if secret_digit == guess_digit:
-                exact_matches += 1
-
-        secret_counter = Counter(self.secret)
-        guess_counter = Counter(guess)
-
-        total_matches = 0
-        for digit in guess_counter:
-            total_matches += min(secret_counter[digit], guess_counter[digit])
+        return self.feedback_table.score(self.secret, guess)
 
-        wrong_position_matches = total_matches - exact_matches
+    def evaluate_guesses(self, guesses: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Score many integer-encoded guesses against this game's secret."""
+        return self.feedback_table.score_codes(self.feedback_table.encode(self.secret), guesses)
 
-        return exact_matches, wrong_position_matches
+    def evaluate_secrets(self, secrets: np.ndarray, guess: str) -> tuple[np.ndarray, np.ndarray]:
+        """Score one guess against many integer-encoded secrets."""
+        return self.feedback_table.score_codes(secrets, self.feedback_table.encode(guess))
 
     def make_guess(self, guess: str) -> tuple[int, int, bool]:
         self.attempts += 1
@@ -52,10 +100,10 @@ class MasterMindGame:
 
     def generate_random_guess(self, max_attempts: int = 100) -> str:
         for _ in range(max_attempts):
-            guess = "".join(str(d) for d in random.choices(range(10), k=self.num_digits))
+            guess = self._random_code()
             if guess != self.secret:
                 return guess
-        return "0000"
+        return self.variant.alphabet[0] * self.num_digits
 
     def apply_free_guess(self) -> None:
         random_guess = self.generate_random_guess()
@@ -2,9 +2,20 @@
 JWT token utilities for authentication.
 
 Handles creation and verification of JWT tokens using HS256 algorithm.
+Verified tokens are cached by SHA-256 digest until their expiry, so a client
+presenting the same token on every request is only verified once. With
+JWT_BACKEND=hmac, tokens are signed and checked directly with the standard
+library instead of python-jose; both backends read each other's tokens.
 """
+import base64
+import hashlib
+import hmac
+import json
 import os
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from jose import JWTError, jwt
@@ -12,6 +23,100 @@ from jose import JWTError, jwt
 SECRET_KEY = os.getenv("SECRET_KEY", "dev_secret_key_change_in_production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 7
+JWT_BACKEND = os.getenv("JWT_BACKEND", "jose")
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+
+
+class TokenCache:
+    """Bounded LRU map of token digest -> (user id, exp timestamp)."""
+
+    def __init__(self, max_size: int = JWT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: bytes, user_id: int, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (user_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _hs256_encode(claims: dict) -> str:
+    header = _b64encode(json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(SECRET_KEY.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64encode(signature)}"
+
+
+def _hs256_decode(token: str) -> Optional[dict]:
+    """Check the signature and time claims of an HS256 token; None if invalid."""
+    try:
+        header, payload, signature = token.split(".")
+        if json.loads(_b64decode(header)).get("alg") != ALGORITHM:
+            return None
+        expected = hmac.new(SECRET_KEY.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if not isinstance(claims, dict):
+        return None
+    now = time.time()
+    if "exp" in claims and float(claims["exp"]) <= now:
+        return None
+    if "nbf" in claims and float(claims["nbf"]) > now:
+        return None
+    return claims
+
+
+def _decode(token: str) -> Optional[dict]:
+    if JWT_BACKEND == "hmac":
+        return _hs256_decode(token)
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
 
 
 def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None) -> str:
@@ -35,6 +140,9 @@ def create_access_token(user_id: int, expires_delta: Optional[timedelta] = None)
         "exp": expire
     }
 
+    if JWT_BACKEND == "hmac":
+        to_encode["exp"] = int(expire.replace(tzinfo=timezone.utc).timestamp())
+        return _hs256_encode(to_encode)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -49,11 +157,20 @@ def verify_token(token: str) -> Optional[int]:
     Returns:
         User ID if token is valid, None otherwise
     """
+    key = TokenCache.key(token)
+    cached = token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    payload = _decode(token)
+    if payload is None:
+        return None
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return None
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-        return int(user_id)
-    except JWTError:
+        parsed_id = int(user_id)
+    except ValueError:
         return None
+    token_cache.set(key, parsed_id, float(payload.get("exp", float("inf"))))
+    return parsed_id
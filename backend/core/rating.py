@@ -0,0 +1,66 @@
+"""
+Elo ratings.
+
+A result moves K_FACTOR * (1 - expected score of the winner) points from the
+loser to the winner. Points are not rounded; ratings are floats.
+
+replay() rates a sequence of results in order with NumPy. Results are split into
+rounds in which no player appears twice, each player's results keeping their
+order, and every round is rated in one vectorized step. A result only depends on
+the earlier results of its two players, so this matches rating them one by one.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+K_FACTOR = 32
+DEFAULT_RATING = 1200.0
+
+
+def expected_score(rating, opponent_rating):
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def elo_points(winner_rating, loser_rating):
+    """Rating points the winner takes from the loser."""
+    return K_FACTOR * (1 - expected_score(winner_rating, loser_rating))
+
+
+def schedule_rounds(winners: np.ndarray, losers: np.ndarray) -> np.ndarray:
+    """Round of each result: the first round after the previous results of both its players."""
+    next_round: dict[int, int] = {}
+    rounds = np.empty(len(winners), dtype=np.int64)
+    for i, (winner, loser) in enumerate(zip(winners.tolist(), losers.tolist())):
+        rounds[i] = max(next_round.get(winner, 0), next_round.get(loser, 0))
+        next_round[winner] = next_round[loser] = rounds[i] + 1
+    return rounds
+
+
+@dataclass
+class Replay:
+    ratings: np.ndarray
+    winner_before: np.ndarray
+    loser_before: np.ndarray
+    points: np.ndarray
+
+
+def replay(ratings: np.ndarray, winners: np.ndarray, losers: np.ndarray) -> Replay:
+    """
+    Rate results in order. `winners` and `losers` index into `ratings`, which is
+    left unchanged; the returned ratings are the ones after the last result.
+    """
+    ratings = np.array(ratings, dtype=np.float64)
+    winners, losers = np.asarray(winners, dtype=np.int64), np.asarray(losers, dtype=np.int64)
+    winner_before, loser_before, points = np.zeros((3, len(winners)))
+    if len(winners) == 0:
+        return Replay(ratings, winner_before, loser_before, points)
+
+    rounds = schedule_rounds(winners, losers)
+    order = np.argsort(rounds, kind="stable")
+    for results in np.split(order, np.flatnonzero(np.diff(rounds[order])) + 1):
+        winner, loser = winners[results], losers[results]
+        winner_before[results], loser_before[results] = ratings[winner], ratings[loser]
+        points[results] = elo_points(ratings[winner], ratings[loser])
+        ratings[winner] += points[results]
+        ratings[loser] -= points[results]
+    return Replay(ratings, winner_before, loser_before, points)
@@ -0,0 +1,131 @@
+"""
+Self-play simulation of the AI players, without a database.
+
+Each game is played the way the server plays it: the AI is rebuilt from its
+exported state before every move. Games are sharded across processes and the
+report (guess distribution, per-move latency, throughput) is JSON-serializable
+so it can be stored and compared between solver changes.
+"""
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend.core.ai import get_ai_player
+from backend.core.game_engine import CLASSIC, MasterMindGame, Variant
+
+DEFAULT_MAX_GUESSES = 50
+SHARDS_PER_WORKER = 4
+
+
+def play_game(
+    difficulty: str,
+    secret: str,
+    free_guess: bool = False,
+    max_guesses: int = DEFAULT_MAX_GUESSES,
+    variant: Variant = CLASSIC,
+) -> tuple[int, bool, list[float]]:
+    """Play one game and return (AI guesses made, solved, per-move latencies in seconds)."""
+    game = MasterMindGame(player_secret=secret, variant=variant)
+    if free_guess:
+        game.apply_free_guess()
+
+    state = None
+    latencies = []
+    for guesses in range(1, max_guesses + 1):
+        started = time.perf_counter()
+        ai_player = get_ai_player(difficulty, game, state)
+        guess = ai_player.get_next_guess()
+        state = ai_player.export_state()
+        latencies.append(time.perf_counter() - started)
+
+        _, _, is_winner = game.make_guess(guess)
+        if is_winner:
+            return guesses, True, latencies
+    return max_guesses, False, latencies
+
+
+def _play_shard(
+    difficulty: str, secrets: list[str], free_guess: bool, max_guesses: int, seed: int | None, variant: Variant
+) -> list[tuple[int, bool, list[float]]]:
+    if seed is not None:
+        random.seed(seed)
+    return [play_game(difficulty, secret, free_guess, max_guesses, variant) for secret in secrets]
+
+
+def simulate(
+    difficulty: str,
+    num_games: int | None = None,
+    workers: int | None = None,
+    free_guess: bool = False,
+    max_guesses: int = DEFAULT_MAX_GUESSES,
+    seed: int | None = None,
+    variant: Variant = CLASSIC,
+) -> dict:
+    """
+    Play one game per secret of the variant's code space, or `num_games`
+    sampled secrets, and return a summary report.
+    """
+    workers = workers or os.cpu_count() or 1
+    table = MasterMindGame(variant=variant).feedback_table
+    rng = random.Random(seed)
+    codes = list(range(table.size)) if num_games is None else rng.sample(range(table.size), num_games)
+    secrets = [table.decode(code) for code in codes]
+
+    num_shards = max(1, min(len(secrets), workers * SHARDS_PER_WORKER))
+    shards = [secrets[index::num_shards] for index in range(num_shards)]
+    shard_seeds = [None if seed is None else seed + index for index in range(len(shards))]
+
+    started = time.perf_counter()
+    if workers == 1:
+        shard_results = [
+            _play_shard(difficulty, shard, free_guess, max_guesses, shard_seed, variant)
+            for shard, shard_seed in zip(shards, shard_seeds)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_results = list(
+                executor.map(
+                    _play_shard,
+                    [difficulty] * len(shards),
+                    shards,
+                    [free_guess] * len(shards),
+                    [max_guesses] * len(shards),
+                    shard_seeds,
+                    [variant] * len(shards),
+                )
+            )
+    elapsed = time.perf_counter() - started
+
+    results = [result for shard in shard_results for result in shard]
+    solved_guesses = np.array([guesses for guesses, solved, _ in results if solved])
+    latencies_ms = np.array([latency for _, _, latencies in results for latency in latencies]) * 1000
+
+    return {
+        "difficulty": difficulty,
+        "code_length": variant.num_digits,
+        "num_symbols": variant.num_symbols,
+        "games": len(results),
+        "solved": len(solved_guesses),
+        "unsolved": len(results) - len(solved_guesses),
+        "free_guess": free_guess,
+        "max_guesses": max_guesses,
+        "workers": workers,
+        "guesses": {
+            "mean": float(solved_guesses.mean()) if len(solved_guesses) else None,
+            "max": int(solved_guesses.max()) if len(solved_guesses) else None,
+            "distribution": {str(k): v for k, v in sorted(Counter(solved_guesses.tolist()).items())},
+        },
+        "move_latency_ms": {
+            "mean": float(latencies_ms.mean()),
+            "p50": float(np.percentile(latencies_ms, 50)),
+            "p95": float(np.percentile(latencies_ms, 95)),
+            "p99": float(np.percentile(latencies_ms, 99)),
+            "max": float(latencies_ms.max()),
+        },
+        "games_per_second": len(results) / elapsed if elapsed > 0 else None,
+        "wall_seconds": elapsed,
+    }
@@ -0,0 +1,154 @@
+"""
+Indexable skip list: a sorted collection with O(log n) expected insert, remove,
+rank and lookup by position.
+
+Every link stores its width, the number of level-0 steps it skips, so walking
+down from the top level counts the elements passed on the way to a key.
+from_sorted() links already sorted keys in one O(n) pass.
+"""
+import random
+from typing import Any, Iterable, Iterator
+
+MAX_LEVEL = 32
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, level: int):
+        self.key = key
+        self.next: list[_Node | None] = [None] * level
+        self.width = [1] * level
+
+
+class IndexableSkipList:
+    """Sorted unique keys; `keys` must be comparable with each other."""
+
+    def __init__(self, keys=(), seed: int | None = None):
+        self._random = random.Random(seed)
+        self._head = _Node(None, MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        for key in keys:
+            self.insert(key)
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable, seed: int | None = None) -> "IndexableSkipList":
+        """A list of `keys`, which must be sorted and unique, built without searching for each key."""
+        skiplist = cls(seed=seed)
+        random_level = skiplist._random_level
+        # The last node linked on each level, and its position
+        last = [skiplist._head] * MAX_LEVEL
+        positions = [-1] * MAX_LEVEL
+        top = 1
+        index = -1
+        for index, key in enumerate(keys):
+            if index and not last[0].key < key:
+                raise ValueError(f"{key!r} does not follow {last[0].key!r}")
+            level = random_level()
+            if level > top:
+                top = level
+            node = _Node(key, level)
+            for i in range(level):
+                previous = last[i]
+                previous.next[i] = node
+                previous.width[i] = index - positions[i]
+                last[i] = node
+                positions[i] = index
+        skiplist._level = top
+        skiplist._size = index + 1
+        for i in range(MAX_LEVEL):
+            last[i].width[i] = skiplist._size - positions[i]
+        return skiplist
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator:
+        return self.slice(0, self._size)
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def _path(self, key: Any) -> tuple[list[_Node], list[int]]:
+        """The last node before `key` on each level, and the position of each such node (head = -1)."""
+        path = [self._head] * MAX_LEVEL
+        positions = [-1] * MAX_LEVEL
+        node, position = self._head, -1
+        for level in reversed(range(self._level)):
+            while (following := node.next[level]) is not None and following.key < key:
+                position += node.width[level]
+                node = following
+            path[level], positions[level] = node, position
+        return path, positions
+
+    def insert(self, key: Any) -> None:
+        path, positions = self._path(key)
+        following = path[0].next[0]
+        if following is not None and following.key == key:
+            raise ValueError(f"{key!r} is already in the list")
+
+        level = self._random_level()
+        self._level = max(self._level, level)
+        node = _Node(key, level)
+        index = positions[0] + 1
+        for i in range(level):
+            previous = path[i]
+            node.next[i] = previous.next[i]
+            node.width[i] = previous.width[i] - (index - positions[i]) + 1
+            previous.next[i] = node
+            previous.width[i] = index - positions[i]
+        for i in range(level, self._level):
+            path[i].width[i] += 1
+        self._size += 1
+
+    def remove(self, key: Any) -> None:
+        path, _ = self._path(key)
+        node = path[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for i in range(self._level):
+            previous = path[i]
+            if previous.next[i] is node:
+                previous.next[i] = node.next[i]
+                previous.width[i] += node.width[i] - 1
+            else:
+                previous.width[i] -= 1
+        self._size -= 1
+
+    def rank(self, key: Any) -> int:
+        """Number of keys smaller than `key`, whether or not `key` is in the list."""
+        _, positions = self._path(key)
+        return positions[0] + 1
+
+    def __contains__(self, key: Any) -> bool:
+        following = self._path(key)[0][0].next[0]
+        return following is not None and following.key == key
+
+    def _node_at(self, index: int) -> _Node:
+        node, position = self._head, -1
+        for level in reversed(range(self._level)):
+            while node.next[level] is not None and position + node.width[level] <= index:
+                position += node.width[level]
+                node = node.next[level]  # type: ignore
+        return node
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("skip list index out of range")
+        return self._node_at(index).key
+
+    def slice(self, start: int, stop: int) -> Iterator:
+        """Keys at positions start to stop - 1, in order."""
+        start, stop = max(start, 0), min(stop, self._size)
+        if start >= stop:
+            return
+        node: _Node | None = self._node_at(start)
+        for _ in range(stop - start):
+            yield node.key  # type: ignore
+            node = node.next[0]  # type: ignore
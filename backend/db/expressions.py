@@ -0,0 +1,31 @@
+"""
+Dialect-specific SQL constructs.
+
+JsonArrayAppend(column, value) appends one element to a JSON array column
+in place. On PostgreSQL it is a jsonb concatenation, and on SQLite (tests)
+json_insert at '$[#]'.
+"""
+from sqlalchemy import JSON, bindparam
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class JsonArrayAppend(FunctionElement):
+    type = JSON()
+    inherit_cache = True
+    name = "json_array_append"
+
+    def __init__(self, column, value):
+        super().__init__(column, bindparam(None, value, type_=JSON()))
+
+
+@compiles(JsonArrayAppend)
+def _compile_jsonb_append(element, compiler, **kw):
+    column, value = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"CAST(CAST({column} AS JSONB) || jsonb_build_array(CAST({value} AS JSONB)) AS JSON)"
+
+
+@compiles(JsonArrayAppend, "sqlite")
+def _compile_sqlite_append(element, compiler, **kw):
+    column, value = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"json_insert({column}, '$[#]', json({value}))"
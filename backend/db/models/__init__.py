@@ -1,4 +1,7 @@
-from backend.db.models.game import Game, PvPGame, SingleGame
+from backend.db.models.game import ArchivedPvPGame, Game, PvPGame, SingleGame
+from backend.db.models.guess import Guess
+from backend.db.models.rating_history import RatingHistory
 from backend.db.models.user import User
+from backend.db.models.user_stats import UserStats
 
-__all__ = ["User", "Game", "PvPGame", "SingleGame"]
+__all__ = ["User", "Game", "PvPGame", "SingleGame", "ArchivedPvPGame", "Guess", "RatingHistory", "UserStats"]
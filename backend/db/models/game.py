@@ -1,7 +1,7 @@
 import dataclasses
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import composite, relationship
 
 from backend.db.database import Base
@@ -24,19 +24,23 @@ class Game(Base):
     __tablename__ = "games"
     id = Column(Integer, primary_key=True)
     game_type = Column(String)  # 'pvp' or 'single'
+    code_length = Column(Integer, default=4, server_default="4", nullable=False)
+    num_symbols = Column(Integer, default=10, server_default="10", nullable=False)
 
-    __mapper_args__ = {"polymorphic_identity": "games", "polymorphic_on": game_type}
+    __mapper_args__ = {"polymorphic_identity": "games", "polymorphic_on": game_type, "eager_defaults": True}
 
 
 class SingleGame(Game):
     __tablename__ = "single_games"
+    # A player's game history is read newest first, keyset-paginated on (created_at, id)
+    __table_args__ = (Index("ix_single_games_player1_id_created_at", "player1_id", "created_at", "id"),)
     id = Column(Integer, ForeignKey("games.id"), primary_key=True)
-    __mapper_args__ = {"polymorphic_identity": "single"}
+    __mapper_args__ = {"polymorphic_identity": "single", "eager_defaults": True}
 
     # --- Player 1 Columns & Composite ---
     _p_id = Column("player1_id", Integer, ForeignKey("users.id"), nullable=False)
     _p_name = Column("player1_name", String, nullable=True)
-    _p_secret = Column("player1_secret", String(4), nullable=True)
+    _p_secret = Column("player1_secret", String(6), nullable=True)
     _p_guesses = Column("player1_guesses", JSON, default=list, nullable=False)
     _p_elo = Column("player1_elo", Integer, nullable=False)
     # This creates the nested structure: game.player.secret
@@ -58,13 +62,20 @@ class SingleGame(Game):
 
 class PvPGame(Game):
     __tablename__ = "pvp_games"
+    # The reaper looks up stale games by status and age; game history by player and (created_at, id)
+    __table_args__ = (
+        Index("ix_pvp_games_status_last_move_at", "status", "last_move_at"),
+        Index("ix_pvp_games_status_completed_at", "status", "completed_at"),
+        Index("ix_pvp_games_player1_id_created_at", "player1_id", "created_at", "id"),
+        Index("ix_pvp_games_player2_id_created_at", "player2_id", "created_at", "id"),
+    )
     id = Column(Integer, ForeignKey("games.id"), primary_key=True)
-    __mapper_args__ = {"polymorphic_identity": "pvp"}
+    __mapper_args__ = {"polymorphic_identity": "pvp", "eager_defaults": True}
 
     # --- Player 1 Columns & Composite ---
     _p1_id = Column("player1_id", Integer, ForeignKey("users.id"), nullable=False)
     _p1_name = Column("player1_name", String, nullable=True)
-    _p1_secret = Column("player1_secret", String(4), nullable=True)
+    _p1_secret = Column("player1_secret", String(6), nullable=True)
     _p1_guesses = Column("player1_guesses", JSON, default=list, nullable=False)
     _p1_elo = Column("player1_elo", Integer, nullable=False)
     # This creates the nested structure: game.player1.secret
@@ -73,7 +84,7 @@ class PvPGame(Game):
     # --- Player 2 Columns & Composite ---
     _p2_id = Column("player2_id", Integer, ForeignKey("users.id"), nullable=True)
     _p2_name = Column("player2_name", String, nullable=True)
-    _p2_secret = Column("player2_secret", String(4), nullable=True)
+    _p2_secret = Column("player2_secret", String(6), nullable=True)
     _p2_guesses = Column("player2_guesses", JSON, default=list, nullable=False)
     _p2_elo = Column("player2_elo", Integer, nullable=True)
     # This creates the nested structure: game.player2.secret
@@ -82,15 +93,51 @@ class PvPGame(Game):
     # --- Other Fields ---
     game_mode = Column(String, nullable=False)
     ai_difficulty = Column(String, nullable=True)
+    ai_state = Column(JSON, nullable=True)
+    # Set on a waiting game closed because its player was matched into this other game
+    matched_game_id = Column(Integer, nullable=True)
     current_turn = Column(Integer, default=1, nullable=False)
     starter_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     winner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     status = Column(String, default="waiting", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     started_at = Column(DateTime, nullable=True)
+    last_move_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
 
     # --- Relationships ---
     player1_user = relationship("User", foreign_keys=[_p1_id])
     player2_user = relationship("User", foreign_keys=[_p2_id])
     winner = relationship("User", foreign_keys=[winner_id])
+
+
+class ArchivedPvPGame(Base):
+    """A finished PvP or AI game moved out of pvp_games by the reaper; a flat copy with no foreign keys."""
+
+    __tablename__ = "pvp_games_archive"
+    __table_args__ = (
+        Index("ix_pvp_games_archive_player1_id_created_at", "player1_id", "created_at", "id"),
+        Index("ix_pvp_games_archive_player2_id_created_at", "player2_id", "created_at", "id"),
+    )
+    id = Column(Integer, primary_key=True)
+    code_length = Column(Integer, nullable=False)
+    num_symbols = Column(Integer, nullable=False)
+    game_mode = Column(String, nullable=False)
+    ai_difficulty = Column(String, nullable=True)
+    player1_id = Column(Integer, nullable=False)
+    player1_name = Column(String, nullable=True)
+    player1_secret = Column(String(6), nullable=True)
+    player1_guesses = Column(JSON, nullable=False)
+    player1_elo = Column(Integer, nullable=False)
+    player2_id = Column(Integer, nullable=True)
+    player2_name = Column(String, nullable=True)
+    player2_secret = Column(String(6), nullable=True)
+    player2_guesses = Column(JSON, nullable=False)
+    player2_elo = Column(Integer, nullable=True)
+    starter_id = Column(Integer, nullable=True)
+    winner_id = Column(Integer, nullable=True)
+    status = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
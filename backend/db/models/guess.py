@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, SmallInteger
+
+from backend.db.database import Base
+
+
+class Guess(Base):
+    """
+    One guess of one player, append-only. `code` is the guess as an integer in
+    base num_symbols of its game, `feedback` is exact * (code_length + 1) + wrong_pos.
+    """
+
+    __tablename__ = "guesses"
+    __table_args__ = (Index("ix_guesses_player_id", "player_id"),)
+
+    game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    player_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # 1-based position in the player's guesses, free guess included
+    turn = Column(SmallInteger, primary_key=True)
+    code = Column(Integer, nullable=False)
+    feedback = Column(SmallInteger, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+
+from backend.db.database import Base
+
+
+class RatingHistory(Base):
+    """
+    Append-only log of rating changes: one row per player of each rated game and,
+    after a recompute, one row per user whose rating changed.
+    """
+
+    __tablename__ = "rating_history"
+    __table_args__ = (Index("ix_rating_history_user_id_id", "user_id", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # No foreign key: finished games are moved to the archive
+    game_id = Column(Integer, nullable=True)
+    reason = Column(String, nullable=False)  # 'game' or 'recompute'
+    rating_before = Column(Float, nullable=False)
+    rating_after = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+
+from backend.db.database import Base
+
+# Upper bounds, in seconds, of the solve-time histogram buckets; the last bucket is open-ended
+SOLVE_TIME_BUCKETS = (30, 60, 120, 300, 600)
+
+
+class UserStats(Base):
+    """
+    Per-player rollup of finished games, one row per kind of game: 'single', 'pvp',
+    or 'ai_<difficulty>'. Rows are incremented as games finish, so reading a
+    player's stats never touches the games tables.
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    kind = Column(String, primary_key=True)
+    games = Column(Integer, default=0, nullable=False)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    # Games the player finished by cracking the code, with their guesses and time
+    solved = Column(Integer, default=0, nullable=False)
+    solve_guesses = Column(Integer, default=0, nullable=False)
+    solve_seconds = Column(Float, default=0.0, nullable=False)
+    solved_within_30s = Column(Integer, default=0, nullable=False)
+    solved_within_60s = Column(Integer, default=0, nullable=False)
+    solved_within_120s = Column(Integer, default=0, nullable=False)
+    solved_within_300s = Column(Integer, default=0, nullable=False)
+    solved_within_600s = Column(Integer, default=0, nullable=False)
+    solved_over_600s = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,61 @@
+"""
+Connection pool with checkout metrics.
+
+InstrumentedQueuePool is the default async queue pool, timing how long each
+checkout waits for a connection so pool pressure shows up before requests start
+timing out.
+"""
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        return self._replace_metrics(super().recreate())  # type: ignore
+
+    def _replace_metrics(self, pool: "InstrumentedQueuePool") -> "InstrumentedQueuePool":
+        # Keep counting across engine.dispose(), which swaps in a fresh pool
+        pool._checkouts, pool._timeouts = self._checkouts, self._timeouts
+        pool._total_wait, pool._max_wait = self._total_wait, self._max_wait
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._metrics_lock:
+                self._timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._metrics_lock:
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        return connection
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            return {
+                "size": self.size(),
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(0, self.overflow()),
+                "max_overflow": self._max_overflow,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "wait_ms_total": self._total_wait * 1000,
+                "wait_ms_mean": self._total_wait * 1000 / self._checkouts if self._checkouts else 0.0,
+                "wait_ms_max": self._max_wait * 1000,
+            }
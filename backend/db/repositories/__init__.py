@@ -1,5 +1,8 @@
 from backend.db.repositories.base import BaseRepository
 from backend.db.repositories.game_repository import PvPGameRepository, SingleGameRepository
+from backend.db.repositories.guess_repository import GuessRepository
+from backend.db.repositories.rating_history_repository import RatingHistoryRepository
 from backend.db.repositories.user_repository import UserRepository
+from backend.db.repositories.user_stats_repository import UserStatsRepository
 
-__all__ = ["BaseRepository", "SingleGameRepository", "PvPGameRepository", "UserRepository"]
+__all__ = ["BaseRepository", "SingleGameRepository", "PvPGameRepository", "UserRepository", "GuessRepository", "RatingHistoryRepository", "UserStatsRepository"]
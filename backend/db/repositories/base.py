@@ -1,7 +1,9 @@
 from typing import Generic, List, Optional, Type, TypeVar
 
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm.attributes import set_committed_value
 
 from backend.db.database import Base
 
@@ -16,8 +18,8 @@ class BaseRepository(Generic[ModelType]):
     async def create(self, **kwargs) -> ModelType:
         instance = self.model(**kwargs)
         self.session.add(instance)
+        # The INSERT returns the primary key and eager defaults; everything else is already in memory
         await self.session.flush()
-        await self.session.refresh(instance)
         return instance
 
     async def get(self, id: int) -> Optional[ModelType]:
@@ -38,9 +40,22 @@ class BaseRepository(Generic[ModelType]):
             for key, value in kwargs.items():
                 setattr(instance, key, value)
             await self.session.flush()
-            await self.session.refresh(instance)
         return instance
 
+    @staticmethod
+    def _set_committed(instance: ModelType, **values) -> None:
+        """Apply values already written by a Core UPDATE to `instance` without flushing them again."""
+        state = inspect(instance)
+        for key, value in values.items():
+            composite = state.mapper.composites.get(key)
+            if composite is None:
+                set_committed_value(instance, key, value)
+                continue
+            for prop, column_value in zip(composite.props, value.__composite_values__()):
+                set_committed_value(instance, prop.key, column_value)
+            # Drop the cached composite so it is rebuilt from the new column values
+            state.dict.pop(key, None)
+
     async def delete(self, id: int) -> bool:
         instance = await self.get(id)
         if instance:
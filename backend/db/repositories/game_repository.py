@@ -1,58 +1,238 @@
-import asyncio
 import dataclasses
 from datetime import datetime
-from typing import List
-
+from typing import List, Literal
+
+from sqlalchemy import (
+    Integer,
+    String,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    null,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectin_polymorphic
+from sqlalchemy.orm import with_polymorphic
 
-from backend.db.database import AsyncSessionLocal
-from backend.db.models.game import Game, PlayerState, PvPGame, SingleGame
+from backend.core.game_engine import CLASSIC, Variant
+from backend.db.expressions import JsonArrayAppend
+from backend.db.models.game import ArchivedPvPGame, Game, PlayerState, PvPGame, SingleGame
 from backend.db.models.user import User
 from backend.db.repositories.base import BaseRepository
 
+CONCURRENT_UPDATE_MESSAGE = "Game was updated by another request, reload it and try again"
+
+# games LEFT OUTER JOIN single_games LEFT OUTER JOIN pvp_games, so a game of any
+# subtype loads in one SELECT
+GAME_SUBTYPES = with_polymorphic(Game, [SingleGame, PvPGame])
+
+
+def unarchived(archived: ArchivedPvPGame) -> PvPGame:
+    """A transient, read-only PvPGame holding an archived game."""
+    players = [
+        PlayerState(
+            id=getattr(archived, f"{slot}_id"),
+            name=getattr(archived, f"{slot}_name"),
+            secret=getattr(archived, f"{slot}_secret"),
+            guesses=getattr(archived, f"{slot}_guesses"),
+            elo=getattr(archived, f"{slot}_elo"),
+        )
+        for slot in ("player1", "player2")
+    ]
+    return PvPGame(
+        id=archived.id,
+        code_length=archived.code_length,
+        num_symbols=archived.num_symbols,
+        game_mode=archived.game_mode,
+        ai_difficulty=archived.ai_difficulty,
+        player1=players[0],
+        player2=players[1],
+        starter_id=archived.starter_id,
+        winner_id=archived.winner_id,
+        status=archived.status,
+        created_at=archived.created_at,
+        started_at=archived.started_at,
+        completed_at=archived.completed_at,
+    )
+
 
 class GameRepository(BaseRepository[Game]):
     def __init__(self, session: AsyncSession):
         super().__init__(Game, session)
 
     async def find_by_id(self, game_id: int) -> Game:
+        result = await self.session.execute(select(GAME_SUBTYPES).where(GAME_SUBTYPES.id == game_id))
+        game = result.scalar_one_or_none()
+        if game is not None and game.game_mode is None:
+            # Archived: the games row outlives its pvp_games row (see archive_finished)
+            self.session.expunge(game)
+            archived = await self.session.get(ArchivedPvPGame, game_id)
+            return unarchived(archived) if archived is not None else None  # type: ignore
+        return game
+
+    async def history(self, user_id: int, before: tuple[datetime, int] | None = None, limit: int = 20) -> list:
+        """
+        Summaries of `user_id`'s games, archived ones included, newest first by
+        (created_at, id), starting after the `before` key. Each source is read
+        through its (player id, created_at, id) index, LIMIT rows at most, and
+        the sources are merged; no guesses are read.
+        """
+        games = Game.__table__
+        sources = []
+        for table, player, opponent in (
+            (SingleGame.__table__, "player1", None),
+            (PvPGame.__table__, "player1", "player2"),
+            (PvPGame.__table__, "player2", "player1"),
+            (ArchivedPvPGame.__table__, "player1", "player2"),
+            (ArchivedPvPGame.__table__, "player2", "player1"),
+        ):
+            if table is SingleGame.__table__:
+                # Typed NULLs, so PostgreSQL can match the columns of the UNION
+                game_mode, ai_difficulty = literal("single"), cast(null(), String)
+            else:
+                game_mode, ai_difficulty = table.c.game_mode, table.c.ai_difficulty
+            if table is ArchivedPvPGame.__table__:
+                code_length, num_symbols, source = table.c.code_length, table.c.num_symbols, table
+            else:
+                code_length, num_symbols = games.c.code_length, games.c.num_symbols
+                source = table.join(games, games.c.id == table.c.id)
+            condition = table.c[f"{player}_id"] == user_id
+            if before is not None:
+                condition &= tuple_(table.c.created_at, table.c.id) < tuple_(*before)
+            query = (
+                select(
+                    table.c.id,
+                    game_mode.label("game_mode"),
+                    code_length.label("code_length"),
+                    num_symbols.label("num_symbols"),
+                    table.c.status,
+                    table.c.winner_id,
+                    (table.c[f"{opponent}_id"] if opponent else cast(null(), Integer)).label("opponent_id"),
+                    (table.c[f"{opponent}_name"] if opponent else cast(null(), String)).label("opponent_name"),
+                    ai_difficulty.label("ai_difficulty"),
+                    table.c.created_at,
+                    table.c.completed_at,
+                )
+                .select_from(source)
+                .where(condition)
+                .order_by(table.c.created_at.desc(), table.c.id.desc())
+                .limit(limit)
+                .subquery()
+            )
+            sources.append(select(query))
+
+        merged = union_all(*sources).subquery()
         result = await self.session.execute(
-            select(Game)
-            .where(Game.id == game_id)  #
-            .options(selectin_polymorphic(Game, [SingleGame, PvPGame]))
+            select(merged).order_by(merged.c.created_at.desc(), merged.c.id.desc()).limit(limit)
         )
-        return result.scalar_one_or_none()
+        return list(result.all())
+
+    async def finished_games(self, first_user_id: int, last_user_id: int) -> list:
+        """
+        Every decided game, archived ones included, in which a user with an id from
+        first_user_id to last_user_id played, with the winner's number of guesses.
+        """
+        single = SingleGame.__table__
+        sources = [
+            select(
+                literal("single").label("game_mode"),
+                cast(null(), String).label("ai_difficulty"),
+                single.c.status,
+                single.c.player1_id,
+                cast(null(), Integer).label("player2_id"),
+                single.c.winner_id,
+                func.json_array_length(single.c.player1_guesses).label("winner_guesses"),
+                single.c.started_at,
+                single.c.completed_at,
+            ).where(single.c.player1_id.between(first_user_id, last_user_id) & single.c.winner_id.is_not(None))
+        ]
+        for table in (PvPGame.__table__, ArchivedPvPGame.__table__):
+            winner_guesses = case(
+                (table.c.winner_id == table.c.player1_id, func.json_array_length(table.c.player1_guesses)),
+                else_=func.json_array_length(table.c.player2_guesses),
+            )
+            sources.append(
+                select(
+                    table.c.game_mode,
+                    table.c.ai_difficulty,
+                    table.c.status,
+                    table.c.player1_id,
+                    table.c.player2_id,
+                    table.c.winner_id,
+                    winner_guesses.label("winner_guesses"),
+                    table.c.started_at,
+                    table.c.completed_at,
+                ).where(
+                    (
+                        table.c.player1_id.between(first_user_id, last_user_id)
+                        | table.c.player2_id.between(first_user_id, last_user_id)
+                    )
+                    & table.c.status.in_(("completed", "abandoned"))
+                    & table.c.winner_id.is_not(None)
+                )
+            )
+        result = await self.session.execute(union_all(*sources))
+        return list(result.all())
+
+    async def write_back(self, game: Game, persisted: dict[str, int], guesses: dict[str, list], **values) -> bool:
+        """
+        Store the full guess list of each player slot of `game` in one UPDATE, guarded
+        by the number of guesses `persisted` for each slot; False if the row moved on.
+        """
+        table = type(game).__table__
+        columns = {slot: table.c["player1_guesses" if slot == "player" else f"{slot}_guesses"] for slot in guesses}
+        condition = (table.c.id == game.id) & (table.c.status == "in_progress")
+        for slot, column in columns.items():
+            condition &= func.json_array_length(column) == persisted[slot]
+
+        result = await self.session.execute(
+            update(table).where(condition).values({**{column.key: guesses[slot] for slot, column in columns.items()}, **values})
+        )
+        return result.rowcount == 1
 
 
 class SingleGameRepository(BaseRepository[SingleGame]):
     def __init__(self, session: AsyncSession):
         super().__init__(SingleGame, session)
 
-    async def create(self, player: PlayerState) -> SingleGame:  # type: ignore
+    async def create(self, player: PlayerState, variant: Variant = CLASSIC) -> SingleGame:  # type: ignore
         return await super().create(
             player=player,
+            code_length=variant.num_digits,
+            num_symbols=variant.num_symbols,
             game_mode="single",
             status="in_progress",
             started_at=datetime.utcnow(),
             starter_id=player.id,
         )
 
-    async def make_guess(
-        self,
-        game: SingleGame,
-        player: PlayerState,
-        opponent: PlayerState,
-        winner_id: int | None = None,
-    ) -> SingleGame:
-        game.player = player
+    async def append_guess(self, game: SingleGame, guess: dict, winner_id: int | None = None) -> SingleGame:
+        """Append a guess in one UPDATE guarded by the number of guesses already made."""
+        table = SingleGame.__table__
+        guesses = list(game.player.guesses or [])
+        values = {}
         if winner_id is not None:
-            game.winner_id = winner_id  # type: ignore
-            game.status = "completed"  # type: ignore
-            game.completed_at = datetime.utcnow()  # type: ignore
-        await self.session.flush()
-        await self.session.refresh(game)
+            values = dict(winner_id=winner_id, status="completed", completed_at=datetime.utcnow())
+
+        result = await self.session.execute(
+            update(table)
+            .where(
+                (table.c.id == game.id)
+                & (table.c.status == "in_progress")
+                & (func.json_array_length(table.c.player1_guesses) == len(guesses))
+            )
+            .values(player1_guesses=JsonArrayAppend(table.c.player1_guesses, guess), **values)
+        )
+        if result.rowcount == 0:
+            raise ValueError(CONCURRENT_UPDATE_MESSAGE)
+        self._set_committed(game, player=dataclasses.replace(game.player, guesses=guesses + [guess]), **values)
         return game
 
 
@@ -60,70 +240,81 @@ class PvPGameRepository(BaseRepository[PvPGame]):
     def __init__(self, session: AsyncSession):
         super().__init__(PvPGame, session)
 
-    async def create(self, player1: PlayerState, player2: PlayerState) -> PvPGame:  # type: ignore
+    async def create(self, player1: PlayerState, player2: PlayerState, variant: Variant = CLASSIC) -> PvPGame:  # type: ignore
         return await super().create(
             player1=player1,
             player2=player2,
+            code_length=variant.num_digits,
+            num_symbols=variant.num_symbols,
             status="waiting",
             game_mode="pvp",
         )
 
-    async def join_game(self, game: PvPGame, player1: PlayerState, player2: PlayerState, current_turn: int) -> PvPGame:
-        game.player1 = player1
-        game.player2 = player2
-        game.status = "in_progress"  # type: ignore
-        game.started_at = datetime.utcnow()  # type: ignore
-        game.current_turn = current_turn  # type: ignore
-        game.starter_id = current_turn  # type: ignore
-
-        await self.session.flush()
-        await self.session.refresh(game)
+    async def join_game(
+        self, game: PvPGame, player1: PlayerState, player2: PlayerState, current_turn: int
+    ) -> PvPGame | None:
+        """Start a waiting game with one conditional UPDATE; None if it is no longer waiting."""
+        now = datetime.utcnow()
+        values = dict(
+            player1=player1,
+            player2=player2,
+            status="in_progress",
+            started_at=now,
+            last_move_at=now,
+            current_turn=current_turn,
+            starter_id=current_turn,
+        )
+        result = await self.session.execute(
+            update(PvPGame)
+            .where((PvPGame.__table__.c.id == game.id) & (PvPGame.status == "waiting"))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return None
+        self._set_committed(game, **values)
         return game
 
     async def create_ai_game(
-        self, player1: PlayerState, player2: PlayerState, ai_difficulty: str, current_turn: int
+        self,
+        player1: PlayerState,
+        player2: PlayerState,
+        ai_difficulty: str,
+        current_turn: int,
+        variant: Variant = CLASSIC,
     ) -> PvPGame:  # type: ignore
+        now = datetime.utcnow()
         return await super().create(
             player1=player1,
             player2=player2,
+            code_length=variant.num_digits,
+            num_symbols=variant.num_symbols,
             status="in_progress",
             game_mode="ai",
             ai_difficulty=ai_difficulty,
-            started_at=datetime.utcnow(),
+            started_at=now,
+            last_move_at=now,
             current_turn=current_turn,  # type: ignore
             starter_id=current_turn,  # type: ignore
         )
 
-    async def get_waiting_game(self) -> PvPGame | None:
-        """Atomically get a waiting game and mark it as 'joining' to prevent race conditions."""
+    async def get_waiting_games(self) -> list[PvPGame]:
+        result = await self.session.execute(select(PvPGame).where(PvPGame.status == "waiting"))
+        return list(result.scalars().all())
+
+    async def close_matched(self, game_id: int, matched_game_id: int) -> str | None:
+        """
+        Close a waiting game whose player joins `matched_game_id` instead; returns the
+        secret its opponent was to crack, or None if the game is no longer waiting.
+        """
+        table = PvPGame.__table__
         result = await self.session.execute(
-            select(PvPGame).where(PvPGame.status == "waiting").limit(1).with_for_update(skip_locked=True)
+            update(table)
+            .where((table.c.id == game_id) & (table.c.status == "waiting"))
+            .values(status="abandoned", completed_at=datetime.utcnow(), matched_game_id=matched_game_id)
+            .returning(table.c.player2_secret)
         )
-        game = result.scalar_one_or_none()
-
-        if game:
-            game.status = "joining"
-            await self.session.flush()
-            await self.session.refresh(game)
-            asyncio.create_task(self._revert_joining_status(game.id))
-
-        return game
-
-    async def _revert_joining_status(self, game_id: int) -> None:
-        await asyncio.sleep(1.0)
-
-        async with AsyncSessionLocal() as session:
-            try:
-                game = await session.get(PvPGame, game_id)
-                if game and game.status == "joining":
-                    game.status = "waiting"
-                    await session.commit()
-            except Exception as e:
-                await session.rollback()
-                # Log error but don't raise - background task should fail silently
-                print(f"Error reverting joining status for game {game_id}: {e}")
-            finally:
-                await session.close()
+        return result.scalar_one_or_none()
 
     async def get_active_pvp_games(self, user_id: int) -> list[PvPGame]:
         result = await self.session.execute(
@@ -133,40 +324,53 @@ class PvPGameRepository(BaseRepository[PvPGame]):
         )
         return list(result.scalars().all())
 
-    async def make_guess(
+    async def append_guess(
         self,
         game: PvPGame,
-        player1: PlayerState,
-        player2: PlayerState,
+        slot: Literal["player1", "player2"],
+        guess: dict,
         winner_id: int | None = None,
+        ai_state: dict | None = None,
+        expected_turn: int | None = None,
     ) -> PvPGame:
+        """
+        Append a guess to `slot`, pass the turn or finish the game in one UPDATE.
+        The UPDATE only applies while the game is in progress, the player has the
+        number of guesses that was read and, if given, it is `expected_turn`'s move,
+        so a concurrent double submit fails instead of taking a row lock.
+        """
+        table = PvPGame.__table__
+        column = table.c[f"{slot}_guesses"]
+        player = getattr(game, slot)
+        guesses = list(player.guesses or [])
+
+        values: dict = {"last_move_at": datetime.utcnow()}
+        if ai_state is not None:
+            values["ai_state"] = ai_state
         if winner_id is not None:
-            await self._finish_game(game, winner_id=winner_id, status="completed")
-            if game.game_mode != "ai":
-                await self._update_elo(player1, player2, winner_id)
+            values.update(winner_id=winner_id, status="completed", completed_at=datetime.utcnow())
         else:
-            game.current_turn = player2.id if game.current_turn == player1.id else player1.id
+            values["current_turn"] = game.player2.id if game.current_turn == game.player1.id else game.player1.id
 
-        game.player1 = player1
-        game.player2 = player2
-
-        await self.session.flush()
-        await self.session.refresh(game)
+        condition = (
+            (table.c.id == game.id)
+            & (table.c.status == "in_progress")
+            & (func.json_array_length(column) == len(guesses))
+        )
+        if expected_turn is not None:
+            condition &= table.c.current_turn == expected_turn
+        result = await self.session.execute(
+            update(table).where(condition).values({column.key: JsonArrayAppend(column, guess), **values})
+        )
+        if result.rowcount == 0:
+            raise ValueError(CONCURRENT_UPDATE_MESSAGE)
+        self._set_committed(game, **{slot: dataclasses.replace(player, guesses=guesses + [guess])}, **values)
         return game
 
     async def abandon_game(self, game: PvPGame, abandoner: User) -> PvPGame:
         winner_id = game.player2.id if game.player1.id == abandoner.id else game.player1.id
         await self._finish_game(game, winner_id=winner_id, status="abandoned")
-        player1 = PlayerState(**dataclasses.asdict(game.player1))
-        player2 = PlayerState(**dataclasses.asdict(game.player2))
-        if game.game_mode != "ai":
-            await self._update_elo(player1, player2, winner_id)
-
-        game.player1 = player1
-        game.player2 = player2
-
         await self.session.flush()
-        await self.session.refresh(game)
         return game
 
     async def _finish_game(self, game: PvPGame, winner_id: int, status: str) -> None:
@@ -175,24 +379,126 @@ class PvPGameRepository(BaseRepository[PvPGame]):
         game.status = status
         game.completed_at = datetime.utcnow()
 
-    async def _update_elo(self, player1: PlayerState, player2: PlayerState, winner_id: int) -> None:
-        p1_user = await self.session.get(User, player1.id)
-        p2_user = await self.session.get(User, player2.id)
+    async def expire_waiting(self, created_before: datetime, limit: int) -> list[int]:
+        """Close up to `limit` games nobody joined since before `created_before`; returns their ids."""
+        table = PvPGame.__table__
+        stale = (table.c.status == "waiting") & (table.c.created_at < created_before)
+        ids = select(table.c.id).where(stale).order_by(table.c.id).limit(limit).scalar_subquery()
+        result = await self.session.execute(
+            update(table)
+            .where(table.c.id.in_(ids) & stale)
+            .values(status="abandoned", completed_at=datetime.utcnow())
+            .returning(table.c.id)
+        )
+        return list(result.scalars().all())
 
-        if not p1_user or not p2_user:
-            return
+    async def forfeit_idle(self, moved_before: datetime, limit: int) -> list:
+        """
+        Abandon up to `limit` in-progress games with no move since `moved_before`, the
+        player to move losing. Returns (id, game_mode, ai_difficulty, player1_id,
+        player2_id, winner_id) rows; a game another worker already closed is not
+        returned.
+        """
+        table = PvPGame.__table__
+        stale = (table.c.status == "in_progress") & (table.c.last_move_at < moved_before)
+        ids = select(table.c.id).where(stale).order_by(table.c.id).limit(limit).scalar_subquery()
+        winner_id = case((table.c.current_turn == table.c.player1_id, table.c.player2_id), else_=table.c.player1_id)
+        result = await self.session.execute(
+            update(table)
+            .where(table.c.id.in_(ids) & stale)
+            .values(status="abandoned", winner_id=winner_id, completed_at=datetime.utcnow())
+            .returning(
+                table.c.id, table.c.game_mode, table.c.ai_difficulty, table.c.player1_id, table.c.player2_id, table.c.winner_id
+            )
+        )
+        return list(result.all())
+
+    async def abandon_all(self, user_id: int) -> list:
+        """
+        Abandon every in-progress game of `user_id` in one UPDATE, the opponent
+        winning. Returns rows like forfeit_idle().
+        """
+        table = PvPGame.__table__
+        active = (table.c.status == "in_progress") & ((table.c.player1_id == user_id) | (table.c.player2_id == user_id))
+        winner_id = case((table.c.player1_id == user_id, table.c.player2_id), else_=table.c.player1_id)
+        result = await self.session.execute(
+            update(table)
+            .where(active)
+            .values(status="abandoned", winner_id=winner_id, completed_at=datetime.utcnow())
+            .returning(
+                table.c.id, table.c.game_mode, table.c.ai_difficulty, table.c.player1_id, table.c.player2_id, table.c.winner_id
+            )
+        )
+        return list(result.all())
 
-        winner, loser = (p1_user, p2_user) if winner_id == p1_user.id else (p2_user, p1_user)
+    async def get_many(self, game_ids: list[int]) -> list[PvPGame]:
+        """Load games in one SELECT, replacing any stale copy in the session."""
+        if not game_ids:
+            return []
+        result = await self.session.execute(
+            select(PvPGame).where(PvPGame.id.in_(game_ids)).order_by(PvPGame.id).execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
 
-        K = 32
-        expected_winner = 1 / (1 + 10 ** ((loser.elo_rating - winner.elo_rating) / 400))
-        points = int(K * (1 - expected_winner))
+    async def add_to_player_elos(self, deltas: list[tuple[int, int, int]]) -> None:
+        """Add (game_id, player1_delta, player2_delta) to the ratings stored in each game, in one executemany UPDATE."""
+        if not deltas:
+            return
+        table = PvPGame.__table__
+        await self.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("game_id"))
+            .values(
+                player1_elo=table.c.player1_elo + bindparam("player1_delta"),
+                player2_elo=table.c.player2_elo + bindparam("player2_delta"),
+            ),
+            [{"game_id": game_id, "player1_delta": d1, "player2_delta": d2} for game_id, d1, d2 in deltas],
+        )
 
-        winner.elo_rating += points
-        loser.elo_rating -= points
-        if winner_id == player1.id:
-            player1.elo += points
-            player2.elo -= points
-        else:
-            player2.elo += points
-            player1.elo -= points
+    async def rated_results(self) -> list[tuple[int, int, int]]:
+        """(game_id, winner_id, loser_id) of every decided PvP game, archived ones included, in the order they finished."""
+        results = []
+        for table in (PvPGame.__table__, ArchivedPvPGame.__table__):
+            loser_id = case((table.c.winner_id == table.c.player1_id, table.c.player2_id), else_=table.c.player1_id)
+            result = await self.session.execute(
+                select(table.c.completed_at, table.c.id, table.c.winner_id, loser_id).where(
+                    (table.c.game_mode == "pvp")
+                    & table.c.status.in_(("completed", "abandoned"))
+                    & table.c.winner_id.is_not(None)
+                    & table.c.player2_id.is_not(None)
+                )
+            )
+            results += result.all()
+        results.sort(key=lambda row: (row[0], row[1]))
+        return [(game_id, winner_id, loser_id) for _, game_id, winner_id, loser_id in results]
+
+    async def archive_finished(self, completed_before: datetime, limit: int) -> int:
+        """
+        Move up to `limit` games finished before `completed_before` to pvp_games_archive,
+        deleting their pvp_games rows; returns the number archived. The games rows stay:
+        the games' guesses reference them and would be deleted with them.
+        """
+        table, games = PvPGame.__table__, Game.__table__
+        result = await self.session.execute(
+            select(table.c.id)
+            .where(table.c.status.in_(("completed", "abandoned")) & (table.c.completed_at < completed_before))
+            .order_by(table.c.id)
+            .limit(limit)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            return 0
+
+        # Only the worker whose DELETE removes a row archives it
+        archived_columns = set(ArchivedPvPGame.__table__.c.keys())
+        deleted = await self.session.execute(delete(table).where(table.c.id.in_(ids)).returning(*table.c))
+        rows = {row.id: {key: value for key, value in row._mapping.items() if key in archived_columns} for row in deleted}
+        if not rows:
+            return 0
+        variants = await self.session.execute(
+            select(games.c.id, games.c.code_length, games.c.num_symbols).where(games.c.id.in_(rows))
+        )
+        for game_id, code_length, num_symbols in variants.all():
+            rows[game_id].update(code_length=code_length, num_symbols=num_symbols)
+        await self.session.execute(insert(ArchivedPvPGame), list(rows.values()))
+        return len(rows)
@@ -0,0 +1,81 @@
+from typing import AsyncIterator, Iterable, Iterator
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.game_engine import GuessRecord, Variant
+from backend.db.models.guess import Guess
+
+INSERT_BATCH_SIZE = 1000
+
+
+def guess_rows(game_id: int, player_id: int, variant: Variant, guesses: list[dict], first_turn: int = 1) -> list[dict]:
+    """Integer-encoded `guesses` rows for a player's JSON guesses, numbered from `first_turn`."""
+    return [
+        {
+            "game_id": game_id,
+            "player_id": player_id,
+            "turn": turn,
+            "code": variant.encode(guess["guess"]),
+            "feedback": variant.pack_feedback(guess["exact"], guess["wrong_pos"]),
+        }
+        for turn, guess in enumerate(guesses, start=first_turn)
+    ]
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class GuessRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, game_id: int, player_id: int, variant: Variant, guesses: list[dict], first_turn: int = 1) -> None:
+        rows = guess_rows(game_id, player_id, variant, guesses, first_turn)
+        if rows:
+            await self.session.execute(insert(Guess), rows)
+
+    async def insert_many(
+        self, rows: Iterable[dict], batch_size: int = INSERT_BATCH_SIZE, skip_existing: bool = False
+    ) -> int:
+        """Insert rows from any iterable in executemany batches; returns the number of rows sent."""
+        statement = self._insert(skip_existing)
+        sent = 0
+        for batch in _batches(rows, batch_size):
+            await self.session.execute(statement, batch)
+            sent += len(batch)
+        return sent
+
+    async def stream(self, game_id: int, player_id: int | None = None) -> AsyncIterator[Guess]:
+        query = select(Guess).where(Guess.game_id == game_id)
+        if player_id is not None:
+            query = query.where(Guess.player_id == player_id)
+        result = await self.session.stream_scalars(query.order_by(Guess.player_id, Guess.turn))
+        async for guess in result:
+            yield guess
+
+    async def history(self, game_id: int, player_id: int, variant: Variant) -> list[GuessRecord]:
+        history = []
+        async for guess in self.stream(game_id, player_id):
+            exact, wrong_pos = variant.unpack_feedback(guess.feedback)
+            history.append(GuessRecord(variant.decode(guess.code), exact, wrong_pos))
+        return history
+
+    def _insert(self, skip_existing: bool):
+        if not skip_existing:
+            return insert(Guess)
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(Guess).on_conflict_do_nothing()
+        if dialect == "sqlite":
+            return sqlite.insert(Guess).on_conflict_do_nothing()
+        raise ValueError(f"Skipping existing guesses is not supported on {dialect}")
@@ -0,0 +1,22 @@
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.models.rating_history import RatingHistory
+
+
+class RatingHistoryRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_many(self, rows: list[dict]) -> None:
+        if rows:
+            await self.session.execute(insert(RatingHistory), rows)
+
+    async def for_user(self, user_id: int, limit: int = 100) -> list[RatingHistory]:
+        result = await self.session.execute(
+            select(RatingHistory)
+            .where(RatingHistory.user_id == user_id)
+            .order_by(RatingHistory.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
@@ -1,10 +1,15 @@
-from typing import Optional
+from typing import Iterable, Optional
 
+from sqlalchemy import Float, Integer, bindparam, column, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from backend.db.models.user import User
 from backend.db.repositories.base import BaseRepository
+from backend.db.user_cache import user_cache
+
+# Rows per VALUES list, well under the 32767 bind parameters of a PostgreSQL statement
+RATINGS_BATCH_SIZE = 5000
 
 
 class UserRepository(BaseRepository[User]):
@@ -22,3 +27,53 @@ class UserRepository(BaseRepository[User]):
             select(User).where(User.id == user_id)
         )
         return result.scalar_one_or_none()
+
+    async def get_cached(self, user_id: int) -> Optional[User]:
+        """Like get(), but served from the user cache when possible."""
+        return await user_cache.get_or_load(self.session, user_id, self.get)
+
+    async def update(self, id: int, **kwargs) -> Optional[User]:
+        user = await super().update(id, **kwargs)
+        await user_cache.invalidate_on_commit(self.session, id)
+        return user
+
+    async def get_ratings(self, user_ids: Iterable[int] | None = None) -> dict[int, float]:
+        """Current ratings of `user_ids`, or of every user."""
+        query = select(User.id, User.elo_rating)
+        if user_ids is not None:
+            query = query.where(User.id.in_(list(user_ids)))
+        result = await self.session.execute(query)
+        return dict(result.all())  # type: ignore
+
+    async def add_to_ratings(self, deltas: dict[int, float]) -> None:
+        """Add rating deltas to the stored ratings in one statement."""
+        await self._update_ratings({user_id: delta for user_id, delta in deltas.items() if delta}, relative=True)
+
+    async def set_ratings(self, ratings: dict[int, float]) -> None:
+        await self._update_ratings(ratings, relative=False)
+
+    async def _update_ratings(self, ratings: dict[int, float], relative: bool) -> None:
+        if not ratings:
+            return
+        if self.session.bind.dialect.name == "postgresql":
+            rows = list(ratings.items())
+            for start in range(0, len(rows), RATINGS_BATCH_SIZE):
+                await self.session.execute(ratings_update(rows[start : start + RATINGS_BATCH_SIZE], relative))
+        else:
+            # SQLite cannot name the columns of a VALUES list: one executemany UPDATE instead
+            table = User.__table__
+            rating = table.c.elo_rating + bindparam("rating") if relative else bindparam("rating")
+            await self.session.execute(
+                update(table).where(table.c.id == bindparam("user_id")).values(elo_rating=rating),
+                [{"user_id": user_id, "rating": value} for user_id, value in ratings.items()],
+            )
+        for user_id in ratings:
+            await user_cache.invalidate_on_commit(self.session, user_id)
+
+
+def ratings_update(rows: list[tuple[int, float]], relative: bool):
+    """UPDATE users ... FROM (VALUES (id, rating), ...) setting or adding to each user's rating."""
+    table = User.__table__
+    new = values(column("user_id", Integer), column("rating", Float), name="new_ratings").data(rows)
+    rating = table.c.elo_rating + new.c.rating if relative else new.c.rating
+    return update(table).where(table.c.id == new.c.user_id).values(elo_rating=rating)
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.models.user_stats import UserStats
+
+# Every column added up by an increment
+COUNTERS = tuple(key for key in UserStats.__table__.c.keys() if key not in ("user_id", "kind", "updated_at"))
+
+
+class UserStatsRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_many(self, rows: list[dict]) -> None:
+        """
+        Add counters to the (user_id, kind) rows, creating missing ones, with one
+        executemany INSERT ... ON CONFLICT DO UPDATE. Rows are sorted by key so
+        concurrent writers lock them in the same order.
+        """
+        if not rows:
+            return
+        table = UserStats.__table__
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "kind"],
+            set_={
+                **{key: table.c[key] + statement.excluded[key] for key in COUNTERS},
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        now = datetime.utcnow()
+        await self.session.execute(
+            statement,
+            [
+                {**dict.fromkeys(COUNTERS, 0), **row, "updated_at": now}
+                for row in sorted(rows, key=lambda row: (row["user_id"], row["kind"]))
+            ],
+        )
+
+    async def replace_users(self, first_id: int, last_id: int, rows: list[dict]) -> None:
+        """Replace the rows of users first_id to last_id with `rows`."""
+        table = UserStats.__table__
+        await self.session.execute(delete(table).where(table.c.user_id.between(first_id, last_id)))
+        if rows:
+            now = datetime.utcnow()
+            await self.session.execute(
+                insert(table), [{**dict.fromkeys(COUNTERS, 0), **row, "updated_at": now} for row in rows]
+            )
+
+    async def for_user(self, user_id: int) -> list[UserStats]:
+        result = await self.session.execute(
+            select(UserStats).where(UserStats.user_id == user_id).order_by(UserStats.kind)
+        )
+        return list(result.scalars().all())
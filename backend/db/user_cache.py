@@ -0,0 +1,144 @@
+"""
+Cache of user rows keyed by user id.
+
+Authenticated requests look the user up here before going to the database.
+Entries are plain column dicts so any store can hold them: InMemoryUserCacheBackend
+is a per-process TTL/LRU map, and another UserCacheBackend (e.g. Redis) can be
+installed with set_backend(). Writers invalidate the entry both when the row
+changes and after the transaction commits. A per-id generation counter stops a
+read that started before an invalidation from re-caching the old row. Across
+workers, the TTL bounds how stale an entry can get.
+"""
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from backend.db.database import after_commit
+from backend.db.models.user import User
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+USER_COLUMNS = ("id", "email", "display_name", "is_guest", "elo_rating", "created_at")
+
+
+class UserCacheBackend(ABC):
+    @abstractmethod
+    async def get(self, user_id: int) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def set(self, user_id: int, data: dict) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, user_id: int) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+
+class InMemoryUserCacheBackend(UserCacheBackend):
+    def __init__(self, max_size: int = USER_CACHE_MAX_SIZE, ttl: float = USER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, user_id: int) -> Optional[dict]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return data
+
+    async def set(self, user_id: int, data: dict) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl, data)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class UserCache:
+    def __init__(self, backend: UserCacheBackend | None = None):
+        self.backend = backend or InMemoryUserCacheBackend()
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get_or_load(
+        self, session: AsyncSession, user_id: int, load: Callable[[int], Awaitable[Optional[User]]]
+    ) -> Optional[User]:
+        """The user attached to `session`, from the cache or else from `load`."""
+        data = await self.backend.get(user_id)
+        if data is not None:
+            self.hits += 1
+            user = User(**data)
+            make_transient_to_detached(user)
+            return await session.merge(user, load=False)
+
+        self.misses += 1
+        generation = self._generations.get(user_id, 0)
+        user = await load(user_id)
+        if user is not None and self._generations.get(user_id, 0) == generation:
+            await self.backend.set(user_id, {column: getattr(user, column) for column in USER_COLUMNS})
+        return user
+
+    async def invalidate(self, user_id: int) -> None:
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        self.invalidations += 1
+        await self.backend.delete(user_id)
+
+    async def invalidate_on_commit(self, session: AsyncSession, user_id: int) -> None:
+        """Drop the entry now and again once the session commits."""
+        await self.invalidate(user_id)
+
+        async def invalidate() -> None:
+            await self.invalidate(user_id)
+
+        after_commit(session, f"user_cache:{user_id}", invalidate)
+
+    async def clear(self) -> None:
+        self._generations.clear()
+        await self.backend.clear()
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "size": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+user_cache = UserCache()
+
+
+def set_backend(backend: UserCacheBackend) -> None:
+    user_cache.backend = backend
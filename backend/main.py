@@ -1,15 +1,39 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
-from backend.api.routes import auth, games
+from backend.api.routes import auth, games, leaderboard, metrics, users
+from backend.api.websocket import games as games_ws
+from backend.core.ai.opening_book import get_opening_book
+from backend.services.ai_executor import ai_executor
+from backend.services.game_reaper import game_reaper
+from backend.services.game_state_cache import game_state_cache
+from backend.services.leaderboard import leaderboard as leaderboard_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the hard AI's opening book once, before the first hard game asks for it
+    get_opening_book()
+    game_state_cache.start()
+    game_reaper.start()
+    leaderboard_index.start()
+    yield
+    await leaderboard_index.stop()
+    await game_reaper.stop()
+    # Write every cached game back before the worker exits
+    await game_state_cache.stop()
+    ai_executor.shutdown()
+
 
 app = FastAPI(
     title="Mastermind API",
     description="Full-stack Mastermind game with AI opponents and multiplayer",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -26,6 +50,10 @@ app.add_middleware(
 # Include routers
 app.include_router(games.router)
 app.include_router(auth.router)
+app.include_router(leaderboard.router)
+app.include_router(users.router)
+app.include_router(metrics.router)
+app.include_router(games_ws.router)
 
 
 @app.get("/api/health")
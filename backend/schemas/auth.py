@@ -4,7 +4,7 @@ Authentication Pydantic schemas for request/response validation.
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class GuestUserCreate(BaseModel):
@@ -24,6 +24,12 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @field_validator("elo_rating", mode="before")
+    @classmethod
+    def round_rating(cls, value: float) -> int:
+        """Ratings are stored unrounded."""
+        return round(value)
+
 
 class TokenResponse(BaseModel):
     """Authentication token response."""
@@ -1,30 +1,38 @@
+import base64
 from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from backend.db.models.game import Game, PlayerState
+
 
 class GameCreate(BaseModel):
     game_mode: str = Field(default="single", pattern="^(single|ai|pvp)$")
     # For PVP or AI
-    player_secret: Optional[str] = Field(None, min_length=4, max_length=4, pattern="^[0-9]{4}$")
+    player_secret: Optional[str] = Field(None, min_length=4, max_length=6, pattern="^[0-9AB]{4,6}$")
     # For AI
     ai_difficulty: Optional[str] = Field(None, pattern="^(easy|medium|hard)$")
+    # Code variant; codes use the first num_symbols of 0-9, A, B
+    code_length: int = Field(default=4, ge=4, le=6)
+    num_symbols: int = Field(default=10, ge=6, le=12)
 
 
 class GameGuess(BaseModel):
-    guess: str = Field(..., min_length=4, max_length=4, pattern="^[0-9]{4}$")
+    guess: str = Field(..., min_length=4, max_length=6, pattern="^[0-9AB]{4,6}$")
 
 
 class GuessRecord(BaseModel):
-    guess: str = Field(..., min_length=4, max_length=4, pattern="^[0-9]{4}$")
-    exact: int = Field(..., ge=0, le=4)
-    wrong_pos: int = Field(..., ge=0, le=4)
+    guess: str = Field(..., min_length=4, max_length=6, pattern="^[0-9AB]{4,6}$")
+    exact: int = Field(..., ge=0, le=6)
+    wrong_pos: int = Field(..., ge=0, le=6)
 
 
 class GameResponse(BaseModel):
     id: int
     game_mode: str
+    code_length: int = 4
+    num_symbols: int = 10
 
     self_id: int
     self_name: str
@@ -49,3 +57,80 @@ class GameResponse(BaseModel):
 
     # AI Specific
     ai_difficulty: Optional[str]
+
+
+class GameSummary(BaseModel):
+    """A game in the player's history, without guesses or secrets."""
+    id: int
+    game_mode: str
+    code_length: int
+    num_symbols: int
+    status: str
+    winner_id: Optional[int]
+    opponent_id: Optional[int]
+    opponent_name: Optional[str]
+    ai_difficulty: Optional[str]
+    created_at: datetime
+    completed_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GameHistoryPage(BaseModel):
+    games: List[GameSummary]
+    # Pass as `before` to get the next page; None on the last page
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, game_id: int) -> str:
+    """Opaque keyset cursor of a game in the history."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{game_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, game_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(game_id)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def game_response_from_game(game: Game, user_id: int) -> GameResponse:
+    """The game as seen by `user_id`; secrets are only revealed once the game is over."""
+    if game.game_mode == "single":
+        self_player = game.player
+        opponent_player = PlayerState(id=None, name=None, secret=None, guesses=None, elo=None)
+    elif game.game_mode == "ai":
+        self_player = game.player1
+        opponent_player = game.player2
+    else:
+        self_player = game.player1 if game.player1.id == user_id else game.player2
+        opponent_player = game.player2 if game.player1.id == user_id else game.player1
+
+    self_secret = self_player.secret if game.status in ("completed", "abandoned") else None
+    return GameResponse(
+        id=game.id,
+        game_mode=game.game_mode,
+        code_length=game.code_length,
+        num_symbols=game.num_symbols,
+        self_id=self_player.id,
+        self_name=self_player.name,
+        self_secret=self_secret,  # type: ignore
+        self_guesses=self_player.guesses,
+        self_elo=self_player.elo,
+        winner_id=game.winner_id,
+        created_at=game.created_at,
+        completed_at=game.completed_at,
+        status=game.status,
+        started_at=game.started_at,
+        starter_id=game.starter_id,
+        # PvP Specific
+        opponent_id=opponent_player.id,
+        opponent_name=opponent_player.name,
+        opponent_secret=opponent_player.secret,
+        opponent_guesses=opponent_player.guesses,
+        opponent_elo=opponent_player.elo,
+        current_turn=getattr(game, "current_turn", None),
+        # AI Specific
+        ai_difficulty=getattr(game, "ai_difficulty", None),
+    )
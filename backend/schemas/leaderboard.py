@@ -0,0 +1,30 @@
+"""
+Leaderboard Pydantic schemas.
+"""
+from pydantic import BaseModel, field_validator
+
+
+class LeaderboardEntry(BaseModel):
+    """A ranked player; players with the same rating share a rank."""
+    rank: int
+    user_id: int
+    display_name: str
+    elo_rating: int
+
+    @field_validator("elo_rating", mode="before")
+    @classmethod
+    def round_rating(cls, value: float) -> int:
+        """Ratings are stored unrounded."""
+        return round(value)
+
+
+class LeaderboardResponse(BaseModel):
+    """A page of the leaderboard."""
+    total: int
+    offset: int
+    entries: list[LeaderboardEntry]
+
+
+class RankResponse(LeaderboardEntry):
+    """A player's rank out of `total` ranked players."""
+    total: int
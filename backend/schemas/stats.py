@@ -0,0 +1,29 @@
+"""
+Player statistics Pydantic schemas.
+"""
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class KindStats(BaseModel):
+    """Stats of one kind of game: 'single', 'pvp' or 'ai_<difficulty>'."""
+    kind: str
+    games: int
+    wins: int
+    losses: int
+    win_rate: float
+    solved: int
+    average_guesses: Optional[float]
+    average_solve_seconds: Optional[float]
+    # Games solved within each time bucket, e.g. {"30s": 2, "60s": 5, ..., "over_600s": 1}
+    solve_times: dict[str, int]
+
+
+class UserStatsResponse(BaseModel):
+    user_id: int
+    games: int
+    wins: int
+    losses: int
+    win_rate: float
+    kinds: list[KindStats]
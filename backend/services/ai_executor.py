@@ -0,0 +1,108 @@
+"""
+Runs AI move computation off the event loop.
+
+Moves are computed in a process pool (or a thread pool) so that a long solver
+search never blocks other requests on the same worker. The number of moves in
+flight is bounded: when the queue is full callers get AIExecutorBusyError right
+away instead of piling up behind AI games. AI_EXECUTOR_MAX_PENDING <= 0 lifts
+the bound.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from backend.core.ai import get_ai_player
+from backend.core.ai.opening_book import get_opening_book
+from backend.core.game_engine import CLASSIC, GuessRecord, MasterMindGame, Variant
+
+AI_EXECUTOR_MODE = os.getenv("AI_EXECUTOR_MODE", "process")
+AI_EXECUTOR_WORKERS = int(os.getenv("AI_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+AI_EXECUTOR_MAX_PENDING = int(os.getenv("AI_EXECUTOR_MAX_PENDING", str(AI_EXECUTOR_WORKERS * 4)))
+AI_MOVE_TIMEOUT = float(os.getenv("AI_MOVE_TIMEOUT", "5.0"))
+
+
+class AIExecutorBusyError(Exception):
+    pass
+
+
+class AIMoveTimeoutError(Exception):
+    pass
+
+
+def compute_ai_move(
+    difficulty: str, secret: str, guesses: list[dict], state: dict | None, variant: Variant = CLASSIC
+) -> tuple[str, dict | None]:
+    """Compute the AI's next guess and its solver state after playing it."""
+    history = [GuessRecord(**guess) for guess in guesses]
+    mastermind = MasterMindGame(player_secret=secret, history=history, variant=variant)
+    ai_player = get_ai_player(difficulty, mastermind, state)
+    ai_guess = ai_player.get_next_guess()
+    mastermind.make_guess(ai_guess)
+    return ai_guess, ai_player.export_state()
+
+
+def _warm_up() -> None:
+    get_opening_book()
+
+
+class AIExecutor:
+    def __init__(
+        self,
+        mode: str = AI_EXECUTOR_MODE,
+        max_workers: int = AI_EXECUTOR_WORKERS,
+        max_pending: int = AI_EXECUTOR_MAX_PENDING,
+        timeout: float = AI_MOVE_TIMEOUT,
+    ):
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Unknown AI executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        # Released when the underlying work finishes, not when the caller stops waiting,
+        # so timed-out moves still count against the queue depth
+        self._slots = threading.BoundedSemaphore(max_pending) if max_pending > 0 else None
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_warm_up)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ai-move")
+        return self._executor
+
+    async def compute_move(
+        self,
+        difficulty: str,
+        secret: str,
+        guesses: list[dict],
+        state: dict | None = None,
+        variant: Variant = CLASSIC,
+    ) -> tuple[str, dict | None]:
+        slots = self._slots
+        if slots is not None and not slots.acquire(blocking=False):
+            raise AIExecutorBusyError("Too many AI moves in progress, try again shortly")
+
+        try:
+            future = self._get_executor().submit(compute_ai_move, difficulty, secret, list(guesses), state, variant)
+        except Exception:
+            if slots is not None:
+                slots.release()
+            raise
+        if slots is not None:
+            future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise AIMoveTimeoutError(f"AI move took longer than {self.timeout}s")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+ai_executor = AIExecutor()
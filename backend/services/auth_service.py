@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.core.jwt_handler import create_access_token, verify_token
 from backend.db.models.user import User
 from backend.db.repositories.user_repository import UserRepository
+from backend.services.leaderboard import leaderboard
 
 
 class AuthService:
@@ -21,9 +22,8 @@ class AuthService:
             is_guest=True,
             elo_rating=1200
         )
-        await self.session.flush()
-        await self.session.refresh(user)
 
+        leaderboard.set_on_commit(self.session, {user.id: user.elo_rating}, {user.id: user.display_name})  # type: ignore
         token = create_access_token(user.id)
         return user, token
 
@@ -32,5 +32,5 @@ class AuthService:
         if user_id is None:
             return None
 
-        user = await self.repo.get(user_id)
+        user = await self.repo.get_cached(user_id)
         return user
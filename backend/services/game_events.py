@@ -0,0 +1,93 @@
+"""
+Push channel for game-state updates.
+
+When a request changes a game, the new state of the game as seen by each player
+is published after the transaction commits. WebSocket connections subscribe to
+a game through a broker. InMemoryBroker fans messages out within one process;
+for several workers, install a broker backed by a shared pub/sub (e.g. Redis)
+with set_broker().
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.database import after_commit
+from backend.db.models.game import Game
+from backend.schemas.game import game_response_from_game
+
+# Updates buffered per subscriber; a slow client drops the oldest ones first
+SUBSCRIBER_QUEUE_SIZE = 16
+
+
+class GameEventBroker(ABC):
+    @abstractmethod
+    async def publish(self, game_id: int, message: dict) -> None:
+        pass
+
+    @abstractmethod
+    def subscribe(self, game_id: int) -> AbstractAsyncContextManager[asyncio.Queue]:
+        """Async context manager yielding a queue of the game's messages."""
+        pass
+
+
+class InMemoryBroker(GameEventBroker):
+    def __init__(self):
+        self._subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+
+    async def publish(self, game_id: int, message: dict) -> None:
+        for queue in list(self._subscribers.get(game_id, ())):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(self, game_id: int):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[game_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[game_id].discard(queue)
+            if not self._subscribers[game_id]:
+                del self._subscribers[game_id]
+
+
+_broker: GameEventBroker = InMemoryBroker()
+
+
+def get_broker() -> GameEventBroker:
+    return _broker
+
+
+def set_broker(broker: GameEventBroker) -> None:
+    global _broker
+    _broker = broker
+
+
+def game_update_message(game: Game) -> dict:
+    """Serialized GameResponse of the game for each of its players, keyed by user id."""
+    player_ids = [game.player1.id, game.player2.id]  # type: ignore
+    return {
+        "game_id": game.id,
+        "views": {
+            str(player_id): game_response_from_game(game, player_id).model_dump(mode="json")
+            for player_id in player_ids
+            if player_id is not None
+        },
+    }
+
+
+def publish_on_commit(session: AsyncSession, game: Game) -> None:
+    """Push the game's state to its subscribers once the session commits."""
+
+    async def publish() -> None:
+        try:
+            await get_broker().publish(game.id, game_update_message(game))  # type: ignore
+        except Exception as e:
+            # The move is already committed; clients can still fetch the game
+            print(f"Error publishing update for game {game.id}: {e}")
+
+    after_commit(session, f"game:{game.id}", publish)
@@ -0,0 +1,179 @@
+"""
+Scheduled maintenance of the pvp_games table.
+
+Every REAPER_INTERVAL seconds the reaper pairs waiting players whose Elo
+windows have widened enough to accept each other (see matchmaking.py), one
+transaction per pair, then does three sweeps, each as set-based statements in
+batches of REAPER_BATCH_SIZE games, one short transaction per batch:
+
+- waiting games nobody joined within REAPER_WAITING_TIMEOUT are closed;
+- in-progress games with no move for REAPER_IDLE_TIMEOUT are abandoned, the
+  player to move losing; the PvP ones are rated and every one is added to
+  the players' stats, in one batch each;
+- games finished more than REAPER_ARCHIVE_AFTER ago are moved to
+  pvp_games_archive (0 keeps them in place).
+
+Every statement re-checks the status it sweeps, so several workers can run the
+reaper side by side without closing, rating or archiving a game twice.
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+from backend.db.database import AsyncSessionLocal, run_after_commit
+from backend.db.repositories.game_repository import PvPGameRepository
+from backend.services.game_service import GameService
+from backend.services.game_state_cache import game_state_cache
+from backend.services.matchmaking import matchmaking_queue
+from backend.services.rating_service import RatingService
+from backend.services.stats_service import StatsService
+
+REAPER_ENABLED = os.getenv("REAPER_ENABLED", "true").lower() == "true"
+REAPER_INTERVAL = float(os.getenv("REAPER_INTERVAL", "15"))
+REAPER_BATCH_SIZE = int(os.getenv("REAPER_BATCH_SIZE", "500"))
+REAPER_WAITING_TIMEOUT = float(os.getenv("REAPER_WAITING_TIMEOUT", "900"))
+REAPER_IDLE_TIMEOUT = float(os.getenv("REAPER_IDLE_TIMEOUT", "1800"))
+REAPER_ARCHIVE_AFTER = float(os.getenv("REAPER_ARCHIVE_AFTER", str(7 * 24 * 3600)))
+
+
+class GameReaper:
+    def __init__(
+        self,
+        enabled: bool = REAPER_ENABLED,
+        interval: float = REAPER_INTERVAL,
+        batch_size: int = REAPER_BATCH_SIZE,
+        waiting_timeout: float = REAPER_WAITING_TIMEOUT,
+        idle_timeout: float = REAPER_IDLE_TIMEOUT,
+        archive_after: float = REAPER_ARCHIVE_AFTER,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.enabled = enabled
+        self.interval = interval
+        self.batch_size = batch_size
+        self.waiting_timeout = waiting_timeout
+        self.idle_timeout = idle_timeout
+        self.archive_after = archive_after
+        self.session_factory = session_factory
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.errors = 0
+        self.matched = 0
+        self.expired = 0
+        self.forfeited = 0
+        self.rated = 0
+        self.archived = 0
+        self.last_run_at: datetime | None = None
+        self.last_duration: float | None = None
+
+    async def sweep(self, now: datetime | None = None) -> dict:
+        """Match waiting players and run the three sweeps once; returns the number of games each step touched."""
+        now = now or datetime.utcnow()
+        started = time.perf_counter()
+
+        matched = await self._match_waiting()
+
+        expired = await self._in_batches(
+            lambda repo: repo.expire_waiting(now - timedelta(seconds=self.waiting_timeout), self.batch_size)
+        )
+        matchmaking_queue.discard(expired)
+
+        async def forfeit(repo: PvPGameRepository) -> list:
+            forfeits = await repo.forfeit_idle(now - timedelta(seconds=self.idle_timeout), self.batch_size)
+            self.rated += await RatingService(repo.session).rate_forfeits(forfeits)
+            await StatsService(repo.session).record_abandoned(forfeits)
+            return forfeits
+
+        forfeited = await self._in_batches(forfeit)
+        game_state_cache.discard(row.id for row in forfeited)
+
+        archived = 0
+        if self.archive_after > 0:
+            completed_before = now - timedelta(seconds=self.archive_after)
+            while (count := await self._in_transaction(lambda repo: repo.archive_finished(completed_before, self.batch_size))):
+                archived += count
+                if count < self.batch_size:
+                    break
+
+        self.matched += matched
+        self.expired += len(expired)
+        self.forfeited += len(forfeited)
+        self.archived += archived
+        self.runs += 1
+        self.last_run_at = now
+        self.last_duration = time.perf_counter() - started
+        return {"matched": matched, "expired": len(expired), "forfeited": len(forfeited), "archived": archived}
+
+    async def _match_waiting(self) -> int:
+        if not matchmaking_queue.loaded:
+            async with self.session_factory() as session:
+                matchmaking_queue.load(await PvPGameRepository(session).get_waiting_games())
+        matched = 0
+        for host, guest in matchmaking_queue.pop_pairs():
+            try:
+                game = await self._in_transaction(lambda repo: GameService(repo.session).match_waiting(host, guest))
+            except ValueError:
+                # The host stopped waiting; closing the guest's game was rolled back
+                matchmaking_queue.add(guest)
+                continue
+            if game is None:
+                matchmaking_queue.add(host)
+            else:
+                matched += 1
+        return matched
+
+    async def _in_transaction(self, step):
+        async with self.session_factory() as session:
+            result = await step(PvPGameRepository(session))
+            await session.commit()
+            await run_after_commit(session)
+        return result
+
+    async def _in_batches(self, step) -> list:
+        """Repeat `step` in its own transaction until it returns a partial batch."""
+        swept: list = []
+        while True:
+            batch = await self._in_transaction(step)
+            swept += batch
+            if len(batch) < self.batch_size:
+                return swept
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.errors += 1
+                print(f"Error sweeping stale games: {e}")
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "runs": self.runs,
+            "errors": self.errors,
+            "matched": self.matched,
+            "last_run_at": self.last_run_at,
+            "last_duration": self.last_duration,
+            "expired": self.expired,
+            "forfeited": self.forfeited,
+            "rated": self.rated,
+            "archived": self.archived,
+        }
+
+
+game_reaper = GameReaper()
@@ -1,23 +1,38 @@
 import dataclasses
 import random
-from typing import Literal, Optional
+from datetime import datetime
+from typing import AsyncIterator, Literal, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.ai import get_ai_player
-from backend.core.game_engine import GuessRecord, MasterMindGame
+from backend.core.game_engine import CLASSIC, GuessRecord, MasterMindGame, Variant
 from backend.db.models.game import Game, PlayerState
 from backend.db.models.user import User
 from backend.db.repositories.game_repository import GameRepository, PvPGameRepository, SingleGameRepository
+from backend.db.repositories.guess_repository import GuessRepository
 from backend.db.repositories.user_repository import UserRepository
+from backend.services.ai_executor import ai_executor
+from backend.services.game_events import publish_on_commit
+from backend.services.game_state_cache import CachedGame, game_state_cache
+from backend.services.matchmaking import MatchTicket, matchmaking_queue
+from backend.services.rating_service import RatingService
+from backend.services.stats_service import StatsService
+
+# Games read per query when streaming a whole history
+HISTORY_STREAM_BATCH = 500
 
 
 class GameService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.single_repo = SingleGameRepository(session)
         self.game_repo = GameRepository(session)
         self.pvp_repo = PvPGameRepository(session)
         self.user_repo = UserRepository(session)
+        self.guess_repo = GuessRepository(session)
+        self.rating_service = RatingService(session)
+        self.stats_service = StatsService(session)
 
     def _create_player(self, user: User | None, secret: str) -> PlayerState:
         if user is None:
@@ -27,11 +42,19 @@ class GameService:
             name=user.display_name,  # type: ignore
             secret=secret,
             guesses=[],
-            elo=user.elo_rating,  # type: ignore
+            elo=None if user.elo_rating is None else round(user.elo_rating),  # type: ignore
         )
 
-    def _apply_free_guess(self, player: PlayerState) -> PlayerState:
-        mastermind = MasterMindGame(player_secret=player.secret)
+    async def _record_guesses(self, game: Game, player: PlayerState, guesses: list[dict], first_turn: int = 1) -> None:
+        if player.id is not None:
+            await self.guess_repo.add(game.id, player.id, self._variant_of(game), guesses, first_turn)
+
+    @staticmethod
+    def _variant_of(game: Game) -> Variant:
+        return Variant(num_digits=game.code_length, num_symbols=game.num_symbols)  # type: ignore
+
+    def _apply_free_guess(self, player: PlayerState, variant: Variant = CLASSIC) -> PlayerState:
+        mastermind = MasterMindGame(player_secret=player.secret, variant=variant)
         mastermind.apply_free_guess()
         free_guess = mastermind.history[0]
         player.guesses += [{"guess": free_guess.guess, "exact": free_guess.exact, "wrong_pos": free_guess.wrong_pos}]
@@ -43,48 +66,93 @@ class GameService:
         game_mode: Literal["single", "ai", "pvp"],
         player_secret: Optional[str] = None,
         ai_difficulty: str | None = None,
+        variant: Variant = CLASSIC,
     ) -> Game:
+        if player_secret is not None and not MasterMindGame(variant=variant).validate_guess(player_secret):
+            raise ValueError("Invalid secret format")
+
         if game_mode == "single":
-            game = await self._create_single_game(user)
+            game = await self._create_single_game(user, variant)
         elif game_mode == "pvp":
-            game = await self._create_or_join_pvp_game(user, player_secret)
+            game = await self._create_or_join_pvp_game(user, player_secret, variant)
         elif game_mode == "ai":
-            game = await self._create_ai_game(user, ai_difficulty, player_secret)
+            game = await self._create_ai_game(user, ai_difficulty, player_secret, variant)
         else:
             raise ValueError("Invalid game mode")
 
         return game
 
-    async def _create_single_game(self, user: User) -> Game:
-        game_engine = MasterMindGame()
+    async def _create_single_game(self, user: User, variant: Variant) -> Game:
+        game_engine = MasterMindGame(variant=variant)
         player = self._create_player(user, game_engine.secret)
-        return await self.single_repo.create(player)
-
-    async def _create_or_join_pvp_game(self, user: User, player_secret: str | None) -> Game:
-        game_engine = MasterMindGame(player_secret)
-        available_game = await self.pvp_repo.get_waiting_game()
-        if available_game:
-            # Join existing game - player1 gets the joining user's secret, player2 is the new player
-            player1 = PlayerState(**dataclasses.asdict(available_game.player1))
-            player1.secret = game_engine.secret
-            player2 = self._create_player(user, available_game.player2.secret)
+        return await self.single_repo.create(player, variant)
 
-            current_turn = random.choice([player1.id, player2.id])
+    async def _create_or_join_pvp_game(self, user: User, player_secret: str | None, variant: Variant) -> Game:
+        game_engine = MasterMindGame(player_secret, variant=variant)
+        if not matchmaking_queue.loaded:
+            matchmaking_queue.load(await self.pvp_repo.get_waiting_games())
 
-            if current_turn == player1.id:
-                player2 = self._apply_free_guess(player2)
-            else:
-                player1 = self._apply_free_guess(player1)
-            return await self.pvp_repo.join_game(available_game, player1, player2, current_turn)
+        while (ticket := matchmaking_queue.pop_match(user.id, user.elo_rating, variant)) is not None:  # type: ignore
+            try:
+                game = await self._join_pvp_game(ticket.game_id, user, game_engine.secret)
+            except Exception:
+                matchmaking_queue.add(ticket)
+                raise
+            if game is not None:
+                return game
 
         # Create new waiting game
         player1 = self._create_player(user, secret="")
         player2 = self._create_player(None, secret=game_engine.secret)
-        return await self.pvp_repo.create(player1, player2)
+        game = await self.pvp_repo.create(player1, player2, variant)
+        matchmaking_queue.add_on_commit(
+            self.session,
+            MatchTicket(game_id=game.id, user_id=user.id, elo=user.elo_rating, variant=variant),  # type: ignore
+        )
+        return game
+
+    async def match_waiting(self, host: MatchTicket, guest: MatchTicket) -> Game | None:
+        """
+        Move the player of the waiting game `guest` into the waiting game `host`,
+        closing their own; None if `guest` is no longer waiting. Raises ValueError if
+        `host` is no longer waiting, after which the transaction must be rolled back.
+        """
+        secret = await self.pvp_repo.close_matched(guest.game_id, host.game_id)
+        if secret is None:
+            return None
+        user = await self.user_repo.get(guest.user_id)
+        game = await self._join_pvp_game(host.game_id, user, secret)  # type: ignore
+        if game is None:
+            raise ValueError("Game is no longer waiting")
+        return game
+
+    async def _join_pvp_game(self, game_id: int, user: User, secret: str) -> Game | None:
+        available_game = await self.pvp_repo.get(game_id)
+        if available_game is None or available_game.status != "waiting":
+            return None
+
+        # Join existing game - player1 gets the joining user's secret, player2 is the new player
+        player1 = PlayerState(**dataclasses.asdict(available_game.player1))
+        player1.secret = secret
+        player2 = self._create_player(user, available_game.player2.secret)
+
+        current_turn = random.choice([player1.id, player2.id])
 
-    async def _create_ai_game(self, user: User, ai_difficulty: str, player_secret: str | None) -> Game:
-        player_game = MasterMindGame()
-        ai_game = MasterMindGame(player_secret)
+        variant = self._variant_of(available_game)
+        if current_turn == player1.id:
+            player2 = self._apply_free_guess(player2, variant)
+        else:
+            player1 = self._apply_free_guess(player1, variant)
+        game = await self.pvp_repo.join_game(available_game, player1, player2, current_turn)
+        if game is not None:
+            for player in (player1, player2):
+                await self._record_guesses(game, player, player.guesses)
+            publish_on_commit(self.session, game)
+        return game
+
+    async def _create_ai_game(self, user: User, ai_difficulty: str, player_secret: str | None, variant: Variant) -> Game:
+        player_game = MasterMindGame(variant=variant)
+        ai_game = MasterMindGame(player_secret, variant=variant)
         ai_player = get_ai_player(ai_difficulty, ai_game)
         ai_user = ai_player.user()
 
@@ -94,28 +162,69 @@ class GameService:
         current_turn = random.choice([player1.id, player2.id])
 
         if current_turn == player1.id:
-            player2 = self._apply_free_guess(player2)
+            player2 = self._apply_free_guess(player2, variant)
         else:
-            player1 = self._apply_free_guess(player1)
+            player1 = self._apply_free_guess(player1, variant)
 
-        return await self.pvp_repo.create_ai_game(player1, player2, ai_difficulty, current_turn)
+        game = await self.pvp_repo.create_ai_game(player1, player2, ai_difficulty, current_turn, variant)
+        for player in (player1, player2):
+            await self._record_guesses(game, player, player.guesses)
+        return game
 
     async def get_game(self, game_id: int, user: User) -> Game:
-        game = await self.game_repo.find_by_id(game_id)
+        entry = game_state_cache.get(game_id)
+        game = entry.game if entry is not None else await self.game_repo.find_by_id(game_id)
         if not game:
             raise ValueError("Game not found")
-        if game.game_mode == "single":
-            if game.player.id != user.id:
-                raise ValueError("Game not found")
-        if game.game_mode in ("pvp", "ai"):
-            if game.player1.id != user.id and game.player2.id != user.id:
-                raise ValueError("Game not found")
+        players = [game.player] if game.game_mode == "single" else [game.player1, game.player2]
+        if user.id not in (player.id for player in players):
+            raise ValueError("Game not found")
+        matched_game_id = getattr(game, "matched_game_id", None)
+        if matched_game_id is not None:
+            # The player waited here and was matched into another waiting game
+            return await self.get_game(matched_game_id, user)
         return game
 
+    async def game_history(self, user: User, before: tuple[datetime, int] | None = None, limit: int = 20) -> list:
+        """Summaries of the user's games, newest first, after the (created_at, id) key `before`."""
+        return await self.game_repo.history(user.id, before, limit)  # type: ignore
+
+    async def stream_game_history(self, user: User, before: tuple[datetime, int] | None = None) -> AsyncIterator:
+        """Every game summary after `before`, read in keyset pages of HISTORY_STREAM_BATCH."""
+        while True:
+            page = await self.game_repo.history(user.id, before, HISTORY_STREAM_BATCH)  # type: ignore
+            for row in page:
+                yield row
+            if len(page) < HISTORY_STREAM_BATCH:
+                return
+            before = (page[-1].created_at, page[-1].id)
+
+    def _cache(self, game: Game) -> CachedGame | None:
+        """The cache entry of an in-progress game, caching it on first use; None when caching is off."""
+        if not game_state_cache.enabled or game.status != "in_progress":
+            return None
+        entry = game_state_cache.get(game.id)  # type: ignore
+        if entry is None:
+            self.session.expunge(game)
+            entry = game_state_cache.add(game)
+        return entry
+
+    @staticmethod
+    def _next_turn(game: Game) -> int:
+        return game.player2.id if game.current_turn == game.player1.id else game.player1.id
+
     async def make_guess(self, game_id: int, guess_str: str, user: User) -> Game:
         game = await self.get_game(game_id, user)
-
-        if game.completed_at is not None:
+        entry = self._cache(game)
+        if entry is None:
+            return await self._make_guess(game, guess_str, user)
+        async with entry.lock:
+            if game_state_cache.owns(entry):
+                return await self._make_guess(entry.game, guess_str, user, entry)
+        return await self._make_guess(await self.get_game(game_id, user), guess_str, user)
+
+    async def _make_guess(self, game: Game, guess_str: str, user: User, entry: CachedGame | None = None) -> Game:
+        if game.status != "in_progress":
             raise ValueError("Game is already completed")
 
         # For PvP games, validate it's the player's turn
@@ -124,30 +233,54 @@ class GameService:
                 raise ValueError("It's not your turn")
 
         if game.game_mode == "single":
-            player = PlayerState(**dataclasses.asdict(game.player))
-            opponent = self._create_player(None, secret=None)
-            repo = self.single_repo
+            slot = "player"
         elif game.player1.id == user.id:
-            player = PlayerState(**dataclasses.asdict(game.player1))
-            opponent = PlayerState(**dataclasses.asdict(game.player2))
-            repo = self.pvp_repo
+            slot = "player1"
         else:
-            player = PlayerState(**dataclasses.asdict(game.player2))
-            opponent = PlayerState(**dataclasses.asdict(game.player1))
-            repo = self.pvp_repo
+            slot = "player2"
+        player = getattr(game, slot)
 
-        history = [GuessRecord(**guess) for guess in player.guesses or []]
-        mastermind = MasterMindGame(player_secret=player.secret, history=history)
+        if entry is not None:
+            mastermind = entry.engine(slot)
+        else:
+            history = [GuessRecord(**guess) for guess in player.guesses or []]
+            mastermind = MasterMindGame(player_secret=player.secret, history=history, variant=self._variant_of(game))
 
         if not mastermind.validate_guess(guess_str):
             raise ValueError("Invalid guess format")
 
         exact, wrong_pos, is_winner = mastermind.make_guess(guess_str)
-        player.guesses.append({"guess": guess_str, "exact": exact, "wrong_pos": wrong_pos})
+        guess = {"guess": guess_str, "exact": exact, "wrong_pos": wrong_pos}
+        if entry is not None:
+            if not is_winner:
+                values = {}
+                if game.game_mode != "single":
+                    values = {"current_turn": self._next_turn(game), "last_move_at": datetime.utcnow()}
+                entry.apply(slot, guess, **values)
+                if game.game_mode != "single":
+                    publish_on_commit(self.session, game)
+                return game
+            # Finishing a game also updates ratings: write the cached guesses back and record the win below
+            await game_state_cache.evict(game.id)  # type: ignore
+            game = await self.game_repo.find_by_id(game.id)  # type: ignore
+            player = getattr(game, slot)
+
         winner_id = player.id if is_winner else None
-        if game.game_mode != "single" and game.player2.id == user.id:
-            player, opponent = opponent, player
-        game = await repo.make_guess(game, player, opponent, winner_id)
+        turn = len(player.guesses or []) + 1
+        if game.game_mode == "single":
+            game = await self.single_repo.append_guess(game, guess, winner_id)
+            await self._record_guesses(game, player, [guess], turn)
+            if winner_id is not None:
+                await self.stats_service.record_games([game])
+            return game
+
+        expected_turn = user.id if game.game_mode == "pvp" else None
+        game = await self.pvp_repo.append_guess(game, slot, guess, winner_id, expected_turn=expected_turn)
+        await self._record_guesses(game, player, [guess], turn)
+        if winner_id is not None:
+            await self.rating_service.rate_games([game])
+            await self.stats_service.record_games([game])
+        publish_on_commit(self.session, game)
 
         return game
 
@@ -162,20 +295,50 @@ class GameService:
 
         # For AI, generate AI's next guess
         if game.game_mode == "ai":
-            history = [GuessRecord(**guess) for guess in game.player2.guesses or []]
-            mastermind = MasterMindGame(player_secret=game.player2.secret, history=history)
-            ai_player = get_ai_player(game.ai_difficulty, mastermind)
-
-            ai_guess = ai_player.get_next_guess()
-            exact, wrong_pos, is_winner = mastermind.make_guess(ai_guess)
-            ai_player_state = PlayerState(**dataclasses.asdict(game.player2))
-            ai_player_state.guesses.append({"guess": ai_guess, "exact": exact, "wrong_pos": wrong_pos})
-            winner_id = ai_player_state.id if is_winner else None
-            return await self.pvp_repo.make_guess(game, game.player1, ai_player_state, winner_id)
+            entry = self._cache(game)
+            if entry is None:
+                return await self._make_ai_guess(game)
+            async with entry.lock:
+                if game_state_cache.owns(entry):
+                    return await self._make_ai_guess(entry.game, entry)
+            return await self._make_ai_guess(await self.get_game(game_id, user))
 
         raise ValueError(f"Unknown game mode: {game.game_mode}")
 
+    async def _make_ai_guess(self, game: Game, entry: CachedGame | None = None) -> Game:
+        variant = self._variant_of(game)
+        ai_guess, ai_state = await ai_executor.compute_move(
+            game.ai_difficulty, game.player2.secret, game.player2.guesses or [], game.ai_state, variant
+        )
+
+        if entry is not None:
+            mastermind = entry.engine("player2")
+        else:
+            history = [GuessRecord(**guess) for guess in game.player2.guesses or []]
+            mastermind = MasterMindGame(player_secret=game.player2.secret, history=history, variant=variant)
+        exact, wrong_pos, is_winner = mastermind.make_guess(ai_guess)
+        guess = {"guess": ai_guess, "exact": exact, "wrong_pos": wrong_pos}
+        if entry is not None:
+            if not is_winner:
+                entry.apply(
+                    "player2", guess, ai_state=ai_state, current_turn=self._next_turn(game), last_move_at=datetime.utcnow()
+                )
+                publish_on_commit(self.session, game)
+                return game
+            await game_state_cache.evict(game.id)  # type: ignore
+            game = await self.game_repo.find_by_id(game.id)  # type: ignore
+
+        winner_id = game.player2.id if is_winner else None
+        turn = len(game.player2.guesses or []) + 1
+        game = await self.pvp_repo.append_guess(game, "player2", guess, winner_id, ai_state=ai_state)
+        await self._record_guesses(game, game.player2, [guess], turn)
+        if winner_id is not None:
+            await self.stats_service.record_games([game])
+        publish_on_commit(self.session, game)
+        return game
+
     async def abandon_game(self, game_id: int, user: User) -> Game:
+        await game_state_cache.evict(game_id)
         game = await self.get_game(game_id, user)
 
         if game.status != "in_progress":
@@ -184,13 +347,22 @@ class GameService:
             raise ValueError("Cannot abandon single player games")
 
         game = await self.pvp_repo.abandon_game(game, user)
+        await self.rating_service.rate_games([game])
+        await self.stats_service.record_games([game])
+        publish_on_commit(self.session, game)
         return game
 
-    async def abandon_all_active_games(self, user: User) -> None:
-        active_games = await self.pvp_repo.get_active_pvp_games(user.id)
-        for game in active_games:
-            try:
-                game = await self.pvp_repo.abandon_game(game, user)
-            except Exception:
-                # Continue abandoning other games even if one fails
-                pass
+    async def abandon_all_active_games(self, user: User) -> dict:
+        """
+        Abandon every game `user` is playing, e.g. on logout, with one UPDATE and
+        one rating batch whatever the number of games. Returns the abandoned game
+        ids and the number of games rated.
+        """
+        await game_state_cache.evict_player(user.id)  # type: ignore
+        rows = await self.pvp_repo.abandon_all(user.id)  # type: ignore
+        rated = await self.rating_service.rate_forfeits(rows)
+        await self.stats_service.record_abandoned(rows)
+        game_ids = sorted(row.id for row in rows)
+        for game in await self.pvp_repo.get_many(game_ids):
+            publish_on_commit(self.session, game)
+        return {"abandoned": game_ids, "rated": rated}
@@ -0,0 +1,306 @@
+"""
+In-process cache of games being played, with write-behind persistence.
+
+A move on a cached game is checked against the player's live MasterMindGame and
+applied in memory, so the request does not touch the database. A background
+task writes the new guesses back in batches: one transaction per batch, with one
+guarded UPDATE per game and one INSERT for the guesses-table rows. A game only
+counts as persisted once its transaction commits, so a failed flush is retried
+on the next tick.
+
+Moves that finish a game, abandons, idle games and shutdown all go through
+evict(). It writes the queued guesses synchronously and drops the entry, after
+which the database is the source of truth again.
+
+The backend runs as one process (see docker/entrypoint.sh), so every request
+for a game, logouts and the reaper included, goes through this cache. If the
+guarded UPDATE still finds that the row changed without it, e.g. through a
+script, the queued guesses are replayed onto the fresh row and the entry is
+dropped; guesses that cannot be replayed because the game was closed meanwhile
+are reported and counted as lost.
+"""
+import asyncio
+import dataclasses
+import os
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from backend.core.game_engine import GuessRecord, MasterMindGame, Variant
+from backend.db.database import AsyncSessionLocal
+from backend.db.models.game import Game
+from backend.db.repositories.game_repository import GameRepository
+from backend.db.repositories.guess_repository import GuessRepository, guess_rows
+
+GAME_CACHE_ENABLED = os.getenv("GAME_CACHE_ENABLED", "true").lower() == "true"
+GAME_CACHE_FLUSH_INTERVAL = float(os.getenv("GAME_CACHE_FLUSH_INTERVAL", "1.0"))
+# Games written back per transaction
+GAME_CACHE_FLUSH_BATCH = int(os.getenv("GAME_CACHE_FLUSH_BATCH", "200"))
+GAME_CACHE_IDLE_TIMEOUT = float(os.getenv("GAME_CACHE_IDLE_TIMEOUT", "300"))
+GAME_CACHE_MAX_SIZE = int(os.getenv("GAME_CACHE_MAX_SIZE", "10000"))
+
+
+def player_slots(game: Game) -> tuple[str, ...]:
+    return ("player",) if game.game_mode == "single" else ("player1", "player2")
+
+
+class CachedGame:
+    """A detached in-progress game, its players' engines and the number of guesses already persisted."""
+
+    def __init__(self, game: Game):
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.variant = Variant(num_digits=game.code_length, num_symbols=game.num_symbols)  # type: ignore
+        self.persisted = {slot: len(getattr(game, slot).guesses or []) for slot in player_slots(game)}
+        self.engines: dict[str, MasterMindGame] = {}
+        self.last_used = time.monotonic()
+
+    @property
+    def dirty(self) -> bool:
+        return any(len(getattr(self.game, slot).guesses or []) > count for slot, count in self.persisted.items())
+
+    def engine(self, slot: str) -> MasterMindGame:
+        """The MasterMindGame of `slot`, rebuilt from the guesses only when they went out of step."""
+        player = getattr(self.game, slot)
+        guesses = player.guesses or []
+        engine = self.engines.get(slot)
+        if engine is None or len(engine.history) != len(guesses):
+            history = [GuessRecord(**guess) for guess in guesses]
+            engine = self.engines[slot] = MasterMindGame(player_secret=player.secret, history=history, variant=self.variant)
+        return engine
+
+    def apply(self, slot: str, guess: dict, **values) -> None:
+        """Record a guess already made on the slot's engine, along with the other changed columns."""
+        player = getattr(self.game, slot)
+        setattr(self.game, slot, dataclasses.replace(player, guesses=[*(player.guesses or []), guess]))
+        for key, value in values.items():
+            setattr(self.game, key, value)
+        self.last_used = time.monotonic()
+
+    def snapshot(self) -> tuple[dict[str, list], dict]:
+        guesses = {slot: list(getattr(self.game, slot).guesses or []) for slot in self.persisted}
+        values = {}
+        if self.game.game_mode != "single":
+            values = {
+                "current_turn": self.game.current_turn,
+                "ai_state": self.game.ai_state,
+                "last_move_at": self.game.last_move_at,
+            }
+        return guesses, values
+
+
+class GameStateCache:
+    def __init__(
+        self,
+        enabled: bool = GAME_CACHE_ENABLED,
+        flush_interval: float = GAME_CACHE_FLUSH_INTERVAL,
+        batch_size: int = GAME_CACHE_FLUSH_BATCH,
+        idle_timeout: float = GAME_CACHE_IDLE_TIMEOUT,
+        max_size: int = GAME_CACHE_MAX_SIZE,
+    ):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.max_size = max_size
+        self.session_factory = AsyncSessionLocal
+        self._entries: OrderedDict[int, CachedGame] = OrderedDict()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.flushed_guesses = 0
+        self.conflicts = 0
+        self.replayed_guesses = 0
+        self.lost_guesses = 0
+        self.evictions = 0
+
+    def get(self, game_id: int) -> CachedGame | None:
+        entry = self._entries.get(game_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(game_id)
+        return entry
+
+    def add(self, game: Game) -> CachedGame:
+        """Cache a detached in-progress game; the flush task trims the cache back to max_size."""
+        entry = self._entries[game.id] = CachedGame(game)  # type: ignore
+        return entry
+
+    def owns(self, entry: CachedGame) -> bool:
+        """Whether `entry` is still the cached state of its game, e.g. after waiting for its lock."""
+        return self._entries.get(entry.game.id) is entry  # type: ignore
+
+    async def flush(self, game_ids: Iterable[int] | None = None) -> int:
+        """Write queued guesses back, batch_size games per transaction; returns the number of guesses written."""
+        async with self._flush_lock:
+            ids = list(self._entries) if game_ids is None else list(game_ids)
+            dirty = [entry for game_id in ids if (entry := self._entries.get(game_id)) is not None and entry.dirty]
+            written = 0
+            for start in range(0, len(dirty), self.batch_size):
+                written += await self._write_back(dirty[start : start + self.batch_size])
+            return written
+
+    async def _write_back(self, entries: list[CachedGame]) -> int:
+        snapshots = [(entry, *entry.snapshot()) for entry in entries]
+        written: list[tuple[CachedGame, dict[str, list]]] = []
+        conflicts: list[tuple[CachedGame, dict[str, list], dict]] = []
+        rows: list[dict] = []
+
+        async with self.session_factory() as session:
+            game_repo = GameRepository(session)
+            for entry, guesses, values in snapshots:
+                if not await game_repo.write_back(entry.game, entry.persisted, guesses, **values):
+                    conflicts.append((entry, guesses, values))
+                    continue
+                written.append((entry, guesses))
+                for slot, slot_guesses in guesses.items():
+                    player_id = getattr(entry.game, slot).id
+                    first_turn = entry.persisted[slot] + 1
+                    if player_id is not None:
+                        rows += guess_rows(entry.game.id, player_id, entry.variant, slot_guesses[first_turn - 1 :], first_turn)  # type: ignore
+            await GuessRepository(session).insert_many(rows)
+            await session.commit()
+
+        count = 0
+        for entry, guesses in written:
+            for slot, slot_guesses in guesses.items():
+                count += len(slot_guesses) - entry.persisted[slot]
+                entry.persisted[slot] = len(slot_guesses)
+        for entry, guesses, values in conflicts:
+            # The row moved on without this worker; its copy can no longer be written as is
+            count += await self._replay(entry, guesses, values.get("last_move_at"))
+            self._drop(entry)
+            self.conflicts += 1
+        self.flushes += 1
+        self.flushed_guesses += count
+        return count
+
+    async def _replay(self, entry: CachedGame, guesses: dict[str, list], last_move_at=None) -> int:
+        """Append the guesses queued on a conflicted entry to the current row; returns the number written."""
+        pending = {slot: slot_guesses[entry.persisted[slot] :] for slot, slot_guesses in guesses.items()}
+        async with self.session_factory() as session:
+            game = await session.get(type(entry.game), entry.game.id)
+            current = {slot: list(getattr(game, slot).guesses or []) for slot in pending} if game is not None else {}
+            for slot, slot_guesses in current.items():
+                # Already there if an earlier commit went through after all
+                if slot_guesses[entry.persisted[slot] :][: len(pending[slot])] == pending[slot]:
+                    pending[slot] = []
+            count = sum(len(slot_guesses) for slot_guesses in pending.values())
+            if count == 0:
+                return 0
+
+            if game is not None and game.status == "in_progress":
+                persisted = {slot: len(slot_guesses) for slot, slot_guesses in current.items()}
+                merged = {slot: current[slot] + pending[slot] for slot in pending}
+                values = {"last_move_at": last_move_at} if last_move_at is not None else {}
+                if await GameRepository(session).write_back(game, persisted, merged, **values):
+                    rows = []
+                    for slot, slot_guesses in pending.items():
+                        player_id = getattr(game, slot).id
+                        if player_id is not None:
+                            rows += guess_rows(game.id, player_id, entry.variant, slot_guesses, persisted[slot] + 1)  # type: ignore
+                    await GuessRepository(session).insert_many(rows)
+                    await session.commit()
+                    print(f"Replayed {count} cached guesses of game {entry.game.id} onto a row changed by another writer")
+                    self.replayed_guesses += count
+                    return count
+
+        print(f"ERROR: lost {count} acknowledged guesses of game {entry.game.id}, closed or changed by another writer: {pending}")
+        self.lost_guesses += count
+        return 0
+
+    def _drop(self, entry: CachedGame) -> None:
+        if self.owns(entry):
+            del self._entries[entry.game.id]  # type: ignore
+            self.evictions += 1
+
+    async def evict(self, game_id: int) -> None:
+        """Write the game's queued guesses back and stop caching it."""
+        await self.evict_many([game_id])
+
+    async def evict_many(self, game_ids: Iterable[int]) -> None:
+        game_ids = list(game_ids)
+        await self.flush(game_ids)
+        for game_id in game_ids:
+            entry = self._entries.get(game_id)
+            if entry is not None:
+                self._drop(entry)
+
+    async def evict_player(self, user_id: int) -> None:
+        """Evict every cached game `user_id` plays in."""
+        await self.evict_many(
+            game_id
+            for game_id, entry in list(self._entries.items())
+            if any(getattr(entry.game, slot).id == user_id for slot in entry.persisted)
+        )
+
+    def discard(self, game_ids: Iterable[int]) -> None:
+        """Stop caching games closed by another writer, without writing them back."""
+        for game_id in game_ids:
+            entry = self._entries.get(game_id)
+            if entry is not None:
+                self._drop(entry)
+
+    async def tick(self) -> None:
+        """Flush every queued guess, then drop idle games and the least recently used beyond max_size."""
+        await self.flush()
+        idle_before = time.monotonic() - self.idle_timeout
+        overflow = len(self._entries) - self.max_size
+        for entry in list(self._entries.values()):
+            if entry.dirty or entry.lock.locked():
+                continue
+            if overflow > 0 or entry.last_used <= idle_before:
+                self._drop(entry)
+                overflow -= 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.tick()
+            except Exception as e:
+                # Entries stay dirty and are written on a later tick
+                print(f"Error flushing cached games: {e}")
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write every cached game back."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.evict_many(list(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._flush_lock = asyncio.Lock()
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "dirty": sum(entry.dirty for entry in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "flushes": self.flushes,
+            "flushed_guesses": self.flushed_guesses,
+            "conflicts": self.conflicts,
+            "replayed_guesses": self.replayed_guesses,
+            "lost_guesses": self.lost_guesses,
+            "evictions": self.evictions,
+        }
+
+
+game_state_cache = GameStateCache()
@@ -0,0 +1,177 @@
+"""
+In-memory ranking of players by Elo rating.
+
+Each worker keeps every human player in an indexable skip list ordered by
+rating, so a rank lookup or a leaderboard page costs O(log n) instead of an
+ORDER BY over the users table. The list is loaded with one SELECT on first
+use and linked in one pass over the sorted ratings, in a thread so the event
+loop keeps serving requests. Rating and user changes are applied after their
+transaction commits. Changes committed by other workers or by
+scripts/recompute_ratings.py are picked up by a full reload every
+LEADERBOARD_REFRESH_INTERVAL seconds.
+
+Players with the same rating share a rank (1, 2, 2, 4). AI players are not
+ranked.
+"""
+import asyncio
+import os
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from backend.core.ai import AI_USER_IDS
+from backend.core.skiplist import IndexableSkipList
+from backend.db.database import AsyncSessionLocal, after_commit
+from backend.db.models.user import User
+
+LEADERBOARD_REFRESH_INTERVAL = float(os.getenv("LEADERBOARD_REFRESH_INTERVAL", "300"))
+
+
+def _key(user_id: int, rating: float) -> tuple[float, int]:
+    # Highest rating first, ties in id order
+    return -rating, user_id
+
+
+def _build(rows: list) -> tuple[dict[int, tuple[str, float]], IndexableSkipList]:
+    users = {user_id: (name, rating) for user_id, name, rating in rows}
+    return users, IndexableSkipList.from_sorted(sorted(_key(user_id, rating) for user_id, _, rating in rows))
+
+
+class Leaderboard:
+    def __init__(self, refresh_interval: float = LEADERBOARD_REFRESH_INTERVAL, session_factory=AsyncSessionLocal):
+        self.refresh_interval = refresh_interval
+        self.session_factory = session_factory
+        self._index = IndexableSkipList()
+        self._users: dict[int, tuple[str, float]] = {}
+        self._load_lock = asyncio.Lock()
+        # Changes applied while a reload is in flight, replayed onto the reloaded list
+        self._changes: dict[int, tuple[float, str | None]] | None = None
+        self._task: asyncio.Task | None = None
+        self.loaded_at: float | None = None
+        self.loads = 0
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    async def load(self) -> None:
+        """Rebuild the ranking from the users table."""
+        self._changes = {}
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(User.id, User.display_name, User.elo_rating).where(User.id.not_in(AI_USER_IDS))
+                )
+                rows = result.all()
+            self._users, self._index = await asyncio.to_thread(_build, rows)
+            changes = self._changes
+        finally:
+            self._changes = None
+        for user_id, (rating, display_name) in changes.items():
+            self.set(user_id, rating, display_name)
+        self.loaded_at = time.monotonic()
+        self.loads += 1
+
+    async def ensure_loaded(self) -> None:
+        if self.loaded_at is None:
+            async with self._load_lock:
+                if self.loaded_at is None:
+                    await self.load()
+
+    def set(self, user_id: int, rating: float, display_name: str | None = None) -> None:
+        """Move a player to `rating`. Players this worker has not loaded yet need their display name."""
+        if user_id in AI_USER_IDS:
+            return
+        if self._changes is not None:
+            self._changes[user_id] = (rating, display_name or self._changes.get(user_id, (0.0, None))[1])
+        current = self._users.get(user_id)
+        if current is None:
+            if display_name is None:
+                # Joined through another worker; the next reload ranks them
+                return
+        else:
+            display_name = display_name or current[0]
+            self._index.remove(_key(user_id, current[1]))
+        self._users[user_id] = (display_name, rating)
+        self._index.insert(_key(user_id, rating))
+
+    def set_on_commit(self, session: AsyncSession, ratings: dict[int, float], names: dict[int, str] | None = None) -> None:
+        """Apply new ratings, and the names of new players, once the session commits."""
+        pending = session.info.setdefault("leaderboard", {})
+        for user_id, rating in ratings.items():
+            pending[user_id] = (rating, (names or {}).get(user_id))
+
+        async def apply() -> None:
+            if self.loaded_at is None:
+                return
+            for user_id, (rating, name) in session.info.pop("leaderboard", {}).items():
+                self.set(user_id, rating, name)
+
+        after_commit(session, "leaderboard", apply)
+
+    def _rank_of(self, rating: float) -> int:
+        """1 + the number of players rated strictly higher."""
+        return self._index.rank((-rating, float("-inf"))) + 1
+
+    def top(self, offset: int = 0, limit: int = 50) -> list[dict]:
+        """The players ranked offset + 1 to offset + limit."""
+        self.lookups += 1
+        entries = []
+        rank = 0
+        previous_rating = None
+        for position, (_, user_id) in enumerate(self._index.slice(offset, offset + limit), start=offset):
+            name, rating = self._users[user_id]
+            if rating != previous_rating:
+                rank = position + 1 if previous_rating is not None else self._rank_of(rating)
+            entries.append({"rank": rank, "user_id": user_id, "display_name": name, "elo_rating": rating})
+            previous_rating = rating
+        return entries
+
+    def rank(self, user_id: int) -> dict | None:
+        self.lookups += 1
+        current = self._users.get(user_id)
+        if current is None:
+            return None
+        name, rating = current
+        return {"rank": self._rank_of(rating), "user_id": user_id, "display_name": name, "elo_rating": rating}
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.load()
+            except Exception as e:
+                print(f"Error loading the leaderboard: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        if self.refresh_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def clear(self) -> None:
+        self._index = IndexableSkipList()
+        self._users = {}
+        self.loaded_at = None
+        self._load_lock = asyncio.Lock()
+        self._changes = None
+
+    def metrics(self) -> dict:
+        return {
+            "size": len(self._users),
+            "loads": self.loads,
+            "lookups": self.lookups,
+            "seconds_since_load": None if self.loaded_at is None else time.monotonic() - self.loaded_at,
+            "refresh_interval": self.refresh_interval,
+        }
+
+
+leaderboard = Leaderboard()
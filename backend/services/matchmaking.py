@@ -0,0 +1,158 @@
+"""
+In-memory matchmaking for PvP games.
+
+A player who finds no opponent creates a waiting game and gets a ticket in the
+worker's queue. Arriving players are paired with the closest-rated ticket whose
+Elo window covers them. A ticket's window widens the longer it waits. Pairing
+pops the ticket synchronously, so two requests on one worker can never take
+the same ticket. The join itself is a single conditional UPDATE, so workers
+that share waiting games can't both claim the same one.
+
+A waiting player's window keeps widening after nobody arrives, so
+pop_pairs() also pairs waiting tickets with each other once one of them
+accepts the other; the game reaper runs it on every sweep.
+
+Each worker keeps its own queue. On first use it loads the waiting games
+already in the database.
+"""
+import bisect
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.game_engine import Variant
+from backend.db.database import after_commit
+from backend.db.models.game import PvPGame
+
+MATCHMAKING_ELO_WINDOW = float(os.getenv("MATCHMAKING_ELO_WINDOW", "150"))
+# Elo points added to a ticket's window per second of waiting
+MATCHMAKING_WINDOW_GROWTH = float(os.getenv("MATCHMAKING_WINDOW_GROWTH", "25"))
+MATCHMAKING_MAX_WINDOW = float(os.getenv("MATCHMAKING_MAX_WINDOW", "1000"))
+
+
+@dataclass
+class MatchTicket:
+    game_id: int
+    user_id: int
+    elo: float
+    variant: Variant
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    def window(self, now: float) -> float:
+        return min(MATCHMAKING_MAX_WINDOW, MATCHMAKING_ELO_WINDOW + MATCHMAKING_WINDOW_GROWTH * (now - self.enqueued_at))
+
+
+class MatchmakingQueue:
+    def __init__(self):
+        self.loaded = False
+        self._tickets: dict[int, MatchTicket] = {}
+        self._by_user: dict[int, int] = {}
+        # (elo, game_id) sorted per variant
+        self._ratings: dict[Variant, list[tuple[float, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def clear(self) -> None:
+        self.loaded = False
+        self._tickets.clear()
+        self._by_user.clear()
+        self._ratings.clear()
+
+    def add(self, ticket: MatchTicket) -> None:
+        """Queue a waiting game; a player only keeps their latest ticket."""
+        previous = self._by_user.get(ticket.user_id)
+        if previous is not None:
+            self._remove(self._tickets[previous])
+        if ticket.game_id in self._tickets:
+            self._remove(self._tickets[ticket.game_id])
+        self._tickets[ticket.game_id] = ticket
+        self._by_user[ticket.user_id] = ticket.game_id
+        bisect.insort(self._ratings.setdefault(ticket.variant, []), (ticket.elo, ticket.game_id))
+
+    def add_on_commit(self, session: AsyncSession, ticket: MatchTicket) -> None:
+        async def add() -> None:
+            self.add(ticket)
+
+        after_commit(session, f"matchmaking:{ticket.game_id}", add)
+
+    def load(self, waiting_games: list[PvPGame]) -> None:
+        """Queue waiting games found in the database, keeping their age."""
+        now, utcnow = time.monotonic(), datetime.utcnow()
+        for game in waiting_games:
+            waited = (utcnow - game.created_at).total_seconds()  # type: ignore
+            self.add(
+                MatchTicket(
+                    game_id=game.id,  # type: ignore
+                    user_id=game.player1.id,
+                    elo=game.player1.elo,
+                    variant=Variant(num_digits=game.code_length, num_symbols=game.num_symbols),  # type: ignore
+                    enqueued_at=now - max(0.0, waited),
+                )
+            )
+        self.loaded = True
+
+    def discard(self, game_ids) -> None:
+        """Drop the tickets of games that are no longer waiting."""
+        for game_id in game_ids:
+            ticket = self._tickets.get(game_id)
+            if ticket is not None:
+                self._remove(ticket)
+
+    def pop_match(self, user_id: int, elo: float, variant: Variant, now: float | None = None) -> MatchTicket | None:
+        """Remove and return the closest-rated ticket that accepts `elo`, if any."""
+        now = time.monotonic() if now is None else now
+        ratings = self._ratings.get(variant, [])
+        below, above = bisect.bisect_left(ratings, (elo,)) - 1, bisect.bisect_left(ratings, (elo,))
+        while below >= 0 or above < len(ratings):
+            if above >= len(ratings) or (below >= 0 and elo - ratings[below][0] <= ratings[above][0] - elo):
+                ticket_elo, game_id = ratings[below]
+                below -= 1
+            else:
+                ticket_elo, game_id = ratings[above]
+                above += 1
+
+            distance = abs(ticket_elo - elo)
+            if distance > MATCHMAKING_MAX_WINDOW:
+                break
+            ticket = self._tickets[game_id]
+            if ticket.user_id != user_id and distance <= ticket.window(now):
+                self._remove(ticket)
+                return ticket
+        return None
+
+    def pop_pairs(self, now: float | None = None) -> list[tuple[MatchTicket, MatchTicket]]:
+        """
+        Remove and return pairs of waiting tickets, neighbours in rating, whose
+        distance one of the two windows covers; the older ticket comes first.
+        """
+        now = time.monotonic() if now is None else now
+        pairs = []
+        for ratings in self._ratings.values():
+            tickets = [self._tickets[game_id] for _, game_id in ratings]
+            i = 0
+            while i < len(tickets) - 1:
+                first, second = tickets[i], tickets[i + 1]
+                distance = second.elo - first.elo
+                if first.user_id != second.user_id and distance <= max(first.window(now), second.window(now)):
+                    pairs.append((first, second) if first.enqueued_at <= second.enqueued_at else (second, first))
+                    i += 2
+                else:
+                    i += 1
+        for pair in pairs:
+            for ticket in pair:
+                self._remove(ticket)
+        return pairs
+
+    def _remove(self, ticket: MatchTicket) -> None:
+        del self._tickets[ticket.game_id]
+        if self._by_user.get(ticket.user_id) == ticket.game_id:
+            del self._by_user[ticket.user_id]
+        ratings = self._ratings[ticket.variant]
+        ratings.pop(bisect.bisect_left(ratings, (ticket.elo, ticket.game_id)))
+
+
+matchmaking_queue = MatchmakingQueue()
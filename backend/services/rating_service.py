@@ -0,0 +1,126 @@
+"""
+Elo ratings of PvP games.
+
+Results are rated in batches: one SELECT of the players' ratings, one vectorized
+replay (backend.core.rating), one UPDATE of users and one INSERT into the
+append-only rating_history table. AI games are not rated.
+"""
+import dataclasses
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.rating import DEFAULT_RATING, replay
+from backend.db.models.game import PvPGame
+from backend.db.repositories.game_repository import PvPGameRepository
+from backend.db.repositories.rating_history_repository import RatingHistoryRepository
+from backend.db.repositories.user_repository import UserRepository
+from backend.services.leaderboard import leaderboard
+
+
+def _loser_id(game: PvPGame) -> int:
+    return game.player2.id if game.winner_id == game.player1.id else game.player1.id
+
+
+class RatingService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.user_repo = UserRepository(session)
+        self.pvp_repo = PvPGameRepository(session)
+        self.history_repo = RatingHistoryRepository(session)
+
+    async def rate(self, results: list[tuple[int, int, int]]) -> np.ndarray:
+        """
+        Rate (game_id, winner_id, loser_id) results in order; returns the points of
+        each result, 0 where a player no longer exists.
+        """
+        ratings = await self.user_repo.get_ratings({user_id for _, winner, loser in results for user_id in (winner, loser)})
+        rated = [i for i, (_, winner, loser) in enumerate(results) if winner in ratings and loser in ratings]
+        points = np.zeros(len(results))
+        if not rated:
+            return points
+
+        user_ids = list(ratings)
+        index = {user_id: i for i, user_id in enumerate(user_ids)}
+        replayed = replay(
+            np.array([ratings[user_id] for user_id in user_ids]),
+            np.array([index[results[i][1]] for i in rated]),
+            np.array([index[results[i][2]] for i in rated]),
+        )
+        points[rated] = replayed.points
+
+        new_ratings = {user_id: float(replayed.ratings[index[user_id]]) for user_id in user_ids}
+        await self.user_repo.add_to_ratings({user_id: new_ratings[user_id] - ratings[user_id] for user_id in user_ids})
+        leaderboard.set_on_commit(self.session, new_ratings)
+        history = []
+        for k, i in enumerate(rated):
+            game_id, winner, loser = results[i]
+            for user_id, before, delta in (
+                (winner, replayed.winner_before[k], replayed.points[k]),
+                (loser, replayed.loser_before[k], -replayed.points[k]),
+            ):
+                history.append(
+                    {
+                        "user_id": user_id,
+                        "game_id": game_id,
+                        "reason": "game",
+                        "rating_before": float(before),
+                        "rating_after": float(before + delta),
+                    }
+                )
+        await self.history_repo.add_many(history)
+        return points
+
+    async def rate_games(self, games: list[PvPGame]) -> None:
+        """Rate finished PvP games and store both players' new ratings in each game."""
+        games = [game for game in games if game.game_mode == "pvp" and game.winner_id is not None]
+        points = await self.rate([(game.id, game.winner_id, _loser_id(game)) for game in games])  # type: ignore
+        for game, game_points in zip(games, points):
+            player1_delta = round(game_points) if game.winner_id == game.player1.id else -round(game_points)
+            game.player1 = dataclasses.replace(game.player1, elo=game.player1.elo + player1_delta)
+            game.player2 = dataclasses.replace(game.player2, elo=game.player2.elo - player1_delta)
+        await self.session.flush()
+
+    async def rate_forfeits(self, forfeits: list) -> int:
+        """Rate the PvP rows returned by PvPGameRepository.forfeit_idle() or abandon_all(); returns the number rated."""
+        forfeits = sorted((row for row in forfeits if row.game_mode == "pvp"), key=lambda row: row.id)
+        losers = [row.player2_id if row.winner_id == row.player1_id else row.player1_id for row in forfeits]
+        points = await self.rate([(row.id, row.winner_id, loser) for row, loser in zip(forfeits, losers)])
+
+        deltas = []
+        for row, game_points in zip(forfeits, points):
+            if game_points:
+                player1_delta = round(game_points) if row.winner_id == row.player1_id else -round(game_points)
+                deltas.append((row.id, player1_delta, -player1_delta))
+        await self.pvp_repo.add_to_player_elos(deltas)
+        return int(np.count_nonzero(points))
+
+    async def recompute(self) -> int:
+        """
+        Replay every decided PvP game, archived ones included, in the order they
+        finished, with every player starting from DEFAULT_RATING. Players without
+        such games, AI players among them, keep their rating. Returns the number of
+        games replayed.
+        """
+        results = await self.pvp_repo.rated_results()
+        current = await self.user_repo.get_ratings()
+        results = [result for result in results if result[1] in current and result[2] in current]
+        user_ids = sorted({user_id for _, winner, loser in results for user_id in (winner, loser)})
+        index = {user_id: i for i, user_id in enumerate(user_ids)}
+        replayed = replay(
+            np.full(len(user_ids), DEFAULT_RATING),
+            np.array([index[winner] for _, winner, _ in results]),
+            np.array([index[loser] for _, _, loser in results]),
+        )
+
+        ratings = {user_id: float(replayed.ratings[index[user_id]]) for user_id in user_ids}
+        changed = {user_id: rating for user_id, rating in ratings.items() if rating != current[user_id]}
+        await self.user_repo.set_ratings(changed)
+        leaderboard.set_on_commit(self.session, changed)
+        await self.history_repo.add_many(
+            [
+                {"user_id": user_id, "game_id": None, "reason": "recompute", "rating_before": current[user_id], "rating_after": rating}
+                for user_id, rating in changed.items()
+            ]
+        )
+        return len(results)
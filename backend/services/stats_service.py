@@ -0,0 +1,165 @@
+"""
+Per-player statistics, kept as rollup rows in user_stats.
+
+Each finished game adds one increment per human player to the row of its kind:
+'single', 'pvp' or 'ai_<difficulty>'. The increments of a batch of games are
+merged in memory and written with one upsert. rebuild() recomputes the rows of
+a range of users from the games themselves; scripts/rebuild_user_stats.py runs
+it over every user in parallel batches.
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.ai import AI_USER_IDS
+from backend.db.models.game import Game, PlayerState
+from backend.db.models.user_stats import SOLVE_TIME_BUCKETS, UserStats
+from backend.db.repositories.game_repository import GameRepository
+from backend.db.repositories.user_stats_repository import COUNTERS, UserStatsRepository
+
+
+def solve_time_column(seconds: float) -> str:
+    for bound in SOLVE_TIME_BUCKETS:
+        if seconds <= bound:
+            return f"solved_within_{bound}s"
+    return f"solved_over_{SOLVE_TIME_BUCKETS[-1]}s"
+
+
+def game_increments(
+    game_mode: str,
+    ai_difficulty: str | None,
+    status: str,
+    player_ids: tuple[int | None, ...],
+    winner_id: int | None,
+    winner_guesses: int = 0,
+    started_at: datetime | None = None,
+    completed_at: datetime | None = None,
+) -> list[dict]:
+    """The user_stats increments of one decided game, one per human player."""
+    kind = f"ai_{ai_difficulty}" if game_mode == "ai" else game_mode
+    increments = []
+    for user_id in player_ids:
+        if user_id is None or user_id in AI_USER_IDS:
+            continue
+        increment = {"user_id": user_id, "kind": kind, "games": 1}
+        if user_id == winner_id:
+            increment["wins"] = 1
+            # An abandoned game is won without cracking the code
+            if status == "completed":
+                increment.update(solved=1, solve_guesses=winner_guesses)
+                if started_at is not None and completed_at is not None:
+                    seconds = (completed_at - started_at).total_seconds()
+                    increment.update(solve_seconds=seconds, **{solve_time_column(seconds): 1})
+        else:
+            increment["losses"] = 1
+        increments.append(increment)
+    return increments
+
+
+def merge_increments(increments: list[dict]) -> list[dict]:
+    """Sum increments of the same (user_id, kind)."""
+    merged: dict[tuple[int, str], dict] = defaultdict(dict)
+    for increment in increments:
+        row = merged[increment["user_id"], increment["kind"]]
+        for key, value in increment.items():
+            row[key] = row.get(key, 0) + value if key in COUNTERS else value
+    return list(merged.values())
+
+
+def _players(game: Game) -> list[PlayerState]:
+    return [game.player] if game.game_mode == "single" else [game.player1, game.player2]
+
+
+def stats_summary(user_id: int, rows: list[UserStats]) -> dict:
+    """The rollup rows of a user as totals, rates and averages."""
+    kinds = []
+    for row in rows:
+        solve_times = {f"{bound}s": getattr(row, f"solved_within_{bound}s") for bound in SOLVE_TIME_BUCKETS}
+        solve_times[f"over_{SOLVE_TIME_BUCKETS[-1]}s"] = getattr(row, f"solved_over_{SOLVE_TIME_BUCKETS[-1]}s")
+        kinds.append(
+            {
+                "kind": row.kind,
+                "games": row.games,
+                "wins": row.wins,
+                "losses": row.losses,
+                "win_rate": row.wins / row.games if row.games else 0.0,
+                "solved": row.solved,
+                "average_guesses": row.solve_guesses / row.solved if row.solved else None,
+                "average_solve_seconds": row.solve_seconds / row.solved if row.solved else None,
+                "solve_times": solve_times,
+            }
+        )
+    games = sum(kind["games"] for kind in kinds)
+    wins = sum(kind["wins"] for kind in kinds)
+    return {
+        "user_id": user_id,
+        "games": games,
+        "wins": wins,
+        "losses": sum(kind["losses"] for kind in kinds),
+        "win_rate": wins / games if games else 0.0,
+        "kinds": kinds,
+    }
+
+
+class StatsService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.stats_repo = UserStatsRepository(session)
+        self.game_repo = GameRepository(session)
+
+    async def record_games(self, games: list[Game]) -> None:
+        """Add finished games to their players' stats."""
+        increments = []
+        for game in games:
+            if game.winner_id is None:
+                continue
+            players = _players(game)
+            winner_guesses = next(len(player.guesses or []) for player in players if player.id == game.winner_id)
+            increments += game_increments(
+                game.game_mode,  # type: ignore
+                getattr(game, "ai_difficulty", None),
+                game.status,  # type: ignore
+                tuple(player.id for player in players),
+                game.winner_id,  # type: ignore
+                winner_guesses,
+                game.started_at,  # type: ignore
+                game.completed_at,  # type: ignore
+            )
+        await self.stats_repo.add_many(merge_increments(increments))
+
+    async def record_abandoned(self, rows: list) -> None:
+        """Add the rows returned by PvPGameRepository.forfeit_idle() or abandon_all() to their players' stats."""
+        increments = []
+        for row in rows:
+            increments += game_increments(
+                row.game_mode, row.ai_difficulty, "abandoned", (row.player1_id, row.player2_id), row.winner_id
+            )
+        await self.stats_repo.add_many(merge_increments(increments))
+
+    async def rebuild(self, first_user_id: int, last_user_id: int) -> int:
+        """Recompute the stats of users first_user_id to last_user_id from their games; returns the games read."""
+        games = await self.game_repo.finished_games(first_user_id, last_user_id)
+        increments = []
+        for game in games:
+            increments += [
+                increment
+                for increment in game_increments(
+                    game.game_mode,
+                    game.ai_difficulty,
+                    game.status,
+                    (game.player1_id, game.player2_id),
+                    game.winner_id,
+                    game.winner_guesses or 0,
+                    game.started_at,
+                    game.completed_at,
+                )
+                if first_user_id <= increment["user_id"] <= last_user_id
+            ]
+        await self.stats_repo.replace_users(first_user_id, last_user_id, merge_increments(increments))
+        return len(games)
+
+    async def user_stats(self, user_id: int) -> dict:
+        """The user's stats, read from the rollup rows only."""
+        return stats_summary(user_id, await self.stats_repo.for_user(user_id))
+
@@ -50,4 +50,6 @@ echo "[4/4] Starting Uvicorn server..."
 echo "========================================"
 echo ""
 
+# One process, no --workers: games in progress, the matchmaking queue, game
+# events and the leaderboard are held in memory and not shared between processes
 exec uvicorn backend.main:app --host 0.0.0.0 --port 8000 --reload
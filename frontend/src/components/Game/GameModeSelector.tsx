@@ -10,7 +10,7 @@ export function GameModeSelector({ onStartGame }: GameModeSelectorProps) {
   const { user, checkAuth, logout } = useAuthStore();
   const [selectedMode, setSelectedMode] = useState<GameMode>('single');
   const [playerSecret, setPlayerSecret] = useState('');
-  const [aiDifficulty, setAiDifficulty] = useState<'easy' | 'hard'>('easy');
+  const [aiDifficulty, setAiDifficulty] = useState<'easy' | 'medium' | 'hard'>('easy');
   const [error, setError] = useState('');
 
   // Refresh user data when component mounts to get latest ELO
@@ -161,7 +161,7 @@ export function GameModeSelector({ onStartGame }: GameModeSelectorProps) {
                       value="easy"
                       checked={aiDifficulty === "easy"}
                       onChange={(e) =>
-                        setAiDifficulty(e.target.value as "easy" | "hard")
+                        setAiDifficulty(e.target.value as "easy" | "medium" | "hard")
                       }
                       className="w-4 h-4 text-purple-600"
                     />
@@ -169,6 +169,21 @@ export function GameModeSelector({ onStartGame }: GameModeSelectorProps) {
                       Brad (ELO 200)
                     </span>
                   </label>
+                  <label className="flex items-center space-x-2 cursor-pointer">
+                    <input
+                      type="radio"
+                      name="aiDifficulty"
+                      value="medium"
+                      checked={aiDifficulty === "medium"}
+                      onChange={(e) =>
+                        setAiDifficulty(e.target.value as "easy" | "medium" | "hard")
+                      }
+                      className="w-4 h-4 text-purple-600"
+                    />
+                    <span className="text-sm text-gray-700">
+                      AradzBot (ELO 2000)
+                    </span>
+                  </label>
                   <label className="flex items-center space-x-2 cursor-pointer">
                     <input
                       type="radio"
@@ -176,12 +191,12 @@ export function GameModeSelector({ onStartGame }: GameModeSelectorProps) {
                       value="hard"
                       checked={aiDifficulty === "hard"}
                       onChange={(e) =>
-                        setAiDifficulty(e.target.value as "easy" | "hard")
+                        setAiDifficulty(e.target.value as "easy" | "medium" | "hard")
                       }
                       className="w-4 h-4 text-purple-600"
                     />
                     <span className="text-sm text-gray-700">
-                      AradzBot (ELO 2000)
+                      Knuth (ELO 2200)
                     </span>
                   </label>
                 </div>
@@ -0,0 +1,45 @@
+"""
+Script to generate the opening book used by the Knuth AI (the hard difficulty).
+
+Solves every canonical game history up to the requested depth with a full
+partition search (no time budget) and writes the packed binary book that
+the backend loads at startup.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from backend
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core.ai.opening_book import DEFAULT_BOOK_PATH, STRATEGIES, build_opening_book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the Mastermind opening book")
+    parser.add_argument("--depth", type=int, default=2, help="Number of history records covered by the book")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="minimax")
+    parser.add_argument("--output", type=Path, default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Opening Book Generator")
+    print("=" * 60)
+    print(f"Depth: {args.depth}, strategy: {args.strategy}\n")
+
+    started = time.monotonic()
+
+    def progress(count, key):
+        if count % 50 == 0:
+            print(f"  {count} positions solved ({time.monotonic() - started:.0f}s)")
+
+    book = build_opening_book(max_depth=args.depth, strategy=args.strategy, progress=progress)
+    book.save(args.output)
+
+    print(f"\n✓ {len(book)} positions written to {args.output} in {time.monotonic() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """
 Idempotent script to seed AI users into the database.
 
-This script will check if AI users already exist and only insert them if they don't.
+This script will check which AI users already exist and only insert the missing ones.
 Safe to run multiple times - will skip if users already exist.
 """
 
@@ -13,11 +13,11 @@ from pathlib import Path
 # Add the parent directory to the path so we can import from backend
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from backend.core.ai import AradzBot, RandomAI
+from backend.core.ai import AradzBot, KnuthAI, RandomAI
 from backend.db.models.user import User
 
 # Database URL - you can override this with an environment variable
@@ -27,6 +27,7 @@ DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://mastermind:master
 AI_USERS = [
     AradzBot.user(),
     RandomAI.user(),
+    KnuthAI.user(),
 ]
 
 
@@ -34,21 +35,26 @@ async def seed_ai_users(session: AsyncSession):
     """Seed the database with AI users if they don't already exist."""
     print("Checking for existing AI users...")
 
-    # Check if AradzBot (id=0) already exists
-    result = await session.execute(select(User).where(User.id == 0))
-    existing_user = result.scalar_one_or_none()
+    result = await session.execute(select(User.id).where(User.id.in_([ai_user.id for ai_user in AI_USERS])))
+    existing_ids = set(result.scalars().all())
 
-    if existing_user:
+    missing_users = [ai_user for ai_user in AI_USERS if ai_user.id not in existing_ids]
+    if not missing_users:
         print("✓ AI users already exist in database. Skipping seed.")
         return True
 
     print("Seeding AI users...")
 
     created_users = []
-    for ai_data in AI_USERS:
+    for ai_data in missing_users:
         session.add(ai_data)
         created_users.append(ai_data)
 
+    # AI users have hardcoded ids, so move the id sequence past them
+    await session.flush()
+    await session.execute(
+        text("SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT MAX(id) FROM users))")
+    )
     await session.commit()
 
     print("✓ AI users created successfully:")
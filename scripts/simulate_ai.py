@@ -0,0 +1,70 @@
+"""
+Script to measure AI strength and speed with self-play.
+
+Plays games against every secret (or a sample) for each requested AI
+difficulty and prints the reports as JSON. With --max-mean-guesses or
+--max-p95-ms it exits non-zero when a report is over the limit, so it can
+gate solver changes in CI.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from backend
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core.game_engine import Variant
+from backend.core.simulation import DEFAULT_MAX_GUESSES, simulate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate AI games without a database")
+    parser.add_argument("--difficulty", nargs="+", default=["easy", "medium", "hard"])
+    parser.add_argument("--games", type=int, default=None, help="Number of sampled secrets (default: the whole code space)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--free-guess", action="store_true", help="Start every game with a random free guess")
+    parser.add_argument("--max-guesses", type=int, default=DEFAULT_MAX_GUESSES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--code-length", type=int, default=4)
+    parser.add_argument("--num-symbols", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=None, help="Also write the JSON report to this file")
+    parser.add_argument("--max-mean-guesses", type=float, default=None)
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    args = parser.parse_args()
+    variant = Variant(num_digits=args.code_length, num_symbols=args.num_symbols)
+
+    reports = [
+        simulate(
+            difficulty,
+            num_games=args.games,
+            workers=args.workers,
+            free_guess=args.free_guess,
+            max_guesses=args.max_guesses,
+            seed=args.seed,
+            variant=variant,
+        )
+        for difficulty in args.difficulty
+    ]
+
+    output = json.dumps(reports, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output)
+
+    failed = False
+    for report in reports:
+        mean_guesses = report["guesses"]["mean"]
+        if args.max_mean_guesses is not None and (mean_guesses is None or mean_guesses > args.max_mean_guesses):
+            print(f"✗ {report['difficulty']}: mean guesses {mean_guesses} > {args.max_mean_guesses}", file=sys.stderr)
+            failed = True
+        if args.max_p95_ms is not None and report["move_latency_ms"]["p95"] > args.max_p95_ms:
+            print(f"✗ {report['difficulty']}: p95 move latency {report['move_latency_ms']['p95']:.1f}ms > {args.max_p95_ms}ms", file=sys.stderr)
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
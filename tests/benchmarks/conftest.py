@@ -0,0 +1,54 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from backend.main import app
+
+
+class ApiSession:
+    """Drives the ASGI app from synchronous benchmark code on a dedicated event loop."""
+
+    def __init__(self, runner: asyncio.Runner, session_factory):
+        self.runner = runner
+        self.session_factory = session_factory
+        self.client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+        self.headers: dict = {}
+
+    def run(self, coro):
+        return self.runner.run(coro)
+
+    def request(self, method: str, url: str, headers: dict | None = None, **kwargs):
+        return self.run(self.client.request(method, url, headers=headers or self.headers, **kwargs))
+
+    def login(self, name: str = "Bench") -> dict:
+        response = self.run(self.client.post("/api/auth/guest", json={"display_name": name}))
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return self.headers
+
+    @contextmanager
+    def count_queries(self):
+        """Collect the SQL statements sent to the database inside the block."""
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = self.session_factory.kw["bind"].sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def api(session_factory):
+    with asyncio.Runner() as runner:
+        session = ApiSession(runner, session_factory)
+        session.login()
+        yield session
+        runner.run(session.client.aclose())
+        runner.run(session_factory.kw["bind"].dispose())
@@ -0,0 +1,61 @@
+import dataclasses
+from datetime import datetime
+
+from backend.api.routes.games import _game_response_from_game
+from backend.db.models.game import PlayerState, PvPGame
+from backend.db.models.user import User
+
+
+def _player(player_id: int, guesses: int) -> PlayerState:
+    return PlayerState(
+        id=player_id,
+        name=f"player{player_id}",
+        secret="1234",
+        guesses=[{"guess": "5678", "exact": 0, "wrong_pos": 0} for _ in range(guesses)],
+        elo=1200,
+    )
+
+
+def test_player_state_round_trip(benchmark):
+    player = _player(1, 8)
+    copy = benchmark(lambda: PlayerState(**dataclasses.asdict(player)))
+    assert copy == player
+
+
+def test_game_response_serialization(benchmark):
+    game = PvPGame(
+        id=1,
+        player1=_player(1, 8),
+        player2=_player(2, 8),
+        game_mode="pvp",
+        code_length=4,
+        num_symbols=10,
+        status="in_progress",
+        current_turn=1,
+        starter_id=1,
+        created_at=datetime.utcnow(),
+        started_at=datetime.utcnow(),
+    )
+    user = User(id=1)
+
+    response = benchmark(lambda: _game_response_from_game(game, user).model_dump_json())
+    assert '"opponent_id":2' in response
+
+
+def test_guess_request_cycle(benchmark, api):
+    games = [api.request("POST", "/api/games/new", json={"game_mode": "single"}).json()]
+    guesses = iter(str(n).zfill(4) for n in range(10000))
+
+    def next_guess():
+        # A lucky guess finishes the game; later rounds guess on a fresh one, outside the timing
+        if games[-1]["status"] != "in_progress":
+            games.append(api.request("POST", "/api/games/new", json={"game_mode": "single"}).json())
+        return (games[-1]["id"], next(guesses)), {}
+
+    def guess_request(game_id: int, guess: str):
+        response = api.request("POST", f"/api/games/{game_id}/guess", json={"guess": guess})
+        assert response.status_code == 200
+        games[-1] = response.json()
+        return response
+
+    benchmark.pedantic(guess_request, setup=next_guess, rounds=50, warmup_rounds=1)
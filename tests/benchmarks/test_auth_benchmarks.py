@@ -0,0 +1,23 @@
+import pytest
+
+from backend.core import jwt_handler
+from backend.core.jwt_handler import create_access_token, token_cache, verify_token
+
+TOKENS = 64
+
+
+@pytest.mark.parametrize("backend", ["jose", "hmac"])
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def test_verify_token(benchmark, monkeypatch, backend, cached):
+    monkeypatch.setattr(jwt_handler, "JWT_BACKEND", backend)
+    tokens = [create_access_token(user_id) for user_id in range(TOKENS)]
+    token_cache.clear()
+
+    def verify_all():
+        if not cached:
+            token_cache.clear()
+        for token in tokens:
+            verify_token(token)
+
+    benchmark(verify_all)
+    token_cache.clear()
@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pytest
+
+from backend.core.ai import AradzBot
+from backend.core.game_engine import GuessRecord, MasterMindGame
+from backend.core.rating import replay
+from backend.core.skiplist import IndexableSkipList
+
+GUESSES = [str(n).zfill(4) for n in random.Random(0).sample(range(10000), 256)]
+
+
+def _history(secret: str, length: int) -> list[GuessRecord]:
+    game = MasterMindGame(player_secret=secret)
+    for guess in [g for g in GUESSES if g != secret][:length]:
+        game.make_guess(guess)
+    return game.history
+
+
+def test_evaluate_guess_throughput(benchmark):
+    game = MasterMindGame(player_secret="1122")
+
+    def evaluate_all():
+        for guess in GUESSES:
+            game.evaluate_guess(guess)
+
+    benchmark(evaluate_all)
+
+
+@pytest.mark.parametrize("history_length", range(1, 9))
+def test_aradz_bot_next_guess(benchmark, history_length):
+    history = _history("3817", history_length)
+
+    def next_guess():
+        # A fresh bot per move, as the server restores it between requests
+        game = MasterMindGame(player_secret="3817", history=list(history))
+        return AradzBot(game).get_next_guess()
+
+    guess = benchmark(next_guess)
+    assert MasterMindGame(player_secret=guess).evaluate_guess(history[0].guess) == (history[0].exact, history[0].wrong_pos)
+
+
+def test_evaluate_guesses_batch_throughput(benchmark):
+    game = MasterMindGame(player_secret="1122")
+    codes = np.arange(10000)
+
+    exact, wrong_pos = benchmark(game.evaluate_guesses, codes)
+    assert (exact[2211], wrong_pos[2211]) == (0, 4)
+
+
+def test_rating_replay(benchmark):
+    rng = np.random.default_rng(0)
+    players = rng.choice(5000, size=(100_000, 2))
+    players = players[players[:, 0] != players[:, 1]]
+
+    replayed = benchmark(replay, np.full(5000, 1200.0), players[:, 0], players[:, 1])
+    assert np.isclose(replayed.ratings.mean(), 1200.0)
+
+
+def test_rank_update_and_lookup(benchmark):
+    rng = random.Random(0)
+    ratings = {user_id: rng.uniform(800, 2000) for user_id in range(100_000)}
+    ranking = IndexableSkipList(sorted((-rating, user_id) for user_id, rating in ratings.items()), seed=0)
+
+    def move_and_rank():
+        user_id = rng.randrange(100_000)
+        ranking.remove((-ratings[user_id], user_id))
+        ratings[user_id] += rng.uniform(-16, 16)
+        ranking.insert((-ratings[user_id], user_id))
+        return ranking.rank((-ratings[user_id], user_id))
+
+    assert 0 <= benchmark(move_and_rank) < 100_000
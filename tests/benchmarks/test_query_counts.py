@@ -0,0 +1,205 @@
+"""
+Database round-trips per request.
+
+Each test records the statements a request sends and stores the count in the
+benchmark's extra_info, so saved runs can be compared. The asserts pin the
+current counts so a regression shows up as a failure.
+"""
+import pytest
+
+from backend.services.game_state_cache import game_state_cache
+
+# A guess on a cached game touches no table; an uncached one reads the game, runs
+# the guarded UPDATE and inserts the guesses row
+cache_modes = pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+
+
+def _expected_statements(cached: bool, guesses: int = 1) -> int:
+    return 0 if cached else 3 * guesses
+
+
+def _selects(statements: list[str]) -> int:
+    return sum(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+
+
+def _guess_queries(benchmark, api, game_id: int, headers: dict, guesses) -> list[str]:
+    def guess_request():
+        with api.count_queries() as statements:
+            response = api.request("POST", f"/api/games/{game_id}/guess", headers=headers, json={"guess": next(guesses)})
+        assert response.status_code == 200
+        return statements
+
+    # Cache the game first, so only cached guesses are counted when caching is on
+    guess_request()
+    statements = benchmark.pedantic(guess_request, rounds=5, iterations=1)
+    benchmark.extra_info["queries"] = len(statements)
+    benchmark.extra_info["statements"] = statements
+    return statements
+
+
+@cache_modes
+def test_single_guess_queries(benchmark, api, monkeypatch, cached):
+    monkeypatch.setattr(game_state_cache, "enabled", cached)
+    game = api.request("POST", "/api/games/new", json={"game_mode": "single"}).json()
+    guesses = (str(n).zfill(4) for n in range(10000) if n % 1111)
+
+    statements = _guess_queries(benchmark, api, game["id"], api.headers, guesses)
+    # A cached game's guesses are written back later
+    assert len(statements) == _expected_statements(cached)
+    assert _selects(statements) == (0 if cached else 1)
+
+
+@cache_modes
+def test_pvp_guess_queries(benchmark, api, monkeypatch, cached):
+    monkeypatch.setattr(game_state_cache, "enabled", cached)
+    players = [api.login("Guesser"), api.login("Opponent")]
+    game = api.request("POST", "/api/games/new", headers=players[0], json={"game_mode": "pvp", "player_secret": "1234"}).json()
+    game = api.request("POST", "/api/games/new", headers=players[1], json={"game_mode": "pvp", "player_secret": "5678"}).json()
+    first, second = players[::-1] if game["current_turn"] == game["self_id"] else players
+    guesses = (str(n).zfill(4) for n in range(10000) if n % 1111 and n not in (1234, 5678))
+
+    def both_guess():
+        with api.count_queries() as statements:
+            for headers in (first, second):
+                response = api.request("POST", f"/api/games/{game['id']}/guess", headers=headers, json={"guess": next(guesses)})
+                assert response.status_code == 200
+        return statements
+
+    both_guess()
+    statements = benchmark.pedantic(both_guess, rounds=5, iterations=1)
+    benchmark.extra_info["queries_per_guess"] = len(statements) / 2
+    benchmark.extra_info["statements"] = statements
+    assert len(statements) == _expected_statements(cached, guesses=2)
+    assert _selects(statements) == (0 if cached else 2)
+
+
+def test_create_single_game_queries(benchmark, api):
+    # Prime the user cache, so only the game's own statements are counted
+    assert api.request("POST", "/api/games/new", json={"game_mode": "single"}).status_code == 201
+
+    def create():
+        with api.count_queries() as statements:
+            assert api.request("POST", "/api/games/new", json={"game_mode": "single"}).status_code == 201
+        return statements
+
+    statements = benchmark.pedantic(create, rounds=5, iterations=1)
+    benchmark.extra_info["queries"] = len(statements)
+    benchmark.extra_info["statements"] = statements
+    assert len(statements) <= 2
+
+
+def test_get_game_queries(benchmark, api):
+    game = api.request("POST", "/api/games/new", json={"game_mode": "single"}).json()
+
+    def get():
+        with api.count_queries() as statements:
+            assert api.request("GET", f"/api/games/{game['id']}").status_code == 200
+        return statements
+
+    statements = benchmark.pedantic(get, rounds=5, iterations=1, warmup_rounds=1)
+    benchmark.extra_info["queries"] = len(statements)
+    benchmark.extra_info["statements"] = statements
+    # One SELECT across games, single_games and pvp_games
+    assert len(statements) == 1
+
+
+@cache_modes
+def test_opponent_guess_queries(benchmark, api, monkeypatch, cached):
+    monkeypatch.setattr(game_state_cache, "enabled", cached)
+    game = api.request(
+        "POST", "/api/games/new", json={"game_mode": "ai", "ai_difficulty": "easy", "player_secret": "1234"}
+    ).json()
+
+    def opponent_guess():
+        with api.count_queries() as statements:
+            assert api.request("POST", f"/api/games/{game['id']}/opponent_guess").status_code == 200
+        return statements
+
+    opponent_guess()
+    statements = benchmark.pedantic(opponent_guess, rounds=5, iterations=1)
+    benchmark.extra_info["queries"] = len(statements)
+    benchmark.extra_info["statements"] = statements
+    assert len(statements) == _expected_statements(cached)
+    assert _selects(statements) == (0 if cached else 1)
+
+
+def test_write_back_queries(benchmark, api):
+    games = [api.request("POST", "/api/games/new", json={"game_mode": "single"}).json() for _ in range(10)]
+    guesses = (str(n).zfill(4) for n in range(10000) if n % 1111)
+
+    def guess_and_flush():
+        cached = 0
+        for n, game in enumerate(games):
+            response = api.request("POST", f"/api/games/{game['id']}/guess", json={"guess": next(guesses)})
+            if response.json()["status"] == "in_progress":
+                cached += 1
+            else:
+                # A lucky guess finished the game, which was written back on the spot
+                games[n] = api.request("POST", "/api/games/new", json={"game_mode": "single"}).json()
+        with api.count_queries() as statements:
+            api.run(game_state_cache.flush())
+        # One guarded UPDATE per cached game and one batched guesses INSERT
+        assert len(statements) == (cached + 1 if cached else 0)
+        return statements
+
+    statements = benchmark.pedantic(guess_and_flush, rounds=5, iterations=1)
+    benchmark.extra_info["queries"] = len(statements)
+    benchmark.extra_info["statements"] = statements
+
+
+def test_logout_queries(benchmark, api):
+    def start_games(count: int) -> dict:
+        quitter = api.login("Quitter")
+        for n in range(count):
+            api.request("POST", "/api/games/new", headers=quitter, json={"game_mode": "pvp", "player_secret": "1234"})
+            opponent = api.login(f"Opponent {n}")
+            api.request("POST", "/api/games/new", headers=opponent, json={"game_mode": "pvp", "player_secret": "5678"})
+        return quitter
+
+    def logout(quitter: dict, count: int) -> list[str]:
+        with api.count_queries() as statements:
+            response = api.request("POST", "/api/auth/logout", headers=quitter)
+        assert len(response.json()["abandoned_games"]) == count
+        return statements
+
+    one = logout(start_games(1), 1)
+    statements = benchmark.pedantic(logout, setup=lambda: ((start_games(5), 5), {}), rounds=3)
+    benchmark.extra_info["queries"] = len(statements)
+    benchmark.extra_info["statements"] = statements
+    # One UPDATE of the games, one rating batch and one SELECT to publish them, however many are open
+    assert len(statements) == len(one)
+
+
+def test_game_history_queries(benchmark, api):
+    for _ in range(30):
+        api.request("POST", "/api/games/new", json={"game_mode": "single"})
+    cursor = api.request("GET", "/api/games", params={"limit": 10}).json()["next_cursor"]
+
+    def page():
+        with api.count_queries() as statements:
+            response = api.request("GET", "/api/games", params={"limit": 10, "before": cursor})
+        assert len(response.json()["games"]) == 10
+        return statements
+
+    statements = benchmark.pedantic(page, rounds=5, iterations=1, warmup_rounds=1)
+    benchmark.extra_info["queries"] = len(statements)
+    benchmark.extra_info["statements"] = statements
+    # One UNION ALL of keyset-limited index range reads
+    assert len(statements) == 1
+
+
+def test_user_stats_queries(benchmark, api):
+    api.request("POST", "/api/games/new", json={"game_mode": "ai", "ai_difficulty": "easy", "player_secret": "1234"})
+    user_id = api.request("GET", "/api/auth/me").json()["id"]
+    api.request("POST", "/api/auth/logout")
+
+    def stats():
+        with api.count_queries() as statements:
+            assert api.request("GET", f"/api/users/{user_id}/stats").json()["games"] == 1
+        return statements
+
+    statements = benchmark.pedantic(stats, rounds=5, iterations=1, warmup_rounds=1)
+    benchmark.extra_info["queries"] = len(statements)
+    benchmark.extra_info["statements"] = statements
+    # Only the user's user_stats rows are read
+    assert len(statements) == 1
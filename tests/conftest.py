@@ -1,5 +1,16 @@
+import asyncio
+
 import pytest
-from backend.db.database import engine
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.core.ai import AradzBot, KnuthAI, RandomAI
+from backend.db.database import Base, engine, get_db, run_after_commit
+from backend.db.user_cache import user_cache
+from backend.main import app
+from backend.services.game_state_cache import game_state_cache
+from backend.services.leaderboard import leaderboard
+from backend.services.matchmaking import matchmaking_queue
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -8,3 +19,55 @@ async def cleanup_db():
     yield
     # Dispose of all connections to avoid event loop conflicts
     await engine.dispose()
+
+
+async def _create_schema(sqlite_engine) -> None:
+    async with sqlite_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(sqlite_engine) as session:
+        session.add_all([AradzBot.user(), RandomAI.user(), KnuthAI.user()])
+        await session.commit()
+    # Connections are bound to this loop; tests open fresh ones on their own loop
+    await sqlite_engine.dispose()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """SQLite-backed session factory wired into the app in place of PostgreSQL."""
+    sqlite_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    asyncio.run(_create_schema(sqlite_engine))
+    factory = async_sessionmaker(sqlite_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as session:
+            try:
+                yield session
+                await session.commit()
+                await run_after_commit(session)
+            except Exception:
+                await session.rollback()
+                raise
+
+    app.dependency_overrides[get_db] = override_get_db
+    matchmaking_queue.clear()
+    game_state_cache.clear()
+    game_state_cache.session_factory = factory
+    leaderboard.clear()
+    leaderboard.session_factory = factory
+    asyncio.run(user_cache.clear())
+    yield factory
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+async def client(session_factory):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    await session_factory.kw["bind"].dispose()
+
+
+@pytest.fixture
+async def auth_headers(client):
+    response = await client.post("/api/auth/guest", json={"display_name": "Tester"})
+    assert response.status_code == 201
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,56 @@
+import json
+from datetime import datetime
+
+from backend.db.models.game import ArchivedPvPGame
+
+
+async def _guest(client, name: str) -> tuple[int, dict]:
+    response = await client.post("/api/auth/guest", json={"display_name": name})
+    return response.json()["user"]["id"], {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def test_history_pages_through_every_kind_of_game(client, session_factory):
+    player_id, player = await _guest(client, "Player")
+    opponent_id, opponent = await _guest(client, "Opponent")
+    async with session_factory() as session:
+        session.add(
+            ArchivedPvPGame(
+                id=10_000, code_length=4, num_symbols=10, game_mode="pvp", player1_id=opponent_id,
+                player1_name="Opponent", player1_guesses=[], player1_elo=1200, player2_id=player_id,
+                player2_name="Player", player2_guesses=[], player2_elo=1200, winner_id=player_id,
+                status="completed", created_at=datetime(2020, 1, 1), completed_at=datetime(2020, 1, 1),
+            )
+        )
+        await session.commit()
+
+    created = []
+    for _ in range(3):
+        game = await client.post("/api/games/new", json={"game_mode": "single"}, headers=player)
+        created.append(game.json()["id"])
+    await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "1234"}, headers=opponent)
+    game = await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "5678"}, headers=player)
+    created.append(game.json()["id"])
+    await client.post("/api/games/new", json={"game_mode": "single"}, headers=opponent)
+
+    games, before = [], None
+    while True:
+        params = {"limit": 2, **({"before": before} if before else {})}
+        page = (await client.get("/api/games", params=params, headers=player)).json()
+        games += page["games"]
+        before = page["next_cursor"]
+        if before is None:
+            break
+
+    assert [game["id"] for game in games] == [*reversed(created), 10_000]
+    assert games[0]["game_mode"] == "pvp" and games[0]["opponent_name"] == "Opponent"
+    assert games[-1]["winner_id"] == player_id and games[-1]["opponent_id"] == opponent_id
+    assert "self_guesses" not in games[0]
+
+    stream = await client.get("/api/games", params={"format": "ndjson"}, headers=player)
+    assert stream.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in stream.text.splitlines()] == games
+
+
+async def test_history_rejects_invalid_cursors(client, auth_headers):
+    response = await client.get("/api/games", params={"before": "not a cursor"}, headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,156 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, select
+
+from backend.core.ai import RandomAI
+from backend.core.game_engine import CLASSIC
+from backend.db.models.game import ArchivedPvPGame, Game, PlayerState, PvPGame
+from backend.db.models.guess import Guess
+from backend.db.models.user import User
+from backend.db.repositories.game_repository import PvPGameRepository
+from backend.db.repositories.guess_repository import GuessRepository
+from backend.db.user_cache import user_cache
+from backend.services.game_reaper import GameReaper
+from backend.services.matchmaking import MatchTicket, matchmaking_queue
+
+NOW = datetime(2026, 1, 1, 12, 0)
+# Second player of a game nobody has joined yet
+NOBODY = PlayerState(id=None, name=None, secret="5678", guesses=[], elo=None)  # type: ignore
+
+
+def _player(user: User, secret: str = "1234") -> PlayerState:
+    return PlayerState(id=user.id, name=user.display_name, secret=secret, guesses=[], elo=int(user.elo_rating))
+
+
+async def _users(session, *names) -> list[User]:
+    users = [User(display_name=name, elo_rating=1200) for name in names]
+    session.add_all(users)
+    await session.flush()
+    return users
+
+
+async def test_sweep_closes_stale_games_and_rates_forfeits(session_factory):
+    async with session_factory() as session:
+        repo = PvPGameRepository(session)
+        alice, bob, carol = await _users(session, "Alice", "Bob", "Carol")
+
+        stale_waiting = await repo.create(_player(carol, ""), NOBODY)
+        stale_waiting.created_at = NOW - timedelta(hours=1)
+        fresh_waiting = await repo.create(_player(carol, ""), NOBODY)
+        fresh_waiting.created_at = NOW
+
+        idle = await repo.create(_player(alice), _player(bob))
+        await repo.join_game(idle, _player(alice), _player(bob), current_turn=bob.id)
+        idle_ai = await repo.create_ai_game(_player(alice), _player(RandomAI.user()), "easy", current_turn=alice.id)
+        active = await repo.create_ai_game(_player(bob), _player(RandomAI.user()), "easy", current_turn=bob.id)
+        for game, moved_at in ((idle, NOW - timedelta(hours=1)), (idle_ai, NOW - timedelta(hours=1)), (active, NOW)):
+            game.last_move_at = moved_at
+        await session.commit()
+    matchmaking_queue.add(MatchTicket(game_id=stale_waiting.id, user_id=carol.id, elo=1200, variant=CLASSIC))
+    matchmaking_queue.loaded = True
+
+    reaper = GameReaper(session_factory=session_factory, batch_size=1, archive_after=0)
+    assert await reaper.sweep(NOW) == {"matched": 0, "expired": 1, "forfeited": 2, "archived": 0}
+    assert len(matchmaking_queue) == 0
+
+    async with session_factory() as session:
+        statuses = dict((await session.execute(select(PvPGame.id, PvPGame.status))).all())
+        assert statuses[stale_waiting.id] == "abandoned"
+        assert statuses[fresh_waiting.id] == "waiting"
+        assert statuses[idle.id] == statuses[idle_ai.id] == "abandoned"
+        assert statuses[active.id] == "in_progress"
+
+        game = await session.get(PvPGame, idle.id)
+        assert game.winner_id == alice.id
+        assert (game.player1.elo, game.player2.elo) == (1216, 1184)
+        ratings = dict((await session.execute(select(User.id, User.elo_rating).where(User.id.in_([alice.id, bob.id])))).all())
+        assert ratings == {alice.id: 1216, bob.id: 1184}
+        assert (await session.get(PvPGame, idle_ai.id)).winner_id == RandomAI.user().id
+
+    assert reaper.metrics()["rated"] == 1
+    assert await reaper.sweep(NOW) == {"matched": 0, "expired": 0, "forfeited": 0, "archived": 0}
+
+
+async def test_sweep_archives_finished_games(session_factory):
+    # Enforce foreign keys, as PostgreSQL does, so cascading deletes show up
+    engine = session_factory.kw["bind"].sync_engine
+    event.listen(engine, "connect", lambda connection, _: connection.execute("PRAGMA foreign_keys=ON"))
+
+    async with session_factory() as session:
+        repo = PvPGameRepository(session)
+        alice, bob = await _users(session, "Alice", "Bob")
+        old = await repo.create_ai_game(_player(alice), _player(RandomAI.user()), "easy", current_turn=alice.id)
+        recent = await repo.create_ai_game(_player(bob), _player(RandomAI.user()), "easy", current_turn=bob.id)
+        for game, completed_at in ((old, NOW - timedelta(days=30)), (recent, NOW)):
+            game.status = "completed"
+            game.completed_at = completed_at
+        guesses = [{"guess": "1234", "exact": 4, "wrong_pos": 0}]
+        await GuessRepository(session).add(old.id, alice.id, CLASSIC, guesses)
+        await session.commit()
+
+    reaper = GameReaper(session_factory=session_factory, archive_after=7 * 24 * 3600)
+    assert (await reaper.sweep(NOW))["archived"] == 1
+
+    async with session_factory() as session:
+        assert await session.get(PvPGame, old.id) is None
+        assert await session.get(Game, recent.id) is not None
+        archived = await session.get(ArchivedPvPGame, old.id)
+        assert archived.player1_id == alice.id
+        assert archived.code_length == 4
+        assert archived.status == "completed"
+        assert await session.scalar(select(func.count()).select_from(Guess).where(Guess.game_id == old.id)) == 1
+
+
+async def test_archived_game_is_served_to_its_players_only(client, auth_headers, session_factory):
+    response = await client.post(
+        "/api/games/new", json={"game_mode": "ai", "ai_difficulty": "easy", "player_secret": "1234"}, headers=auth_headers
+    )
+    game_id = response.json()["id"]
+    await client.post(f"/api/games/{game_id}/guess", json={"guess": "5678"}, headers=auth_headers)
+    await client.post(f"/api/games/{game_id}/abandon", headers=auth_headers)
+    async with session_factory() as session:
+        game = await session.get(PvPGame, game_id)
+        game.completed_at = NOW - timedelta(days=30)
+        await session.commit()
+    assert (await GameReaper(session_factory=session_factory, archive_after=3600).sweep(NOW))["archived"] == 1
+
+    response = await client.get(f"/api/games/{game_id}", headers=auth_headers)
+    assert response.status_code == 200
+    game = response.json()
+    assert (game["status"], game["ai_difficulty"], game["opponent_secret"]) == ("abandoned", "easy", "1234")
+    assert game["self_guesses"][-1]["guess"] == "5678"
+
+    other = await client.post("/api/auth/guest", json={"display_name": "Other"})
+    headers = {"Authorization": f"Bearer {other.json()['access_token']}"}
+    assert (await client.get(f"/api/games/{game_id}", headers=headers)).status_code == 404
+
+
+async def test_sweep_matches_waiting_players_once_their_windows_widen(client, session_factory, monkeypatch):
+    players = []
+    for name, elo in (("Low", 1000), ("High", 1400)):
+        response = await client.post("/api/auth/guest", json={"display_name": name})
+        user_id = response.json()["user"]["id"]
+        async with session_factory() as session:
+            (await session.get(User, user_id)).elo_rating = elo
+            await session.commit()
+        players.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+    await user_cache.clear()
+    games = [
+        (await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "1234"}, headers=headers)).json()
+        for headers in players
+    ]
+    assert [game["status"] for game in games] == ["waiting", "waiting"]
+
+    reaper = GameReaper(session_factory=session_factory)
+    assert (await reaper.sweep())["matched"] == 0
+    later = time.monotonic() + 60
+    monkeypatch.setattr("backend.services.matchmaking.time.monotonic", lambda: later)
+    assert (await reaper.sweep())["matched"] == 1
+
+    host = (await client.get(f"/api/games/{games[0]['id']}", headers=players[0])).json()
+    moved = (await client.get(f"/api/games/{games[1]['id']}", headers=players[1])).json()
+    assert host["status"] == moved["status"] == "in_progress"
+    assert moved["id"] == host["id"] == games[0]["id"]
+    assert moved["self_id"] == host["opponent_id"]
+    assert len(matchmaking_queue) == 0
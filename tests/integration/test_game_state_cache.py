@@ -0,0 +1,105 @@
+import pytest
+
+from backend.db.repositories.game_repository import GameRepository, SingleGameRepository
+from backend.db.repositories.guess_repository import GuessRepository
+from backend.services.game_state_cache import game_state_cache
+
+
+async def _stored_guesses(session_factory, game_id: int) -> list:
+    async with session_factory() as session:
+        game = await GameRepository(session).find_by_id(game_id)
+        return game.player.guesses
+
+
+async def _single_game(client, auth_headers) -> int:
+    response = await client.post("/api/games/new", json={"game_mode": "single"}, headers=auth_headers)
+    return response.json()["id"]
+
+
+@pytest.fixture
+def cache_settings():
+    idle_timeout = game_state_cache.idle_timeout
+    yield
+    game_state_cache.idle_timeout = idle_timeout
+
+
+async def test_guesses_are_written_behind(client, auth_headers, session_factory):
+    game_id = await _single_game(client, auth_headers)
+    for guess in ["1111", "2222"]:
+        response = await client.post(f"/api/games/{game_id}/guess", json={"guess": guess}, headers=auth_headers)
+        assert response.status_code == 200
+    assert len(response.json()["self_guesses"]) == 2
+    assert await _stored_guesses(session_factory, game_id) == []
+
+    assert await game_state_cache.flush() == 2
+    assert [guess["guess"] for guess in await _stored_guesses(session_factory, game_id)] == ["1111", "2222"]
+    async with session_factory() as session:
+        assert [guess.turn async for guess in GuessRepository(session).stream(game_id)] == [1, 2]
+    assert await game_state_cache.flush() == 0
+
+
+async def test_winning_guess_finishes_game_in_database(client, auth_headers, session_factory):
+    game_id = await _single_game(client, auth_headers)
+    await client.post(f"/api/games/{game_id}/guess", json={"guess": "1111"}, headers=auth_headers)
+    async with session_factory() as session:
+        secret = (await GameRepository(session).find_by_id(game_id)).player.secret
+
+    response = await client.post(f"/api/games/{game_id}/guess", json={"guess": secret}, headers=auth_headers)
+    assert response.json()["status"] == "completed"
+    assert game_state_cache.get(game_id) is None
+    async with session_factory() as session:
+        game = await GameRepository(session).find_by_id(game_id)
+        assert game.status == "completed"
+        assert [guess["guess"] for guess in game.player.guesses] == ["1111", secret]
+
+
+async def test_conflicting_write_replays_guesses(client, auth_headers, session_factory):
+    game_id = await _single_game(client, auth_headers)
+    await client.post(f"/api/games/{game_id}/guess", json={"guess": "1111"}, headers=auth_headers)
+    async with session_factory() as session:
+        game = await GameRepository(session).find_by_id(game_id)
+        await SingleGameRepository(session).append_guess(game, {"guess": "3333", "exact": 0, "wrong_pos": 0})
+        await session.commit()
+
+    conflicts, replayed = game_state_cache.conflicts, game_state_cache.replayed_guesses
+    assert await game_state_cache.flush() == 1
+    assert game_state_cache.conflicts == conflicts + 1
+    assert game_state_cache.replayed_guesses == replayed + 1
+    assert game_state_cache.get(game_id) is None
+    assert [guess["guess"] for guess in await _stored_guesses(session_factory, game_id)] == ["3333", "1111"]
+
+
+async def test_conflicting_write_on_closed_game_reports_lost_guesses(client, auth_headers, session_factory):
+    game_id = await _single_game(client, auth_headers)
+    await client.post(f"/api/games/{game_id}/guess", json={"guess": "1111"}, headers=auth_headers)
+    async with session_factory() as session:
+        game = await GameRepository(session).find_by_id(game_id)
+        game.status = "abandoned"
+        await session.commit()
+
+    lost = game_state_cache.lost_guesses
+    assert await game_state_cache.flush() == 0
+    assert game_state_cache.lost_guesses == lost + 1
+    assert game_state_cache.get(game_id) is None
+    assert await _stored_guesses(session_factory, game_id) == []
+
+
+async def test_idle_games_are_evicted_after_write_back(client, auth_headers, session_factory, cache_settings):
+    game_id = await _single_game(client, auth_headers)
+    await client.post(f"/api/games/{game_id}/guess", json={"guess": "1111"}, headers=auth_headers)
+
+    game_state_cache.idle_timeout = 0
+    await game_state_cache.tick()
+    assert game_state_cache.get(game_id) is None
+    assert len(await _stored_guesses(session_factory, game_id)) == 1
+
+
+async def test_stop_writes_every_game_back(client, auth_headers, session_factory):
+    game_ids = [await _single_game(client, auth_headers) for _ in range(3)]
+    for game_id in game_ids:
+        await client.post(f"/api/games/{game_id}/guess", json={"guess": "1111"}, headers=auth_headers)
+
+    await game_state_cache.stop()
+    assert game_state_cache.metrics()["size"] == 0
+    for game_id in game_ids:
+        assert len(await _stored_guesses(session_factory, game_id)) == 1
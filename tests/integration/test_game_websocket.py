@@ -0,0 +1,67 @@
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+
+def _guest(client: TestClient, name: str) -> tuple[int, str]:
+    response = client.post("/api/auth/guest", json={"display_name": name})
+    assert response.status_code == 201
+    return response.json()["user"]["id"], response.json()["access_token"]
+
+
+def test_pvp_updates_are_pushed_to_both_players(session_factory):
+    with TestClient(app) as client:
+        alice_id, alice_token = _guest(client, "Alice")
+        bob_id, bob_token = _guest(client, "Bob")
+        created = client.post(
+            "/api/games/new",
+            json={"game_mode": "pvp", "player_secret": "1234"},
+            headers={"Authorization": f"Bearer {alice_token}"},
+        ).json()
+        game_id = created["id"]
+
+        with client.websocket_connect(f"/ws/games/{game_id}?token={alice_token}") as alice_ws:
+            assert alice_ws.receive_json()["status"] == "waiting"
+
+            joined = client.post(
+                "/api/games/new",
+                json={"game_mode": "pvp", "player_secret": "5678"},
+                headers={"Authorization": f"Bearer {bob_token}"},
+            ).json()
+            assert joined["id"] == game_id
+            update = alice_ws.receive_json()
+            assert update["status"] == "in_progress"
+            assert update["self_id"] == alice_id
+            assert update["self_secret"] is None
+
+            with client.websocket_connect(f"/ws/games/{game_id}?token={bob_token}") as bob_ws:
+                assert bob_ws.receive_json()["self_id"] == bob_id
+
+                mover_token = alice_token if update["current_turn"] == alice_id else bob_token
+                response = client.post(
+                    f"/api/games/{game_id}/guess",
+                    json={"guess": "0000"},
+                    headers={"Authorization": f"Bearer {mover_token}"},
+                )
+                assert response.status_code == 200
+                alice_update, bob_update = alice_ws.receive_json(), bob_ws.receive_json()
+                assert alice_update["current_turn"] == bob_update["current_turn"] != update["current_turn"]
+                assert alice_update["self_id"] == alice_id and bob_update["self_id"] == bob_id
+
+
+def test_websocket_rejects_invalid_token(session_factory):
+    with TestClient(app) as client:
+        _, token = _guest(client, "Carol")
+        game_id = client.post(
+            "/api/games/new", json={"game_mode": "single"}, headers={"Authorization": f"Bearer {token}"}
+        ).json()["id"]
+
+        with client.websocket_connect(f"/ws/games/{game_id}?token={token}") as websocket:
+            assert websocket.receive_json()["id"] == game_id
+
+        with pytest.raises(WebSocketDisconnect) as refused:
+            with client.websocket_connect(f"/ws/games/{game_id}?token=not-a-token"):
+                pass
+        assert refused.value.code == 1008
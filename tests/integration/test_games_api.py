@@ -14,46 +14,150 @@ async def test_health_check():
 
 @pytest.mark.asyncio
 async def test_root():
-    """Test the root endpoint"""
+    """Test the root endpoint redirects to the game"""
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         response = await ac.get("/")
-    assert response.status_code == 200
-    data = response.json()
-    assert "message" in data
-    assert data["version"] == "2.0.0"
+    assert response.status_code == 307
+    assert response.headers["location"] == "/game"
 
 
 @pytest.mark.asyncio
-async def test_create_game():
+async def test_create_game(client, auth_headers):
     """Test creating a new game"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        response = await ac.post("/api/games/single", json={"game_mode": "single"})
+    response = await client.post("/api/games/new", json={"game_mode": "single"}, headers=auth_headers)
     assert response.status_code == 201
     data = response.json()
     assert "id" in data
     assert data["game_mode"] == "single"
-    assert data["attempts"] == 0
-    assert data["won"] is False
+    assert data["status"] == "in_progress"
+    assert data["self_guesses"] == []
+    assert data["self_secret"] is None
 
 
 @pytest.mark.asyncio
-async def test_make_guess():
+async def test_make_guess(client, auth_headers):
     """Test making a guess"""
-    # Create a game first
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        create_response = await ac.post("/api/games/single", json={"game_mode": "single"})
-
+    create_response = await client.post("/api/games/new", json={"game_mode": "single"}, headers=auth_headers)
     game_id = create_response.json()["id"]
 
-    # Make a guess in a new client context
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        guess_response = await ac.post(
-            f"/api/games/{game_id}/guess",
-            json={"guess": "1234"}
-        )
+    guess_response = await client.post(f"/api/games/{game_id}/guess", json={"guess": "1234"}, headers=auth_headers)
 
     assert guess_response.status_code == 200
     data = guess_response.json()
-    assert "exact" in data
-    assert "wrong_pos" in data
-    assert data["attempts"] == 1
+    assert len(data["self_guesses"]) == 1
+    assert data["self_guesses"][0]["guess"] == "1234"
+    assert "exact" in data["self_guesses"][0]
+    assert "wrong_pos" in data["self_guesses"][0]
+
+
+@pytest.mark.asyncio
+async def test_create_game_with_variant(client, auth_headers):
+    """Test creating a game with a longer code and a larger alphabet"""
+    response = await client.post(
+        "/api/games/new",
+        json={"game_mode": "ai", "ai_difficulty": "hard", "player_secret": "A1B20", "code_length": 5, "num_symbols": 12},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["code_length"] == 5
+    assert data["num_symbols"] == 12
+
+    short_guess = await client.post(f"/api/games/{data['id']}/guess", json={"guess": "1234"}, headers=auth_headers)
+    assert short_guess.status_code == 400
+
+    guess = await client.post(f"/api/games/{data['id']}/guess", json={"guess": "AB012"}, headers=auth_headers)
+    assert guess.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_create_game_rejects_secret_outside_variant(client, auth_headers):
+    """Test a secret must use the variant's length and symbols"""
+    response = await client.post(
+        "/api/games/new",
+        json={"game_mode": "ai", "ai_difficulty": "hard", "player_secret": "9999", "num_symbols": 8},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_pvp_matchmaking_pairs_waiting_player(client):
+    """Test a second PvP player joins the first player's waiting game"""
+    tokens = []
+    for name in ("First", "Second"):
+        response = await client.post("/api/auth/guest", json={"display_name": name})
+        tokens.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+
+    waiting = await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "1234"}, headers=tokens[0])
+    assert waiting.json()["status"] == "waiting"
+
+    joined = await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "5678"}, headers=tokens[1])
+    assert joined.status_code == 201
+    assert joined.json()["id"] == waiting.json()["id"]
+    assert joined.json()["status"] == "in_progress"
+
+    third = await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "0000"}, headers=tokens[0])
+    assert third.json()["status"] == "waiting"
+    assert third.json()["id"] != waiting.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_db_pool_metrics(client):
+    """Test the connection pool metrics endpoint"""
+    response = await client.get("/api/metrics/db-pool")
+    assert response.status_code == 200
+    data = response.json()
+    for key in ("checked_out", "overflow", "checkouts", "timeouts", "wait_ms_mean", "wait_ms_max"):
+        assert key in data
+
+
+@pytest.mark.asyncio
+async def test_user_cache_serves_repeat_requests_and_tracks_elo(client):
+    """Test authenticated users come from the cache and Elo changes are not served stale"""
+    players = []
+    for name in ("Winner", "Quitter"):
+        response = await client.post("/api/auth/guest", json={"display_name": name})
+        players.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+
+    before = (await client.get("/api/metrics/user-cache")).json()
+    for _ in range(3):
+        assert (await client.get("/api/auth/me", headers=players[0])).json()["elo_rating"] == 1200
+    after = (await client.get("/api/metrics/user-cache")).json()
+    assert after["hits"] - before["hits"] >= 2
+
+    await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "1234"}, headers=players[0])
+    game = await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "5678"}, headers=players[1])
+    abandoned = await client.post(f"/api/games/{game.json()['id']}/abandon", headers=players[1])
+    assert abandoned.status_code == 200
+
+    assert (await client.get("/api/auth/me", headers=players[0])).json()["elo_rating"] > 1200
+    assert (await client.get("/api/auth/me", headers=players[1])).json()["elo_rating"] < 1200
+
+
+@pytest.mark.asyncio
+async def test_logout_abandons_every_active_game(client):
+    """Test logging out abandons all of the user's games at once and rates the opponents"""
+    quitter = await client.post("/api/auth/guest", json={"display_name": "Quitter"})
+    quitter = {"Authorization": f"Bearer {quitter.json()['access_token']}"}
+    opponents, game_ids = [], []
+    for n in range(3):
+        await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "1234"}, headers=quitter)
+        response = await client.post("/api/auth/guest", json={"display_name": f"Opponent {n}"})
+        opponents.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+        game = await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "5678"}, headers=opponents[-1])
+        game_ids.append(game.json()["id"])
+    ai_game = await client.post(
+        "/api/games/new", json={"game_mode": "ai", "ai_difficulty": "easy", "player_secret": "1234"}, headers=quitter
+    )
+
+    response = await client.post("/api/auth/logout", headers=quitter)
+    assert response.status_code == 200
+    assert response.json()["abandoned_games"] == sorted([*game_ids, ai_game.json()["id"]])
+
+    for game_id, headers in zip(game_ids, opponents):
+        game = (await client.get(f"/api/games/{game_id}", headers=headers)).json()
+        assert game["status"] == "abandoned"
+        assert game["winner_id"] == game["self_id"]
+        assert (await client.get("/api/auth/me", headers=headers)).json()["elo_rating"] > 1200
+    assert (await client.get("/api/auth/me", headers=quitter)).json()["elo_rating"] < 1200
@@ -0,0 +1,53 @@
+import pytest
+
+from backend.db.models.game import PlayerState
+from backend.db.repositories.game_repository import GameRepository, PvPGameRepository, SingleGameRepository
+
+GUESS = {"guess": "1111", "exact": 0, "wrong_pos": 0}
+
+
+def _player(player_id: int | None, secret: str) -> PlayerState:
+    return PlayerState(id=player_id, name=f"player{player_id}", secret=secret, guesses=[], elo=1200)  # type: ignore
+
+
+async def test_concurrent_single_guess_is_rejected(session_factory):
+    async with session_factory() as session:
+        game = await SingleGameRepository(session).create(_player(0, "1234"))
+        await session.commit()
+
+    async with session_factory() as first, session_factory() as second:
+        first_game = await GameRepository(first).find_by_id(game.id)
+        second_game = await GameRepository(second).find_by_id(game.id)
+
+        await SingleGameRepository(first).append_guess(first_game, GUESS)
+        await first.commit()
+        with pytest.raises(ValueError):
+            await SingleGameRepository(second).append_guess(second_game, GUESS)
+
+    async with session_factory() as session:
+        game = await GameRepository(session).find_by_id(game.id)
+        assert game.player.guesses == [GUESS]
+
+
+async def test_pvp_append_passes_turn_and_finishes_game(session_factory):
+    async with session_factory() as session:
+        repo = PvPGameRepository(session)
+        game = await repo.create_ai_game(_player(0, "1234"), _player(1, "5678"), "easy", current_turn=0)
+
+        game = await repo.append_guess(game, "player1", GUESS, expected_turn=0)
+        assert game.current_turn == 1
+        assert game.player1.guesses == [GUESS]
+        with pytest.raises(ValueError):
+            await repo.append_guess(game, "player1", GUESS, expected_turn=0)
+
+        winning = {"guess": "1234", "exact": 4, "wrong_pos": 0}
+        game = await repo.append_guess(game, "player2", winning, winner_id=1, ai_state={"applied": 1})
+        await session.commit()
+
+    async with session_factory() as session:
+        game = await GameRepository(session).find_by_id(game.id)
+        assert game.status == "completed"
+        assert game.winner_id == 1
+        assert game.ai_state == {"applied": 1}
+        assert game.player2.guesses == [winning]
+        assert game.current_turn == 1
@@ -0,0 +1,43 @@
+from backend.core.game_engine import GuessRecord, Variant
+from backend.db.repositories.game_repository import GameRepository
+from backend.db.repositories.guess_repository import GuessRepository
+from backend.services.game_state_cache import game_state_cache
+
+
+async def test_guesses_are_written_alongside_json(client, auth_headers, session_factory):
+    response = await client.post(
+        "/api/games/new",
+        json={"game_mode": "ai", "ai_difficulty": "easy", "player_secret": "A1B20", "code_length": 5, "num_symbols": 12},
+        headers=auth_headers,
+    )
+    game_id = response.json()["id"]
+    response = await client.post(f"/api/games/{game_id}/guess", json={"guess": "0AB19"}, headers=auth_headers)
+    assert response.status_code == 200
+    response = await client.post(f"/api/games/{game_id}/opponent_guess", headers=auth_headers)
+    assert response.status_code == 200
+
+    await game_state_cache.flush()
+
+    variant = Variant(5, 12)
+    async with session_factory() as session:
+        game = await GameRepository(session).find_by_id(game_id)
+        guesses = GuessRepository(session)
+        for player in (game.player1, game.player2):
+            assert player.guesses
+            history = await guesses.history(game_id, player.id, variant)
+            assert history == [GuessRecord(**guess) for guess in player.guesses]
+
+
+async def test_insert_many_skips_existing_rows(session_factory):
+    rows = [
+        {"game_id": 1, "player_id": 1, "turn": turn, "code": turn, "feedback": 0}
+        for turn in range(1, 6)
+    ]
+    async with session_factory() as session:
+        guesses = GuessRepository(session)
+        await guesses.insert_many(rows[:3], batch_size=2)
+        await guesses.insert_many(rows, batch_size=2, skip_existing=True)
+        await session.commit()
+
+        history = [guess.turn async for guess in guesses.stream(1)]
+        assert history == [1, 2, 3, 4, 5]
@@ -0,0 +1,43 @@
+from backend.services.leaderboard import leaderboard
+
+
+async def _guest(client, name: str) -> tuple[int, dict]:
+    response = await client.post("/api/auth/guest", json={"display_name": name})
+    return response.json()["user"]["id"], {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def test_leaderboard_ranks_players_and_follows_rating_changes(client):
+    winner_id, winner = await _guest(client, "Winner")
+    board = (await client.get("/api/leaderboard")).json()
+    assert board["total"] == 1 and board["entries"][0]["user_id"] == winner_id
+    loads = leaderboard.loads
+
+    # Joins and ratings from here on are applied without reloading
+    quitter_id, quitter = await _guest(client, "Quitter")
+    bystander_id, _ = await _guest(client, "Bystander")
+    board = (await client.get("/api/leaderboard")).json()
+    assert [entry["rank"] for entry in board["entries"]] == [1, 1, 1]
+
+    await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "1234"}, headers=winner)
+    game = await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "5678"}, headers=quitter)
+    await client.post(f"/api/games/{game.json()['id']}/abandon", headers=quitter)
+
+    board = (await client.get("/api/leaderboard")).json()
+    assert [(entry["user_id"], entry["rank"], entry["elo_rating"]) for entry in board["entries"]] == [
+        (winner_id, 1, 1216),
+        (bystander_id, 2, 1200),
+        (quitter_id, 3, 1184),
+    ]
+    page = (await client.get("/api/leaderboard", params={"offset": 1, "limit": 1})).json()
+    assert [entry["user_id"] for entry in page["entries"]] == [bystander_id]
+
+    rank = (await client.get(f"/api/users/{quitter_id}/rank")).json()
+    assert (rank["rank"], rank["total"], rank["display_name"]) == (3, 3, "Quitter")
+    assert leaderboard.loads == loads
+
+
+async def test_ai_players_are_not_ranked(client):
+    _, player = await _guest(client, "Player")
+    await client.post("/api/games/new", json={"game_mode": "ai", "ai_difficulty": "easy", "player_secret": "1234"}, headers=player)
+    assert (await client.get("/api/users/0/rank")).status_code == 404
+    assert (await client.get("/api/leaderboard")).json()["total"] == 1
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from backend.db.models.game import PlayerState, PvPGame
+from backend.db.models.rating_history import RatingHistory
+from backend.db.models.user import User
+from backend.db.repositories.game_repository import PvPGameRepository
+from backend.db.repositories.user_repository import UserRepository
+from backend.services.rating_service import RatingService
+
+
+def _player(user: User) -> PlayerState:
+    return PlayerState(id=user.id, name=user.display_name, secret="1234", guesses=[], elo=round(user.elo_rating))
+
+
+async def _finished_game(session, winner: User, loser: User, completed_at: datetime) -> PvPGame:
+    game = await PvPGameRepository(session).create(_player(winner), _player(loser))
+    game.status, game.winner_id, game.completed_at = "completed", winner.id, completed_at
+    await session.flush()
+    return game
+
+
+async def test_rate_games_updates_users_games_and_history(session_factory):
+    async with session_factory() as session:
+        alice, bob = User(display_name="Alice", elo_rating=1200), User(display_name="Bob", elo_rating=1300)
+        session.add_all([alice, bob])
+        await session.flush()
+        start = datetime(2026, 1, 1)
+        games = [await _finished_game(session, alice, bob, start + timedelta(minutes=i)) for i in range(3)]
+
+        await RatingService(session).rate_games(games)
+        await session.commit()
+
+    async with session_factory() as session:
+        ratings = await UserRepository(session).get_ratings([alice.id, bob.id])
+        assert ratings[alice.id] > 1240 and ratings[alice.id] + ratings[bob.id] == 2500
+        history = (await session.execute(select(RatingHistory).order_by(RatingHistory.id))).scalars().all()
+        assert [row.game_id for row in history] == [games[0].id] * 2 + [games[1].id] * 2 + [games[2].id] * 2
+        assert history[0].rating_after == history[2].rating_before
+        assert history[-2].rating_after == ratings[alice.id]
+        game = await session.get(PvPGame, games[0].id)
+        assert (game.player1.elo, game.player2.elo) == (1220, 1280)
+
+
+async def test_recompute_replays_games_in_order(session_factory):
+    async with session_factory() as session:
+        alice, bob, carol = (User(display_name=name, elo_rating=1200) for name in ("Alice", "Bob", "Carol"))
+        session.add_all([alice, bob, carol])
+        await session.flush()
+        start = datetime(2026, 1, 1)
+        # Created out of order: the replay follows completed_at
+        await _finished_game(session, bob, carol, start + timedelta(minutes=2))
+        await _finished_game(session, alice, bob, start + timedelta(minutes=1))
+        await session.commit()
+
+        service = RatingService(session)
+        assert await service.recompute() == 2
+        await session.commit()
+        ratings = await UserRepository(session).get_ratings([alice.id, bob.id, carol.id])
+        assert ratings[alice.id] == 1216
+        assert ratings[carol.id] < 1200 < ratings[bob.id] < ratings[alice.id]
+
+        await UserRepository(session).set_ratings({alice.id: 900})
+        assert await service.recompute() == 2
+        await session.commit()
+        assert (await UserRepository(session).get_ratings([alice.id]))[alice.id] == 1216
+        reasons = (await session.execute(select(RatingHistory.reason))).scalars().all()
+        assert set(reasons) == {"recompute"}
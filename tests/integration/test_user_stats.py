@@ -0,0 +1,49 @@
+from sqlalchemy import select
+
+from backend.db.models.game import SingleGame
+from backend.services.stats_service import StatsService
+
+
+async def _guest(client, name: str) -> tuple[int, dict]:
+    response = await client.post("/api/auth/guest", json={"display_name": name})
+    return response.json()["user"]["id"], {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def test_stats_roll_up_finished_games(client, session_factory):
+    player_id, player = await _guest(client, "Player")
+    opponent_id, opponent = await _guest(client, "Opponent")
+
+    game = (await client.post("/api/games/new", json={"game_mode": "single"}, headers=player)).json()
+    async with session_factory() as session:
+        secret = (await session.execute(select(SingleGame._p_secret).where(SingleGame.id == game["id"]))).scalar_one()
+    wrong = next(code for code in ("0123", "4567") if code != secret)
+    await client.post(f"/api/games/{game['id']}/guess", json={"guess": wrong}, headers=player)
+    solved = await client.post(f"/api/games/{game['id']}/guess", json={"guess": secret}, headers=player)
+    assert solved.json()["status"] == "completed"
+
+    await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "1234"}, headers=opponent)
+    pvp = (await client.post("/api/games/new", json={"game_mode": "pvp", "player_secret": "5678"}, headers=player)).json()
+    await client.post(f"/api/games/{pvp['id']}/abandon", headers=player)
+    await client.post("/api/games/new", json={"game_mode": "ai", "ai_difficulty": "easy", "player_secret": "1234"}, headers=player)
+    await client.post("/api/auth/logout", headers=player)
+
+    stats = (await client.get(f"/api/users/{player_id}/stats")).json()
+    assert (stats["games"], stats["wins"], stats["losses"]) == (3, 1, 2)
+    kinds = {kind["kind"]: kind for kind in stats["kinds"]}
+    assert set(kinds) == {"single", "pvp", "ai_easy"}
+    single = kinds["single"]
+    assert (single["solved"], single["win_rate"], single["average_guesses"]) == (1, 1.0, 2.0)
+    assert single["solve_times"]["30s"] == 1 and sum(single["solve_times"].values()) == 1
+    assert kinds["pvp"]["losses"] == kinds["ai_easy"]["losses"] == 1
+
+    opponent_stats = (await client.get(f"/api/users/{opponent_id}/stats")).json()
+    assert opponent_stats["kinds"][0]["wins"] == 1 and opponent_stats["kinds"][0]["solved"] == 0
+    # AI players get no stats
+    assert (await client.get("/api/users/0/stats")).json()["games"] == 0
+
+    async with session_factory() as session:
+        await StatsService(session).rebuild(0, player_id - 1)
+        await StatsService(session).rebuild(player_id, opponent_id)
+        await session.commit()
+    assert (await client.get(f"/api/users/{player_id}/stats")).json() == stats
+    assert (await client.get(f"/api/users/{opponent_id}/stats")).json() == opponent_stats
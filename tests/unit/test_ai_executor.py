@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.core.game_engine import MasterMindGame
+from backend.services import ai_executor as ai_executor_module
+from backend.services.ai_executor import AIExecutor, AIExecutorBusyError, AIMoveTimeoutError
+
+
+def _slow_move(*args):
+    time.sleep(0.3)
+    return "1234", None
+
+
+async def test_compute_move_in_process_pool():
+    executor = AIExecutor(mode="process", max_workers=1, max_pending=2, timeout=30.0)
+    try:
+        guess, state = await executor.compute_move("hard", "5678", [{"guess": "1234", "exact": 0, "wrong_pos": 0}])
+    finally:
+        executor.shutdown()
+
+    assert state is not None and state["applied"] == 2
+    assert MasterMindGame(player_secret=guess).evaluate_guess("1234") == (0, 0)
+
+
+async def test_full_queue_rejects_and_timeout_keeps_slot(monkeypatch):
+    monkeypatch.setattr(ai_executor_module, "compute_ai_move", _slow_move)
+    executor = AIExecutor(mode="thread", max_workers=1, max_pending=1, timeout=0.05)
+    try:
+        with pytest.raises(AIMoveTimeoutError):
+            await executor.compute_move("easy", "1234", [])
+        # The timed-out move is still running, so the only slot is taken
+        with pytest.raises(AIExecutorBusyError):
+            await executor.compute_move("easy", "1234", [])
+
+        await asyncio.sleep(0.4)
+        executor.timeout = 5.0
+        assert await executor.compute_move("easy", "1234", []) == ("1234", None)
+    finally:
+        executor.shutdown()
+
+
+async def test_non_positive_max_pending_is_unbounded(monkeypatch):
+    monkeypatch.setattr(ai_executor_module, "compute_ai_move", _slow_move)
+    executor = AIExecutor(mode="thread", max_workers=2, max_pending=0, timeout=5.0)
+    try:
+        moves = [executor.compute_move("easy", "1234", []) for _ in range(3)]
+        assert await asyncio.gather(*moves) == [("1234", None)] * 3
+    finally:
+        executor.shutdown()
@@ -0,0 +1,51 @@
+import itertools
+from collections import Counter
+
+from backend.core.ai import AradzBot
+from backend.core.feedback_table import FeedbackTable, get_feedback_table
+from backend.core.game_engine import MasterMindGame
+
+
+def _reference_score(secret: str, guess: str) -> tuple[int, int]:
+    exact = sum(s == g for s, g in zip(secret, guess))
+    total = sum((Counter(secret) & Counter(guess)).values())
+    return exact, total - exact
+
+
+def test_row_matches_reference():
+    table = get_feedback_table()
+    for guess in ("0000", "1122", "1234", "9090"):
+        row = table.row(table.encode(guess))
+        for secret in ("0000", "0012", "1122", "2211", "4321", "9999"):
+            assert table.unpack(row[table.encode(secret)]) == _reference_score(secret, guess)
+
+
+def test_full_build_matches_reference():
+    table = FeedbackTable(num_digits=3, num_symbols=4)
+    matrix = table.build()
+    codes = ["".join(c) for c in itertools.product("0123", repeat=3)]
+    for guess, secret in itertools.product(codes, codes):
+        assert table.unpack(matrix[table.encode(guess), table.encode(secret)]) == _reference_score(secret, guess)
+        assert table.score(secret, guess) == _reference_score(secret, guess)
+    assert table.row(5) is not None and (table.row(5) == matrix[5]).all()
+
+
+def test_aradz_bot_guess_is_consistent():
+    game = MasterMindGame(player_secret="5183")
+    game.make_guess("1234")
+    game.make_guess("5678")
+    guess = AradzBot(game).get_next_guess()
+
+    candidate = MasterMindGame(player_secret=guess)
+    for record in game.history:
+        assert candidate.evaluate_guess(record.guess) == (record.exact, record.wrong_pos)
+
+
+def test_single_pairs_do_not_build_rows():
+    for num_digits, num_symbols in ((4, 10), (6, 10), (5, 12)):
+        table = FeedbackTable(num_digits=num_digits, num_symbols=num_symbols)
+        codes = [table.decode(index) for index in range(0, table.size, table.size // 15)]
+        for secret, guess in itertools.product(codes, codes):
+            assert table.score(secret, guess) == _reference_score(secret, guess)
+            assert table.unpack(table.lookup(table.encode(secret), table.encode(guess))) == _reference_score(secret, guess)
+        assert table.row.cache_info().currsize == 0
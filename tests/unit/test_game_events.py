@@ -0,0 +1,20 @@
+from backend.services.game_events import SUBSCRIBER_QUEUE_SIZE, InMemoryBroker
+
+
+async def test_in_memory_broker_fans_out_per_game():
+    broker = InMemoryBroker()
+    async with broker.subscribe(1) as first, broker.subscribe(1) as second, broker.subscribe(2) as other:
+        await broker.publish(1, {"game_id": 1})
+        assert first.get_nowait() == {"game_id": 1}
+        assert second.get_nowait() == {"game_id": 1}
+        assert other.empty()
+    assert broker._subscribers == {}
+
+
+async def test_slow_subscriber_keeps_latest_updates():
+    broker = InMemoryBroker()
+    async with broker.subscribe(1) as updates:
+        for turn in range(SUBSCRIBER_QUEUE_SIZE + 3):
+            await broker.publish(1, {"turn": turn})
+        assert updates.qsize() == SUBSCRIBER_QUEUE_SIZE
+        assert updates.get_nowait() == {"turn": 3}
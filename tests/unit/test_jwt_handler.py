@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+
+from backend.core import jwt_handler
+from backend.core.jwt_handler import TokenCache, create_access_token, token_cache, verify_token
+
+
+@pytest.fixture(autouse=True)
+def fresh_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.mark.parametrize("backend", ["jose", "hmac"])
+def test_backends_read_each_others_tokens(monkeypatch, backend):
+    monkeypatch.setattr(jwt_handler, "JWT_BACKEND", backend)
+    token = create_access_token(42)
+    for reader in ("jose", "hmac"):
+        token_cache.clear()
+        monkeypatch.setattr(jwt_handler, "JWT_BACKEND", reader)
+        assert verify_token(token) == 42
+
+
+@pytest.mark.parametrize("backend", ["jose", "hmac"])
+def test_rejects_expired_and_tampered_tokens(monkeypatch, backend):
+    monkeypatch.setattr(jwt_handler, "JWT_BACKEND", backend)
+    assert verify_token(create_access_token(1, timedelta(seconds=-1))) is None
+
+    header, payload, signature = create_access_token(1).split(".")
+    assert verify_token(f"{header}.{payload}.{signature[::-1]}") is None
+    assert verify_token("not-a-token") is None
+
+
+def test_verified_tokens_are_cached_until_exp(monkeypatch):
+    token = create_access_token(7)
+    assert verify_token(token) == 7
+    assert verify_token(token) == 7
+    assert token_cache.hits == 1
+
+    now = jwt_handler.time.time()
+    monkeypatch.setattr(jwt_handler.time, "time", lambda: now + timedelta(days=8).total_seconds())
+    assert token_cache.get(TokenCache.key(token)) is None
+    assert len(token_cache) == 0
+
+
+def test_token_cache_is_bounded():
+    cache = TokenCache(max_size=2)
+    for user_id in range(3):
+        cache.set(TokenCache.key(str(user_id)), user_id, float("inf"))
+    assert len(cache) == 2
+    assert cache.get(TokenCache.key("0")) is None
+    assert cache.get(TokenCache.key("2")) == 2
@@ -0,0 +1,27 @@
+from backend.core.ai import KnuthAI, get_ai_player
+from backend.core.game_engine import MasterMindGame
+
+
+def test_hard_difficulty_is_knuth():
+    assert isinstance(get_ai_player("hard", MasterMindGame()), KnuthAI)
+
+
+def test_solves_with_consistent_history():
+    game = MasterMindGame(player_secret="3141")
+    game.make_guess("1234")
+    ai = KnuthAI(game, time_budget=30.0)
+    for _ in range(8):
+        _, _, is_winner = game.make_guess(ai.get_next_guess())
+        if is_winner:
+            break
+    assert game.history[-1].guess == "3141"
+
+
+def test_budget_exhausted_falls_back_to_consistent_candidate():
+    game = MasterMindGame(player_secret="9876")
+    game.make_guess("1234")
+    ai = KnuthAI(game, time_budget=-1.0)
+    assert ai.best_partition_guess(ai.solver_state.candidates, deadline=0.0) is None
+
+    guess = ai.get_next_guess()
+    assert ai.feedback_table.encode(guess) in ai.solver_state.candidates
@@ -1,3 +1,5 @@
+import numpy as np
+
 from backend.core.game_engine import MasterMindGame
 
 
@@ -38,3 +40,27 @@ def test_validation():
     assert not game.validate_guess("12345"), "Too long"
     assert not game.validate_guess("12a4"), "Letters not allowed"
     assert not game.validate_guess(""), "Empty string invalid"
+
+
+def test_batch_evaluation_matches_evaluate_guess():
+    game = MasterMindGame(player_secret="1122")
+    codes = np.arange(10000)
+
+    exact, wrong = game.evaluate_guesses(codes)
+    for code in (1111, 2211, 1212, 1234, 2, 9999):
+        assert (exact[code], wrong[code]) == game.evaluate_guess(str(code).zfill(4))
+    assert (exact[1111], wrong[1111]) == (2, 0)
+    assert (exact[2211], wrong[2211]) == (0, 4)
+
+    exact, wrong = game.evaluate_secrets(codes, "1122")
+    for code in (1111, 2211, 1212, 1234, 2, 9999):
+        assert (exact[code], wrong[code]) == MasterMindGame(player_secret=str(code).zfill(4)).evaluate_guess("1122")
+
+
+def test_score_codes_elementwise():
+    table = MasterMindGame().feedback_table
+    secrets = table.encode_many(["1234", "1122", "0000"])
+    guesses = table.encode_many(["4321", "2211", "0001"])
+    exact, wrong = table.score_codes(secrets, guesses)
+    assert exact.tolist() == [0, 0, 3]
+    assert wrong.tolist() == [4, 4, 0]
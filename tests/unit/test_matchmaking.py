@@ -0,0 +1,70 @@
+from backend.core.game_engine import CLASSIC, Variant
+from backend.services.matchmaking import (
+    MATCHMAKING_ELO_WINDOW,
+    MATCHMAKING_MAX_WINDOW,
+    MATCHMAKING_WINDOW_GROWTH,
+    MatchmakingQueue,
+    MatchTicket,
+)
+
+
+def _queue(*tickets: MatchTicket) -> MatchmakingQueue:
+    queue = MatchmakingQueue()
+    for ticket in tickets:
+        queue.add(ticket)
+    return queue
+
+
+def test_pairs_with_closest_rating_in_window():
+    queue = _queue(
+        MatchTicket(game_id=1, user_id=10, elo=1000, variant=CLASSIC, enqueued_at=0),
+        MatchTicket(game_id=2, user_id=11, elo=1100, variant=CLASSIC, enqueued_at=0),
+        MatchTicket(game_id=3, user_id=12, elo=1300, variant=CLASSIC, enqueued_at=0),
+    )
+    assert queue.pop_match(user_id=20, elo=1080, variant=CLASSIC, now=0).game_id == 2
+    assert queue.pop_match(user_id=21, elo=1080, variant=CLASSIC, now=0).game_id == 1
+    assert queue.pop_match(user_id=22, elo=1080, variant=CLASSIC, now=0) is None
+    assert len(queue) == 1
+
+
+def test_window_widens_while_waiting():
+    gap = MATCHMAKING_ELO_WINDOW + 2 * MATCHMAKING_WINDOW_GROWTH
+    queue = _queue(MatchTicket(game_id=1, user_id=10, elo=1000, variant=CLASSIC, enqueued_at=0))
+    assert queue.pop_match(user_id=20, elo=1000 + gap, variant=CLASSIC, now=1) is None
+    assert queue.pop_match(user_id=20, elo=1000 + gap, variant=CLASSIC, now=2).game_id == 1
+
+    queue.add(MatchTicket(game_id=2, user_id=10, elo=1000, variant=CLASSIC, enqueued_at=0))
+    assert queue.pop_match(user_id=20, elo=1001 + MATCHMAKING_MAX_WINDOW, variant=CLASSIC, now=10**6) is None
+
+
+def test_skips_own_ticket_and_other_variants():
+    queue = _queue(
+        MatchTicket(game_id=1, user_id=10, elo=1000, variant=CLASSIC, enqueued_at=0),
+        MatchTicket(game_id=2, user_id=11, elo=1000, variant=Variant(5, 8), enqueued_at=0),
+    )
+    assert queue.pop_match(user_id=10, elo=1000, variant=CLASSIC, now=0) is None
+    assert queue.pop_match(user_id=20, elo=1000, variant=Variant(5, 8), now=0).game_id == 2
+
+
+def test_player_keeps_only_latest_ticket():
+    queue = _queue(
+        MatchTicket(game_id=1, user_id=10, elo=1000, variant=CLASSIC, enqueued_at=0),
+        MatchTicket(game_id=2, user_id=10, elo=1000, variant=CLASSIC, enqueued_at=0),
+    )
+    assert len(queue) == 1
+    assert queue.pop_match(user_id=20, elo=1000, variant=CLASSIC, now=0).game_id == 2
+
+
+def test_waiting_tickets_pair_once_their_windows_widen(monkeypatch):
+    gap = MATCHMAKING_ELO_WINDOW + 4 * MATCHMAKING_WINDOW_GROWTH
+    queue = _queue(
+        MatchTicket(game_id=1, user_id=10, elo=1000, variant=CLASSIC, enqueued_at=0),
+        MatchTicket(game_id=2, user_id=11, elo=1000 + gap, variant=CLASSIC, enqueued_at=1),
+        MatchTicket(game_id=3, user_id=12, elo=1000, variant=Variant(5, 8), enqueued_at=0),
+    )
+    clock = iter([2.0, 4.0])
+    monkeypatch.setattr("backend.services.matchmaking.time.monotonic", lambda: next(clock))
+    assert queue.pop_pairs() == []
+    ((host, guest),) = queue.pop_pairs()
+    assert (host.game_id, guest.game_id) == (1, 2)
+    assert len(queue) == 1
@@ -0,0 +1,49 @@
+import numpy as np
+
+from backend.core.ai import KnuthAI, get_ai_player
+from backend.core.ai.knuth_ai import best_partition_guess
+from backend.core.ai.opening_book import OpeningBook, build_opening_book, get_opening_book
+from backend.core.ai.solver_state import SolverState
+from backend.core.feedback_table import FeedbackTable
+from backend.core.game_engine import GuessRecord, MasterMindGame
+
+
+def _worst_case(table: FeedbackTable, guess: int, candidates: np.ndarray) -> int:
+    return int(np.bincount(table.row(guess)[candidates]).max())
+
+
+def test_book_moves_are_optimal_for_non_canonical_histories(tmp_path):
+    table = FeedbackTable(num_digits=3, num_symbols=5)
+    path = tmp_path / "book.bin"
+    build_opening_book(max_depth=2, feedback_table=table).save(path)
+    book = OpeningBook.load(path)
+    assert book.max_depth == 2 and len(book) > 0
+
+    for secret, first_guess in (("421", "344"), ("000", "213"), ("314", "440")):
+        history = [GuessRecord(first_guess, *table.unpack(table.lookup(table.encode(secret), table.encode(first_guess))))]
+        for _ in range(2):
+            state = SolverState.initial(table)
+            state.update(table, history)
+            if len(state.candidates) <= 2:
+                break
+            move = book.lookup(history)
+            assert move is not None
+            optimal = best_partition_guess(table, state.candidates)
+            assert _worst_case(table, table.encode(move), state.candidates) == _worst_case(table, optimal, state.candidates)
+            history.append(GuessRecord(move, *table.unpack(table.lookup(table.encode(secret), table.encode(move)))))
+
+
+def test_bundled_book_covers_free_guess():
+    game = MasterMindGame(player_secret="2468")
+    game.make_guess("7371")
+    assert get_opening_book().lookup(game.history) is not None
+
+
+def test_hardest_ai_plays_from_the_book():
+    game = MasterMindGame(player_secret="2468")
+    game.make_guess("7371")
+    ai = get_ai_player("hard", game)
+    assert isinstance(ai, KnuthAI)
+    # Without the book, an exhausted budget falls back to a random candidate
+    ai.time_budget = -1.0
+    assert ai.get_next_guess() == get_opening_book().lookup(game.history)
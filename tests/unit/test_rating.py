@@ -0,0 +1,48 @@
+import random
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+from backend.core.rating import elo_points, replay, schedule_rounds
+from backend.db.repositories.user_repository import ratings_update
+
+
+def _replay_one_by_one(ratings, winners, losers):
+    ratings = list(ratings)
+    points = []
+    for winner, loser in zip(winners, losers):
+        points.append(elo_points(ratings[winner], ratings[loser]))
+        ratings[winner] += points[-1]
+        ratings[loser] -= points[-1]
+    return ratings, points
+
+
+def test_elo_points_are_not_truncated():
+    assert elo_points(1200, 1200) == 16
+    assert 0 < elo_points(1500, 1200) < 16 < elo_points(1200, 1500) < 32
+    assert elo_points(1210, 1200) % 1
+
+
+def test_rounds_keep_each_players_order():
+    winners, losers = np.array([0, 2, 0, 3, 1]), np.array([1, 3, 2, 4, 4])
+    assert schedule_rounds(winners, losers).tolist() == [0, 0, 1, 1, 2]
+
+
+def test_replay_matches_sequential_rating():
+    rng = random.Random(7)
+    ratings = np.array([rng.uniform(800, 1600) for _ in range(50)])
+    pairs = [rng.sample(range(50), 2) for _ in range(2000)]
+    winners, losers = np.array([winner for winner, _ in pairs]), np.array([loser for _, loser in pairs])
+
+    replayed = replay(ratings, winners, losers)
+    expected_ratings, expected_points = _replay_one_by_one(ratings, winners, losers)
+    np.testing.assert_allclose(replayed.ratings, expected_ratings)
+    np.testing.assert_allclose(replayed.points, expected_points)
+    assert replayed.winner_before[0] == ratings[winners[0]]
+    assert np.isclose(replayed.ratings.sum(), ratings.sum())
+
+
+def test_ratings_update_uses_values_list_on_postgresql():
+    sql = str(ratings_update([(1, 2.5), (2, -2.5)], relative=True).compile(dialect=postgresql.dialect()))
+    assert "FROM (VALUES" in sql
+    assert "elo_rating=(users.elo_rating + new_ratings.rating)" in sql
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.core.settings import DatabaseSettings
+from backend.db.pool import InstrumentedQueuePool
+
+
+def test_development_logs_statements():
+    kwargs = DatabaseSettings(environment="development").engine_kwargs()
+    assert kwargs["echo"] is True
+    assert kwargs["pool_pre_ping"] is False
+    assert kwargs["pool_size"] == 5
+
+
+def test_production_engine_kwargs():
+    settings = DatabaseSettings(
+        environment="production",
+        db_pool_size=20,
+        db_statement_cache_size=0,
+        db_statement_timeout_ms=5000,
+        db_server_settings={"jit": "off"},
+    )
+    kwargs = settings.engine_kwargs()
+    assert kwargs["echo"] is False
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["pool_size"] == 20
+    assert kwargs["connect_args"] == {
+        "statement_cache_size": 0,
+        "server_settings": {"application_name": "mastermind", "statement_timeout": "5000", "jit": "off"},
+    }
+
+
+def test_sqlite_skips_pool_sizing():
+    kwargs = DatabaseSettings(database_url="sqlite+aiosqlite:///test.db", db_log_level="debug").engine_kwargs()
+    assert kwargs == {"echo": "debug", "pool_pre_ping": False}
+
+
+def test_settings_read_environment(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "staging")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    settings = DatabaseSettings()
+    assert settings.db_max_overflow == 3
+    assert settings.db_log_level == "off"
+
+
+def test_instrumented_pool_counts_waits_and_timeouts(tmp_path):
+    async def exercise() -> dict:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert engine.pool.metrics()["checked_out"] == 1
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+        metrics = engine.pool.metrics()
+        await engine.dispose()
+        return metrics
+
+    metrics = asyncio.run(exercise())
+    assert metrics["checkouts"] == 1
+    assert metrics["timeouts"] == 1
+    assert metrics["checked_out"] == 0
@@ -0,0 +1,13 @@
+from backend.core.simulation import play_game, simulate
+
+
+def test_play_game_solves_secret():
+    guesses, solved, latencies = play_game("hard", "8080", free_guess=True)
+    assert solved and len(latencies) == guesses
+
+
+def test_simulate_report():
+    report = simulate("hard", num_games=8, workers=2, seed=7)
+    assert report["games"] == 8 and report["solved"] == 8
+    assert sum(report["guesses"]["distribution"].values()) == 8
+    assert report["move_latency_ms"]["p50"] <= report["move_latency_ms"]["p99"]
@@ -0,0 +1,56 @@
+import bisect
+import random
+
+import pytest
+
+from backend.core.skiplist import IndexableSkipList
+
+
+def test_matches_a_sorted_list():
+    rng = random.Random(7)
+    skiplist, expected = IndexableSkipList(seed=7), []
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if key in expected:
+            skiplist.remove(key)
+            expected.remove(key)
+        else:
+            skiplist.insert(key)
+            bisect.insort(expected, key)
+        probe = rng.randrange(-10, 510)
+        assert skiplist.rank(probe) == bisect.bisect_left(expected, probe)
+        assert (probe in skiplist) == (probe in expected)
+        if expected:
+            index = rng.randrange(len(expected))
+            assert skiplist[index] == expected[index]
+            assert list(skiplist.slice(index, index + 10)) == expected[index : index + 10]
+    assert list(skiplist) == expected
+    assert len(skiplist) == len(expected)
+
+
+def test_rejects_duplicates_and_missing_keys():
+    skiplist = IndexableSkipList([(-1300.0, 2), (-1200.0, 1)])
+    assert list(skiplist) == [(-1300.0, 2), (-1200.0, 1)]
+    with pytest.raises(ValueError):
+        skiplist.insert((-1200.0, 1))
+    with pytest.raises(KeyError):
+        skiplist.remove((-1250.0, 3))
+    with pytest.raises(IndexError):
+        skiplist[2]
+
+
+def test_from_sorted_matches_inserts():
+    keys = sorted(random.Random(3).sample(range(100000), 3000))
+    skiplist = IndexableSkipList.from_sorted(keys, seed=3)
+    assert list(skiplist) == keys
+    for probe in range(-5, 100005, 37):
+        assert skiplist.rank(probe) == bisect.bisect_left(keys, probe)
+    assert [skiplist[index] for index in range(0, len(keys), 7)] == keys[::7]
+
+    skiplist.insert(-1)
+    skiplist.remove(keys[100])
+    expected = [-1] + keys[:100] + keys[101:]
+    assert list(skiplist) == expected
+    assert list(skiplist.slice(95, 105)) == expected[95:105]
+    with pytest.raises(ValueError):
+        IndexableSkipList.from_sorted([1, 3, 2])
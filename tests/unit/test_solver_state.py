@@ -0,0 +1,47 @@
+from backend.core.ai import AradzBot
+from backend.core.ai.solver_state import SolverState
+from backend.core.game_engine import MasterMindGame
+
+
+def test_incremental_update_matches_full_scan():
+    game = MasterMindGame(player_secret="7090")
+    table = game.feedback_table
+    state = SolverState.initial(table)
+    for guess in ("1234", "5678", "9900"):
+        game.make_guess(guess)
+        state.update(table, game.history)
+        assert state.applied == len(game.history)
+
+    fresh = SolverState.initial(table)
+    fresh.update(table, game.history)
+    assert fresh.candidates.tolist() == state.candidates.tolist()
+    assert table.encode("7090") in state.candidates
+
+
+def test_state_round_trip():
+    game = MasterMindGame(player_secret="1122")
+    table = game.feedback_table
+    for history_length, guess in enumerate(("3456", "1111", "1212"), start=1):
+        game.make_guess(guess)
+        state = SolverState.initial(table)
+        state.update(table, game.history)
+        restored = SolverState.from_dict(state.to_dict(table), table)
+        assert restored.applied == history_length
+        assert restored.candidates.tolist() == state.candidates.tolist()
+
+
+def test_aradz_bot_resumes_from_exported_state():
+    game = MasterMindGame(player_secret="4567")
+    game.make_guess("1234")
+    bot = AradzBot(game)
+    game.make_guess(bot.get_next_guess())
+    state = bot.export_state()
+
+    game.make_guess("0000")
+    resumed = AradzBot(game, state)
+    guess = resumed.get_next_guess()
+    assert resumed.solver_state.applied == 3
+
+    candidate = MasterMindGame(player_secret=guess)
+    for record in game.history:
+        assert candidate.evaluate_guess(record.guess) == (record.exact, record.wrong_pos)
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from backend.services.stats_service import game_increments, merge_increments, solve_time_column
+
+START = datetime(2026, 1, 1)
+
+
+def test_solve_time_buckets():
+    assert [solve_time_column(seconds) for seconds in (5, 30, 31, 599, 601)] == [
+        "solved_within_30s",
+        "solved_within_30s",
+        "solved_within_60s",
+        "solved_within_600s",
+        "solved_over_600s",
+    ]
+
+
+def test_increments_of_a_pvp_win_and_an_ai_forfeit():
+    won = game_increments("pvp", None, "completed", (10, 11), 10, 7, START, START + timedelta(seconds=90))
+    assert won == [
+        {
+            "user_id": 10,
+            "kind": "pvp",
+            "games": 1,
+            "wins": 1,
+            "solved": 1,
+            "solve_guesses": 7,
+            "solve_seconds": 90.0,
+            "solved_within_120s": 1,
+        },
+        {"user_id": 11, "kind": "pvp", "games": 1, "losses": 1},
+    ]
+    # The AI player (id 1 is RandomAI) gets no increment
+    assert game_increments("ai", "easy", "abandoned", (10, 1), 1) == [
+        {"user_id": 10, "kind": "ai_easy", "games": 1, "losses": 1}
+    ]
+
+    again = game_increments("pvp", None, "abandoned", (10, 11), 10)
+    merged = {row["user_id"]: row for row in merge_increments(won + again)}
+    assert (merged[10]["games"], merged[10]["wins"], merged[10]["solved"]) == (2, 2, 1)
+    assert merged[11]["losses"] == 2
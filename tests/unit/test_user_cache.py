@@ -0,0 +1,27 @@
+import asyncio
+
+from backend.db.user_cache import InMemoryUserCacheBackend
+
+
+def test_in_memory_backend_evicts_least_recently_used():
+    async def exercise():
+        backend = InMemoryUserCacheBackend(max_size=2, ttl=60)
+        await backend.set(1, {"id": 1})
+        await backend.set(2, {"id": 2})
+        assert await backend.get(1) == {"id": 1}
+        await backend.set(3, {"id": 3})
+        assert await backend.get(2) is None
+        assert await backend.get(1) == {"id": 1}
+        assert len(backend) == 2
+
+    asyncio.run(exercise())
+
+
+def test_in_memory_backend_expires_entries():
+    async def exercise():
+        backend = InMemoryUserCacheBackend(max_size=2, ttl=0)
+        await backend.set(1, {"id": 1})
+        assert await backend.get(1) is None
+        assert len(backend) == 0
+
+    asyncio.run(exercise())
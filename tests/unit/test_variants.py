@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+import pytest
+
+from backend.core.ai import get_ai_player
+from backend.core.ai.candidates import sample_consistent, symmetry_reduced
+from backend.core.game_engine import GuessRecord, MasterMindGame, Variant
+
+
+def test_variant_bounds():
+    assert Variant(6, 12).alphabet == "0123456789AB"
+    assert Variant(5, 8).size == 8**5
+    with pytest.raises(ValueError):
+        Variant(3, 10)
+    with pytest.raises(ValueError):
+        Variant(4, 13)
+
+
+def test_validate_guess_uses_alphabet():
+    game = MasterMindGame(player_secret="01234", variant=Variant(5, 6))
+    assert game.validate_guess("55210")
+    assert not game.validate_guess("01236")
+    assert not game.validate_guess("0123")
+    assert game.evaluate_guess("43210") == (1, 4)
+
+
+def test_sample_consistent_matches_history():
+    game = MasterMindGame(player_secret="A0B193", variant=Variant(6, 12))
+    for guess in ["001122", "334455", "6789AB"]:
+        game.make_guess(guess)
+
+    candidates = sample_consistent(game.feedback_table, game.history, count=64, rng=random.Random(3))
+    assert 0 < len(candidates) <= 64
+    for code in candidates:
+        secret = MasterMindGame(player_secret=game.feedback_table.decode(code), variant=game.variant)
+        for record in game.history:
+            assert secret.evaluate_guess(record.guess) == (record.exact, record.wrong_pos)
+
+
+def test_symmetry_reduced_keeps_one_code_per_relabelling():
+    table = MasterMindGame().feedback_table
+    history = [GuessRecord("0011", 1, 0)]
+    reduced = symmetry_reduced(table, np.arange(table.size), history)
+    # Codes over the played symbols 0 and 1 stay; unplayed symbols first appear as 2, 3, 4, 5
+    assert table.encode("0101") in reduced
+    assert table.encode("0222") in reduced
+    assert table.encode("0333") not in reduced
+    assert table.encode("2345") in reduced
+    assert table.encode("2354") not in reduced
+
+
+@pytest.mark.parametrize("difficulty", ["medium", "hard"])
+def test_ai_solves_large_variant(difficulty):
+    game = MasterMindGame(player_secret="9A0B31", variant=Variant(6, 12))
+    for _ in range(12):
+        ai_player = get_ai_player(difficulty, game)
+        assert ai_player.export_state() is None
+        if game.make_guess(ai_player.get_next_guess())[2]:
+            break
+    assert game.history[-1].guess == "9A0B31"
+
+
+def test_variant_integer_encoding_round_trips():
+    variant = Variant(6, 12)
+    assert variant.decode(variant.encode("A0B193")) == "A0B193"
+    assert variant.decode(0) == "000000"
+    assert variant.unpack_feedback(variant.pack_feedback(2, 3)) == (2, 3)